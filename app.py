@@ -1,13 +1,53 @@
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, request, jsonify, send_from_directory
 from flask_cors import CORS
 import os
-from src.job import Job
-from src.machine import Machine
-from src.scheduler import Scheduler, GBFSScheduler, AStarScheduler
+import time
+from service import SCHEDULERS, parse_instance, create_scheduler, solve
+from cache import ScheduleCache
+from worker_pool import SolverPool, PoolFull
+from batch import solve_batch
+from session import SessionStore, create_session
+from streaming import solve_events, format_sse, format_ndjson
+from encoding import response_options, encode, dumps
+from metrics import MetricsRegistry, CONTENT_TYPE
+from profiling import profile_mode, profiled
+from telemetry import SearchTelemetry
 
 app = Flask(__name__, static_folder='frontend')
 CORS(app)  # Enable CORS for all routes
 
+# Profiling a solve (X-Profile header or "profile" in the body) exposes code paths; off unless enabled
+app.config['ALLOW_PROFILING'] = os.environ.get('ALLOW_PROFILING', '0') != '0'
+
+# /schedule latencies, scheduler phase times and search counters of this process, served at /metrics
+metrics = MetricsRegistry()
+SearchTelemetry.observers.append(metrics.observe_run)
+
+# Results of identical (or permuted) instances are served from this cache
+schedule_cache = ScheduleCache(
+    max_entries=int(os.environ.get('SCHEDULE_CACHE_SIZE', 1024)),
+    ttl_seconds=float(os.environ.get('SCHEDULE_CACHE_TTL', 3600)),
+    path=os.environ.get('SCHEDULE_CACHE_PATH')  # SQLite file to persist the cache
+)
+
+# Worker processes for asynchronous /jobs submissions
+solver_pool = SolverPool(
+    max_workers=int(os.environ.get('SOLVER_WORKERS', 0)) or None,
+    max_pending=int(os.environ.get('SOLVER_MAX_PENDING', 32))
+)
+
+# Scheduler types cheap enough to answer inline on the /jobs endpoint
+SYNCHRONOUS_TYPES = {"dispatch"}
+
+# Live schedules repaired incrementally through /sessions; held in this process's memory
+session_store = SessionStore(
+    max_sessions=int(os.environ.get('MAX_SESSIONS', 100)),
+    ttl_seconds=float(os.environ.get('SESSION_TTL', 3600))
+)
+
+# Largest number of instances accepted by one /schedule/batch call
+BATCH_MAX_INSTANCES = int(os.environ.get('BATCH_MAX_INSTANCES', 1000))
+
 # Serve frontend files
 @app.route('/', defaults={'path': 'index.html'})
 @app.route('/<path:path>')
@@ -18,43 +58,216 @@ def serve_frontend(path):
     else:
         return send_from_directory('frontend', 'index.html')
 
+def schedule_response(result, data, timings):
+    """
+    /schedule response with the fields and layout the body asks for, compressed
+    if the client accepts it; timings (name -> seconds) go in a Server-Timing header
+    """
+    started = time.perf_counter()
+    body, encoding = encode(result, request.headers.get("Accept-Encoding"), *response_options(data))
+    timings["serialize"] = time.perf_counter() - started
+    response = Response(body, mimetype="application/json")
+    response.headers["Vary"] = "Accept-Encoding"
+    if encoding is not None:
+        response.headers["Content-Encoding"] = encoding
+    response.headers["Server-Timing"] = ", ".join(f"{name};dur={seconds * 1000:.2f}"
+                                                  for name, seconds in timings.items())
+    return response
+
 @app.route("/schedule", methods=["POST"])
 def schedule():
+    started = time.perf_counter()
     data = request.json
-    jobs = []
+    scheduler_type = data.get("schedulerType", "gbfs")
+    scheduler_type = scheduler_type if scheduler_type in SCHEDULERS else "gbfs"  # Unknown types run GBFS
+    try:
+        instance, machines = parse_instance(data)  # Read-only; shared by the cache lookup and the solve
+        response_options(data)
+        profiler = profile_mode(request.headers.get("X-Profile") or data.get("profile"))
+    except ValueError as error:
+        metrics.observe_error(scheduler_type)
+        return jsonify({"error": str(error)}), 400
+    if profiler is not None and not app.config['ALLOW_PROFILING']:
+        return jsonify({"error": "Profiling is disabled on this server (set ALLOW_PROFILING=1)"}), 403
+    timings = {"parse": time.perf_counter() - started}
     
-    for job_data in data.get("jobs", []):
-        job_id = job_data.get("jobId")
-        processing_time = int(job_data.get("processingTime"))
-        priority = int(job_data.get("priority", 1))  # Default priority to 1 if not provided
-        machine_id = int(job_data.get("machine"))
-        
-        jobs.append(Job(job_id, processing_time, priority, machine_id))
+    # Serve identical instances from the cache; fields, layout and profile only shape the response.
+    # Profiled requests always solve.
+    cache_key = None
+    if data.get("useCache", True) and profiler is None:
+        settings = {key: value for key, value in data.items()
+                    if key not in ("jobs", "useCache", "fields", "layout", "profile")}
+        settings.setdefault("numMachines", len(machines))
+        cache_key, order = schedule_cache.fingerprint(instance, settings)
+    if cache_key is not None:
+        cached = schedule_cache.get(cache_key)
+        if cached is not None:
+            response = schedule_response(schedule_cache.restore(cached, instance, order), data, timings)
+            response.headers["X-Cache"] = "HIT"
+            metrics.observe_request(scheduler_type, instance.num_ops, time.perf_counter() - started, "HIT")
+            return response
     
-    # Create machines based on the number requested
-    num_machines = int(data.get("numMachines", 2))  # Default to 2 machines
-    machines = [Machine(i+1) for i in range(num_machines)]
+    # Run the scheduler selected by the request
+    solve_started = time.perf_counter()
+    try:
+        if profiler is None:
+            result = solve(data, instance, machines)
+        else:
+            result, report = profiled(profiler, solve, data, instance, machines)
+    except ValueError as error:
+        metrics.observe_error(scheduler_type)
+        return jsonify({"error": str(error)}), 400
+    timings["solve"] = time.perf_counter() - solve_started
+    phases = result["visualization"].get("phases", {})
+    timings.update((f"solve-{name}", seconds) for name, seconds in phases.items())
     
-    # Select scheduler based on request
-    scheduler_type = data.get("schedulerType", "gbfs")
+    if cache_key is not None:
+        schedule_cache.put(cache_key, schedule_cache.canonicalize(result, instance, order))
+    if profiler is not None:
+        result = dict(result, profile=report)
+    response = schedule_response(result, data, timings)
+    response.headers["X-Cache"] = "MISS" if cache_key is not None else "BYPASS"
+    metrics.observe_request(scheduler_type, instance.num_ops, time.perf_counter() - started,
+                            response.headers["X-Cache"], phases)
+    return response
+
+@app.route("/schedule/stream", methods=["POST"])
+def schedule_stream():
+    data = request.json
     
-    if scheduler_type == "astar":
-        scheduler = AStarScheduler(jobs, machines)
-    else:  # Default to GBFS
-        scheduler = GBFSScheduler(jobs, machines)
+    # Reject malformed requests before the stream starts
+    try:
+        instance, machines = parse_instance(data)
+        create_scheduler(data, instance, machines)
+    except (ValueError, TypeError) as error:
+        return jsonify({"error": str(error)}), 400
     
-    # Run the scheduler
-    schedule_result = scheduler.schedule_jobs()
+    # Server-Sent Events unless the client asks for NDJSON; a disconnect cancels the solve
+    ndjson = "application/x-ndjson" in request.headers.get("Accept", "")
+    formatter = format_ndjson if ndjson else format_sse
+    events = solve_events(data, instance, machines)
+    response = Response((formatter(event) for event in events),
+                        mimetype="application/x-ndjson" if ndjson else "text/event-stream")
+    response.call_on_close(events.close)
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"  # Keep reverse proxies from buffering the events
+    return response
+
+@app.route("/schedule/batch", methods=["POST"])
+def schedule_batch():
+    data = request.json
+    instances = data.get("instances", [])
+    if len(instances) > BATCH_MAX_INSTANCES:
+        return jsonify({"error": f"At most {BATCH_MAX_INSTANCES} instances per batch"}), 413
     
-    # Return more comprehensive scheduling information including visualization data
-    return jsonify({
-        "schedule": schedule_result,
-        "makespan": max([job.end_time for job in jobs]) if jobs else 0,
-        "totalProcessingTime": sum([job.processing_time for job in jobs]),
-        "numJobs": len(jobs),
-        "numMachines": len(machines),
-        "visualization": scheduler.visualization_data
-    })
+    # Settings shared by every instance unless the instance overrides them
+    defaults = data.get("defaults", {})
+    instances = [dict(defaults, **instance) for instance in instances]
+    
+    # Stream one NDJSON line per instance as soon as it is solved; the chunks share the /jobs queue limit
+    try:
+        results = solve_batch(instances, pool=solver_pool)
+    except PoolFull as error:
+        response = jsonify({"error": str(error)})
+        response.headers["Retry-After"] = "1"
+        return response, 503
+    response = Response((dumps(line) + b"\n" for line in results), mimetype="application/x-ndjson")
+    response.call_on_close(results.close)  # A disconnect cancels the chunks that have not started
+    return response
+
+@app.route("/jobs", methods=["POST"])
+def submit_job():
+    data = request.json
+    
+    # Reject malformed requests before they take a queue slot
+    try:
+        jobs, machines = parse_instance(data)
+        create_scheduler(data, jobs, machines)
+    except (ValueError, TypeError) as error:
+        return jsonify({"error": str(error)}), 400
+    
+    # Short heuristic runs are answered synchronously
+    if data.get("schedulerType") in SYNCHRONOUS_TYPES or data.get("async") is False:
+        return jsonify({"id": None, "status": "done", "result": solve(data, jobs, machines)})
+    
+    try:
+        task_id = solver_pool.submit(data)
+    except PoolFull as error:
+        response = jsonify({"error": str(error)})
+        response.headers["Retry-After"] = "1"
+        return response, 503
+    
+    response = jsonify({"id": task_id, "status": "queued"})
+    response.headers["Location"] = f"/jobs/{task_id}"
+    return response, 202
+
+@app.route("/jobs/<task_id>", methods=["GET"])
+def job_status(task_id):
+    status = solver_pool.status(task_id)
+    if status is None:
+        return jsonify({"error": f"Unknown job {task_id}"}), 404
+    return jsonify(status)
+
+@app.route("/jobs/<task_id>", methods=["DELETE"])
+def cancel_job(task_id):
+    status = solver_pool.cancel(task_id)
+    if status is None:
+        return jsonify({"error": f"Unknown job {task_id}"}), 404
+    return jsonify(status)
+
+@app.route("/sessions", methods=["POST"])
+def create_schedule_session():
+    try:
+        session, result = create_session(request.json)
+    except (ValueError, TypeError) as error:
+        return jsonify({"error": str(error)}), 400
+    session_id = session_store.add(session)
+    response = jsonify(dict(result, id=session_id))
+    response.headers["Location"] = f"/sessions/{session_id}"
+    return response, 201
+
+@app.route("/sessions/<session_id>", methods=["GET"])
+def get_schedule_session(session_id):
+    session = session_store.get(session_id)
+    if session is None:
+        return jsonify({"error": f"Unknown session {session_id}"}), 404
+    with session.lock:
+        return jsonify(dict(session.summary(), id=session_id, schedule=session.schedule()))
+
+@app.route("/sessions/<session_id>/changes", methods=["POST"])
+def change_schedule_session(session_id):
+    session = session_store.get(session_id)
+    if session is None:
+        return jsonify({"error": f"Unknown session {session_id}"}), 404
+    data = request.json
+    try:
+        now = int(data["time"]) if data.get("time") is not None else None
+        with session.lock:
+            report = session.apply(data.get("changes", []), now=now)
+            if data.get("includeSchedule"):
+                report["schedule"] = session.schedule()
+    except (ValueError, TypeError) as error:
+        return jsonify({"error": str(error)}), 400
+    return jsonify(dict(report, id=session_id))
+
+@app.route("/sessions/<session_id>", methods=["DELETE"])
+def delete_schedule_session(session_id):
+    if not session_store.delete(session_id):
+        return jsonify({"error": f"Unknown session {session_id}"}), 404
+    return jsonify({"deleted": True})
+
+@app.route("/metrics", methods=["GET"])
+def get_metrics():
+    return Response(metrics.render(), content_type=CONTENT_TYPE)
+
+@app.route("/cache/stats", methods=["GET"])
+def cache_stats():
+    return jsonify(schedule_cache.stats())
+
+@app.route("/cache", methods=["DELETE"])
+def clear_cache():
+    schedule_cache.clear()
+    return jsonify({"cleared": True})
 
 @app.route("/algorithms", methods=["GET"])
 def get_algorithms():
@@ -70,6 +283,41 @@ def get_algorithms():
                 "id": "astar",
                 "name": "A* Search Algorithm",
                 "description": "AI search algorithm that uses both path cost and heuristic to find the optimal solution."
+            },
+            {
+                "id": "beam",
+                "name": "Beam Search",
+                "description": "GBFS that keeps only the beamWidth best partial schedules per level; memory stays bounded on large instances."
+            },
+            {
+                "id": "idastar",
+                "name": "IDA* Search",
+                "description": "Iterative-deepening A* with a transposition table of at most tableSize states; optimal with little memory."
+            },
+            {
+                "id": "smastar",
+                "name": "SMA* Search",
+                "description": "A* that keeps at most memoryLimit open nodes, forgetting the worst ones and regenerating them when needed."
+            },
+            {
+                "id": "dispatch",
+                "name": "Dispatch Rules (SPT/LPT/WSPT/ERD)",
+                "description": "Fast list scheduling that orders each machine's jobs by a dispatch rule; set dispatchRule to spt, lpt, wspt or erd."
+            },
+            {
+                "id": "cpsat",
+                "name": "CP-SAT (OR-Tools)",
+                "description": "Constraint programming solver that proves optimality; accepts numWorkers, maxSeconds and relativeGap."
+            },
+            {
+                "id": "portfolio",
+                "name": "Portfolio (parallel)",
+                "description": "Races dispatch, GBFS, A* and CP-SAT in separate processes, sharing incumbents; returns the best schedule at maxSeconds or as soon as one is proven optimal."
+            },
+            {
+                "id": "lns",
+                "name": "Local Search (LNS)",
+                "description": "Improves an initialSchedule or a dispatch schedule with local moves and CP-SAT neighbourhoods until maxSeconds; accepts workers."
             }
         ]
     })
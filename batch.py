@@ -0,0 +1,73 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import service
+from encoding import response_options, shape
+
+
+def solve_chunk(chunk):
+    """
+    Solve (index, request body) pairs in a worker; a failing instance only
+    fails itself. Results are cut to the body's fields and layout here, before
+    they are sent back to the parent.
+    """
+    results = []
+    for index, data in chunk:
+        try:
+            results.append({"index": index, "result": shape(service.solve(data), *response_options(data))})
+        except Exception as error:  # Reported per instance so the rest of the batch continues
+            results.append({"index": index, "error": f"{type(error).__name__}: {error}"})
+    return results
+
+
+def solve_batch(instances, max_workers=None, chunk_size=None, pool=None):
+    """
+    Solve many independent /schedule request bodies in parallel.
+
+    Returns an iterator of {"index": i, "result": ...} or {"index": i,
+    "error": ...}, one per instance as soon as its chunk completes, so results
+    arrive out of order. Small instances are grouped into chunks to amortise
+    inter-process overhead. With a SolverPool the chunks are submitted to its
+    warm workers right away and count against its max_pending, raising
+    PoolFull if they do not fit. Closing the iterator cancels the chunks that
+    have not started.
+    """
+    instances = list(instances)
+    if not instances:
+        return collect_chunks({})
+    if pool is None:
+        max_workers = max_workers or os.cpu_count() or 1
+        executor = ProcessPoolExecutor(max_workers=max_workers)
+    else:
+        max_workers = max_workers or pool.max_workers
+
+    if chunk_size is None:
+        # About four chunks per worker balances load against per-task overhead, within the pool's free slots
+        num_chunks = max_workers * 4 if pool is None else min(max_workers * 4, max(1, pool.free_slots()))
+        chunk_size = max(1, math.ceil(len(instances) / num_chunks))
+    indexed = list(enumerate(instances))
+    chunks = [indexed[i:i + chunk_size] for i in range(0, len(indexed), chunk_size)]
+
+    if pool is None:
+        futures = [executor.submit(solve_chunk, chunk) for chunk in chunks]
+    else:
+        executor = None
+        futures = pool.submit_many(solve_chunk, [(chunk,) for chunk in chunks])
+    return collect_chunks(dict(zip(futures, chunks)), executor)
+
+
+def collect_chunks(futures, executor=None):
+    """Results of the chunk futures as they complete; shuts down executor (if given) when done or closed"""
+    try:
+        for future in as_completed(futures):
+            try:
+                yield from future.result()
+            except Exception as error:  # The worker itself died; fail only this chunk
+                for index, _ in futures[future]:
+                    yield {"index": index, "error": f"{type(error).__name__}: {error}"}
+    finally:
+        for future in futures:
+            future.cancel()  # Chunks still queued when the client goes away
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
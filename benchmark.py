@@ -0,0 +1,209 @@
+"""
+Benchmark harness for the schedulers.
+
+Runs every engine on a suite of seeded, generated instances (and optionally
+instance files), records wall time, nodes expanded, peak memory, makespan and
+optimality gap to JSON, and compares the run against a stored baseline so that
+performance regressions fail with a non-zero exit code.
+
+    python benchmark.py --suite default --output results.json --baseline baseline.json
+    python benchmark.py --suite smoke --output baseline.json   # record a new baseline
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+from service import parse_instance, create_scheduler, instance_lower_bound
+
+ENGINES = ["gbfs", "astar", "cpsat", "dispatch"]
+
+# Processing-time distributions for generated instances
+DISTRIBUTIONS = {
+    "uniform": lambda rng: rng.randint(1, 99),
+    "narrow": lambda rng: rng.randint(45, 55),
+    "bimodal": lambda rng: rng.randint(1, 10) if rng.random() < 0.8 else rng.randint(80, 99),
+    "exponential": lambda rng: max(1, int(rng.expovariate(1 / 30))),
+}
+
+SUITES = {
+    "smoke": [(8, 2, "uniform"), (12, 3, "bimodal")],
+    "default": [(n, m, d) for n in (10, 50, 200) for m in (2, 5) for d in ("uniform", "bimodal")],
+    "large": [(n, m, d) for n in (1000, 5000) for m in (5, 20) for d in ("uniform", "exponential")],
+}
+
+
+def generate_instance(num_jobs, num_machines, distribution="uniform", seed=0, max_release=0, num_operations=1):
+    """
+    A reproducible /schedule request body; with num_operations > 1 every job
+    visits that many distinct machines in a random order (a job shop)
+    """
+    suffix = f"-{num_operations}" if num_operations > 1 else ""
+    rng = random.Random(f"{num_jobs}-{num_machines}-{distribution}-{seed}{suffix}")
+    draw = DISTRIBUTIONS[distribution]
+    jobs = []
+    for job_id in range(1, num_jobs + 1):
+        if num_operations == 1:
+            job = {
+                "jobId": job_id,
+                "processingTime": draw(rng),
+                "priority": rng.randint(1, 10),
+                "machine": rng.randint(1, num_machines),
+            }
+        else:
+            route = rng.sample(range(1, num_machines + 1), min(num_operations, num_machines))
+            job = {
+                "jobId": job_id,
+                "operations": [{"machine": machine, "processingTime": draw(rng)} for machine in route],
+                "priority": rng.randint(1, 10),
+            }
+        job["releaseTime"] = rng.randint(0, max_release) if max_release else 0
+        jobs.append(job)
+    shape = f"{num_jobs}x{num_machines}" + (f"x{num_operations}" if num_operations > 1 else "")
+    return {"name": f"gen-{shape}-{distribution}-s{seed}", "jobs": jobs, "numMachines": num_machines}
+
+
+def load_instance(path):
+    """
+    Load an instance file: a JSON /schedule body, or the OR-Library job shop
+    format ("num_jobs num_machines" followed by one line of machine/time pairs
+    per job, in processing order, machines numbered from 0).
+    """
+    with open(path) as handle:
+        text = handle.read()
+    if text.lstrip().startswith("{"):
+        data = json.loads(text)
+        data.setdefault("name", path)
+        return data
+
+    lines = [line.split() for line in text.splitlines() if line.strip() and not line.startswith("#")]
+    num_jobs, num_machines = int(lines[0][0]), int(lines[0][1])
+    jobs = []
+    for job_id, fields in enumerate(lines[1:num_jobs + 1], start=1):
+        pairs = [(int(fields[i]), int(fields[i + 1])) for i in range(0, len(fields), 2)]
+        if len(pairs) == 1:
+            machine, processing_time = pairs[0]
+            jobs.append({"jobId": job_id, "processingTime": processing_time, "machine": machine + 1})
+        else:
+            jobs.append({"jobId": job_id, "operations": [{"machine": machine + 1, "processingTime": processing_time}
+                                                         for machine, processing_time in pairs]})
+    return {"name": path, "jobs": jobs, "numMachines": num_machines}
+
+
+def run_engine(data, engine, max_seconds, repeats, measure_memory):
+    """Benchmark one engine on one instance"""
+    request = dict(data, schedulerType=engine, maxSeconds=max_seconds, telemetry="off")
+    jobs, machines = parse_instance(request)  # Read-only, so one instance serves every run
+    times = []
+    for _ in range(repeats):
+        scheduler = create_scheduler(request, jobs, machines)
+        started = time.perf_counter()
+        schedule = scheduler.schedule_jobs()
+        times.append(time.perf_counter() - started)
+
+    peak_memory = None
+    if measure_memory:
+        scheduler = create_scheduler(request, jobs, machines)
+        tracemalloc.start()
+        scheduler.schedule_jobs()
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    makespan = max((end for _, _, end, _ in schedule), default=0)
+    visualization = scheduler.visualization_data
+    lower_bound = max(instance_lower_bound(jobs, machines, scheduler.problem), visualization.get("lower_bound") or 0)
+    return {
+        "instance": data["name"],
+        "engine": engine,
+        "numJobs": len(jobs),
+        "numOperations": scheduler.problem.num_ops,
+        "numMachines": len(machines),
+        "wallTime": statistics.median(times),
+        "nodesExpanded": visualization.get("nodes_expanded", 0),
+        "peakMemory": peak_memory,
+        "makespan": makespan,
+        "lowerBound": lower_bound,
+        "gap": (makespan - lower_bound) / makespan if makespan else 0.0,
+        "complete": len(schedule) == scheduler.problem.num_ops,
+        "stopReason": visualization.get("stop_reason"),
+    }
+
+
+def run_benchmark(instances, engines=ENGINES, max_seconds=10.0, repeats=1, measure_memory=True, log=None):
+    """Run every engine on every instance; returns a list of result records"""
+    results = []
+    for data in instances:
+        for engine in engines:
+            record = run_engine(data, engine, max_seconds, repeats, measure_memory)
+            results.append(record)
+            if log:
+                log(f"{record['instance']:<32} {engine:<9} {record['wallTime']:9.4f}s "
+                    f"makespan={record['makespan']} gap={record['gap']:.3f}")
+    return results
+
+
+def compare(results, baseline, time_tolerance=0.25, min_time_delta=0.01, gap_tolerance=1e-9):
+    """
+    Regressions of results against baseline records: slower by more than
+    time_tolerance (and min_time_delta seconds), a worse makespan, or a schedule
+    that is no longer complete.
+    """
+    previous = {(record["instance"], record["engine"]): record for record in baseline}
+    regressions = []
+    for record in results:
+        old = previous.get((record["instance"], record["engine"]))
+        if old is None:
+            continue
+        key = f"{record['instance']} [{record['engine']}]"
+        delta = record["wallTime"] - old["wallTime"]
+        if delta > min_time_delta and record["wallTime"] > old["wallTime"] * (1 + time_tolerance):
+            regressions.append(f"{key}: wall time {old['wallTime']:.4f}s -> {record['wallTime']:.4f}s")
+        if record["makespan"] > old["makespan"] + gap_tolerance:
+            regressions.append(f"{key}: makespan {old['makespan']} -> {record['makespan']}")
+        if old.get("complete") and not record["complete"]:
+            regressions.append(f"{key}: schedule is no longer complete")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the job shop schedulers")
+    parser.add_argument("--suite", choices=sorted(SUITES), default="smoke")
+    parser.add_argument("--seeds", type=int, default=1, help="generated instances per suite entry")
+    parser.add_argument("--operations", type=int, default=1, help="operations per generated job (job shop if > 1)")
+    parser.add_argument("--instance", action="append", default=[], help="instance file to add (repeatable)")
+    parser.add_argument("--engines", default=",".join(ENGINES))
+    parser.add_argument("--max-seconds", type=float, default=10.0, help="budget per engine run")
+    parser.add_argument("--repeats", type=int, default=1, help="timed runs per engine; the median is kept")
+    parser.add_argument("--no-memory", action="store_true", help="skip the traced peak-memory run")
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--baseline", help="fail if results regress against this results JSON")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown")
+    args = parser.parse_args(argv)
+
+    instances = [generate_instance(n, m, distribution, seed, num_operations=args.operations)
+                 for n, m, distribution in SUITES[args.suite] for seed in range(args.seeds)]
+    instances += [load_instance(path) for path in args.instance]
+
+    results = run_benchmark(instances, args.engines.split(","), args.max_seconds, args.repeats,
+                            not args.no_memory, log=print)
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump({"suite": args.suite, "results": results}, handle, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as handle:
+            baseline = json.load(handle)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print("No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
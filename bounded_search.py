@@ -0,0 +1,395 @@
+"""
+Memory-bounded variants of the search schedulers. Each one holds at most a
+configured number of open nodes, so its peak memory is known in advance:
+
+- BeamScheduler: GBFS that keeps only the best width nodes per level
+- IDAStarScheduler: iterative-deepening A* with a bounded transposition table
+- SMAStarScheduler: A* that drops its worst leaves once memory_limit is reached
+"""
+import heapq
+import math
+import time
+from collections import OrderedDict
+
+from scheduler import ScheduleNode, StateTable, GBFSScheduler, AStarScheduler, DispatchScheduler
+from bounds import LowerBounds
+
+
+class BeamScheduler(GBFSScheduler):
+    """
+    Beam search guided by the GBFS heuristic.
+
+    Every successor schedules one more operation, so the search advances level
+    by level and keeps only the width successors with the lowest heuristic
+    value. At most width nodes (times the branching factor while a level is
+    expanded) are open at once, and nodes share their history through parent
+    pointers, so memory is O(width * operations) whatever the instance.
+    """
+    def __init__(self, jobs, machines, width=100, **options):
+        super().__init__(jobs, machines, **options)
+        if width < 1:
+            raise ValueError("Beam width must be at least 1")
+        self.width = width
+        self.algorithm_name = f"Beam Search (width={width})"
+        self.visualization_data["algorithm_name"] = self.algorithm_name
+
+    def schedule_jobs(self):
+        start_time = time.time()
+        telemetry = self.telemetry
+        telemetry.reset()
+        self.visualization_data["search_iterations"] = 0
+        self.visualization_data["stop_reason"] = None
+
+        initial_node = ScheduleNode(self.instance, self.machines, problem=self.problem)
+        beam = [(self.heuristic(initial_node), 0, initial_node)]
+        states = StateTable()
+        counter = 1
+
+        while not beam[0][-1].is_goal():
+            stop_reason = self.budget_exceeded(start_time, beam)
+            if stop_reason:
+                self.visualization_data["stop_reason"] = stop_reason
+                best_node = self.complete_greedily(beam[0][-1])
+                break
+
+            # Duplicates and dominance only matter within a level, so the table holds one level
+            states.vectors.clear()
+            candidates = []
+            for h_value, _, node in beam:
+                telemetry.node_expanded(node.depth)
+                if telemetry.sampling:
+                    telemetry.sample({"level": node.depth, "heuristic": h_value, "makespan": node.makespan})
+                generated = node.get_successors()
+                telemetry.count("successors_generated", len(generated))
+                successors = [s for s in generated if states.add(s)]
+                if successors:
+                    for successor, successor_h in zip(successors, self.evaluate_successors(node, successors)):
+                        candidates.append((successor_h, counter, successor))
+                        counter += 1
+            telemetry.frontier_size(len(candidates))
+
+            # Drop candidates dominated by a state generated after them
+            candidates = [entry for entry in candidates
+                          if entry[-1].resource_times() in states.vectors[entry[-1].unscheduled_mask]]
+            beam = heapq.nsmallest(self.width, candidates)
+            self.visualization_data["search_iterations"] += 1
+        else:
+            # The whole beam is complete; return its shortest schedule
+            best_node = min((node for _, _, node in beam), key=lambda node: node.makespan)
+
+        self.record_search_stats(states, start_time)
+        self.visualization_data["beam_width"] = self.width
+        self.visualization_data["solution_path"] = best_node.get_path()
+        return self.format_schedule(best_node)
+
+
+class BoundedAStarBase(AStarScheduler):
+    """Root bound, dispatch incumbent and result reporting shared by IDA* and SMA*"""
+    def __init__(self, jobs, machines, table_size=100000, **options):
+        super().__init__(jobs, machines, **options)
+        self.table_size = table_size
+
+    def remember(self, table, key, value):
+        """Store value in an LRU table that never exceeds table_size entries"""
+        if self.table_size <= 0:
+            return
+        table[key] = value
+        table.move_to_end(key)
+        if len(table) > self.table_size:
+            table.popitem(last=False)
+
+    def expand(self, node, bound, bounds):
+        """(bound, successor) pairs of node, best first, with bounds tightened before branching"""
+        bound = max(bound, bounds.node_bound(node))
+        successors = node.get_successors()
+        self.telemetry.count("successors_generated", len(successors))
+        if not successors:
+            return []
+        h_values = self.evaluate_successors(node, successors)
+        children = [(self.lower_bound(successor, successor_h, bound), successor.makespan, i, successor)
+                    for i, (successor, successor_h) in enumerate(zip(successors, h_values))]
+        children.sort()
+        return [(child_bound, successor) for child_bound, _, _, successor in children]
+
+    def start(self):
+        """Root node, bounds helper and root bound; seeds the incumbent with a dispatch schedule"""
+        initial_node = ScheduleNode(self.instance, self.machines, problem=self.problem)
+        bounds = LowerBounds(initial_node.problem)
+        initial_bound = max(self.lower_bound(initial_node, self.heuristic(initial_node)),
+                            bounds.node_bound(initial_node))
+        self.seed_assignments, self.best_makespan = None, None
+        if self.seed_rule and self.problem.num_ops:
+            self.seed_assignments, self.best_makespan = DispatchScheduler(
+                self.instance, self.machines, self.seed_rule).dispatch()
+        self.best_bound = initial_bound
+        return initial_node, bounds, initial_bound
+
+    def finish(self, incumbent, open_node, lower_bound, start_time):
+        """Record the bound and statistics and format the best schedule found"""
+        if incumbent is not None:
+            best_assignments = incumbent.get_path()
+            upper_bound = incumbent.makespan
+        elif self.seed_assignments is not None:
+            best_assignments = self.seed_assignments  # Nothing beat the dispatch schedule
+            upper_bound = self.best_makespan
+        else:
+            incumbent = self.complete_greedily(open_node)
+            best_assignments = incumbent.get_path()
+            upper_bound = incumbent.makespan
+        lower_bound = min(lower_bound, upper_bound)
+        self.visualization_data["lower_bound"] = lower_bound
+        self.visualization_data["gap"] = (upper_bound - lower_bound) / upper_bound if upper_bound else 0.0
+        self.record_search_stats(self.states, start_time)
+        self.visualization_data["solution_path"] = best_assignments
+        return self.format_assignments(best_assignments)
+
+
+class IDAStarScheduler(BoundedAStarBase):
+    """
+    Iterative-deepening A*.
+
+    Each iteration is a depth-first search over the nodes whose admissible
+    bound is at most a threshold, starting at the root bound and rising to the
+    smallest bound that exceeded it. Memory is the current path with its
+    siblings, O(operations * branching), plus a transposition table of at most
+    table_size states holding the bound each one was proven to exceed, which
+    stops permutations of the same partial schedule from being searched again.
+    The first schedule found is optimal.
+    """
+    def __init__(self, jobs, machines, table_size=100000, **options):
+        super().__init__(jobs, machines, table_size=table_size, **options)
+        self.algorithm_name = "IDA* Search"
+        self.visualization_data["algorithm_name"] = self.algorithm_name
+
+    def schedule_jobs(self):
+        start_time = time.time()
+        telemetry = self.telemetry
+        telemetry.reset()
+        self.visualization_data["search_iterations"] = 0
+        self.visualization_data["stop_reason"] = None
+        self.states = StateTable()  # Counters only; the transposition table replaces it
+        initial_node, bounds, threshold = self.start()
+        upper_bound = self.best_makespan
+        table = OrderedDict()  # state key -> bound its completions were proven to reach
+        incumbent = None
+        open_node = initial_node
+        iterations = 0
+
+        while not initial_node.is_goal() and (upper_bound is None or threshold < upper_bound):
+            iterations += 1
+            # Frames: [node, children, next child index, smallest bound above the threshold]
+            stack = [[initial_node, self.expand(initial_node, threshold, bounds), 0, math.inf]]
+            held = len(stack[0][1])  # Nodes referenced by the stack
+            next_threshold = math.inf
+            telemetry.node_expanded(0)
+            while stack:
+                frame = stack[-1]
+                node, children, index, exceeded = frame
+                if index == len(children):
+                    # Every completion of node is above the threshold; remember by how much
+                    stack.pop()
+                    held -= len(children)
+                    self.remember(table, node.state_key(), exceeded)
+                    if stack:
+                        stack[-1][3] = min(stack[-1][3], exceeded)
+                    else:
+                        next_threshold = exceeded
+                    continue
+                frame[2] += 1
+                child_bound, child = children[index]
+                learned = table.get(child.state_key())
+                if learned is not None:
+                    self.states.duplicates += 1
+                    child_bound = max(child_bound, learned)
+                if child_bound > threshold or (upper_bound is not None and child_bound >= upper_bound):
+                    frame[3] = min(exceeded, child_bound)
+                    continue
+                if child.is_goal():
+                    # Nothing below the threshold was missed, so this schedule is optimal
+                    incumbent = child
+                    upper_bound = self.best_makespan = child.makespan
+                    break
+
+                stop_reason = self.budget_exceeded(start_time, stack)
+                if stop_reason:
+                    self.visualization_data["stop_reason"] = stop_reason
+                    open_node = child
+                    break
+                telemetry.node_expanded(child.depth)
+                if telemetry.sampling:
+                    telemetry.sample({"level": child.depth, "f_value": child_bound,
+                                      "threshold": threshold, "makespan": child.makespan})
+                stack.append([child, self.expand(child, child_bound, bounds), 0, math.inf])
+                held += len(stack[-1][1])
+                telemetry.frontier_size(held)
+                self.visualization_data["search_iterations"] += 1
+
+            if incumbent is not None or self.visualization_data["stop_reason"]:
+                break
+            # The whole tree below the threshold is exhausted: the optimum is above it
+            if next_threshold == math.inf:
+                break
+            threshold = self.best_bound = next_threshold
+
+        self.visualization_data["iterations"] = iterations
+        self.visualization_data["table_size"] = len(table)
+        if initial_node.is_goal():
+            incumbent = initial_node
+        return self.finish(incumbent, open_node, threshold, start_time)
+
+
+class SMAStarScheduler(BoundedAStarBase):
+    """
+    Simplified memory-bounded A* (SMA*).
+
+    Runs A* until memory_limit leaves are open, then drops the leaves with the
+    worst bound (the shallowest first among equals). A dropped leaf's bound is
+    backed up into its parent, which returns to the open list at once with the
+    smallest bound among its dropped children, to regenerate them when it is
+    the best node left. Every completion is thus represented in the open list,
+    bounds stay admissible and the first goal popped is optimal.
+
+    memory_limit must exceed the number of operations (the depth of a
+    schedule). Below what A* would hold, subtrees are dropped and regenerated
+    over and over and the run time grows exponentially, so set a budget.
+    """
+    def __init__(self, jobs, machines, memory_limit=100000, table_size=100000, **options):
+        super().__init__(jobs, machines, table_size=table_size, **options)
+        if memory_limit <= max(self.problem.num_ops, 1):
+            raise ValueError(f"memory_limit must exceed the number of operations ({self.problem.num_ops}), "
+                             f"got {memory_limit}")
+        self.memory_limit = memory_limit
+        self.algorithm_name = f"SMA* Search (memory={memory_limit})"
+        self.visualization_data["algorithm_name"] = self.algorithm_name
+
+    def schedule_jobs(self):
+        start_time = time.time()
+        telemetry = self.telemetry
+        telemetry.reset()
+        self.visualization_data["search_iterations"] = 0
+        self.visualization_data["stop_reason"] = None
+        self.states = StateTable()  # Counters only
+        initial_node, bounds, initial_bound = self.start()
+        upper_bound = self.best_makespan
+
+        best = []  # Min-heap (bound, -depth, counter, key, node): deepest first among equal bounds
+        worst = []  # Max-heap (-bound, depth, counter, key, node): shallowest first among equal bounds
+        live = {}  # state key -> counter of its current open entry
+        reopened = set()  # Keys of open parents that still have children in memory (not droppable leaves)
+        children = {}  # expanded node -> number of its children still in memory
+        forgotten = {}  # node -> smallest bound among its dropped children
+        generated = OrderedDict()  # Keys of states generated and not dropped, at most table_size
+        counter = 0
+        dropped = 0
+
+        def push(node, bound):
+            nonlocal counter
+            counter += 1
+            key = node.state_key()
+            live[key] = counter
+            reopened.discard(key)
+            heapq.heappush(best, (bound, -node.depth, counter, key, node))
+            heapq.heappush(worst, (-bound, node.depth, counter, key, node))
+
+        def reopen(node, bound):
+            """Put an expanded node with children in memory back in the open list, to regenerate dropped ones"""
+            nonlocal counter
+            counter += 1
+            key = node.state_key()
+            live[key] = counter
+            reopened.add(key)
+            heapq.heappush(best, (bound, -node.depth, counter, key, node))
+
+        def release(node):
+            """node left memory: its parent may become a leaf again or be done too"""
+            parent = node.parent
+            while parent is not None:
+                children[parent] -= 1
+                if children[parent] > 0:
+                    return
+                del children[parent]
+                backed_up = forgotten.pop(parent, None)
+                if backed_up is not None:
+                    push(parent, backed_up)
+                    return
+                parent = parent.parent  # Every completion below parent was searched
+
+        push(initial_node, initial_bound)
+        incumbent = None
+        open_node = initial_node
+        lower_bound = initial_bound
+        while live:
+            bound, _, entry_counter, key, node = heapq.heappop(best)
+            if live.get(key) != entry_counter:
+                continue  # Dropped or re-pushed since
+            del live[key]
+            reopened.discard(key)
+            forgotten.pop(node, None)  # Its dropped children are regenerated below
+            if upper_bound is not None and bound >= upper_bound:
+                lower_bound = upper_bound  # Nothing left can beat the incumbent
+                break
+            if bound > self.best_bound:
+                self.best_bound = bound  # Bounds are popped in nondecreasing order
+            if node.is_goal():
+                incumbent = node
+                upper_bound = self.best_makespan = node.makespan
+                lower_bound = bound
+                break
+
+            stop_reason = self.budget_exceeded(start_time, live)
+            if stop_reason:
+                self.visualization_data["stop_reason"] = stop_reason
+                open_node = node
+                lower_bound = bound
+                break
+            telemetry.node_expanded(node.depth)
+            if telemetry.sampling:
+                telemetry.sample({"level": node.depth, "f_value": bound, "makespan": node.makespan})
+            self.visualization_data["search_iterations"] += 1
+
+            # Regenerate only children that are not in memory already (or were expanded before)
+            made = 0
+            for child_bound, child in self.expand(node, bound, bounds):
+                child_key = child.state_key()
+                if child_key in live or child_key in generated:
+                    self.states.duplicates += 1
+                    continue
+                if upper_bound is not None and child_bound >= upper_bound:
+                    continue
+                self.remember(generated, child_key, True)
+                push(child, child_bound)
+                made += 1
+            if made:
+                children[node] = children.get(node, 0) + made
+            elif node not in children:
+                release(node)
+
+            # Over the limit: drop the worst leaves and back their bounds up
+            while len(live) - len(reopened) > self.memory_limit and worst:
+                negative_bound, _, entry_counter, key, leaf = heapq.heappop(worst)
+                if live.get(key) != entry_counter or leaf.parent is None:
+                    continue
+                del live[key]
+                generated.pop(key, None)
+                parent = leaf.parent
+                forgotten[parent] = min(forgotten.get(parent, math.inf), -negative_bound)
+                dropped += 1
+                release(leaf)
+                if parent in children:
+                    reopen(parent, forgotten[parent])
+            telemetry.frontier_size(len(live) - len(reopened))
+
+            # Stale entries are skipped lazily; rebuild the heaps once they dominate
+            if len(best) > 4 * self.memory_limit:
+                best[:] = [entry for entry in best if live.get(entry[3]) == entry[2]]
+                worst[:] = [entry for entry in worst if live.get(entry[3]) == entry[2] and entry[3] not in reopened]
+                heapq.heapify(best)
+                heapq.heapify(worst)
+
+        if not live and incumbent is None and upper_bound is not None:
+            lower_bound = upper_bound  # The search space is exhausted: the dispatch schedule is optimal
+        if forgotten:
+            lower_bound = min(lower_bound, min(forgotten.values()))  # Dropped subtrees were not searched
+        self.visualization_data["memory_limit"] = self.memory_limit
+        self.visualization_data["nodes_dropped"] = dropped
+        return self.finish(incumbent, open_node, lower_bound, start_time)
@@ -0,0 +1,88 @@
+"""
+Lower bounds on the makespan of any completion of a partial schedule, used by
+A* for branch-and-bound pruning and by the API to report optimality gaps.
+"""
+
+
+class LowerBounds:
+    """
+    Bounds for the search nodes of one problem (a scheduler.SearchProblem).
+
+    - machine_load: per machine, the earliest it can restart plus its remaining work
+    - release_tail: Jackson's preemptive bound per machine; for every release
+      date, the work released at or after it must run after it. This dominates
+      the longest-job bound (release + processing time of a single job).
+    - job_tail: for multi-operation jobs, when each job can resume plus the
+      shortest processing times of its remaining operations
+    - average_load: for flexible operations, all remaining work spread evenly
+      over the machines
+
+    The machine bounds only count operations bound to a single machine.
+
+    Bounds only grow along a search path, so a child may inherit its parent's
+    bound; see AStarScheduler.
+    """
+    def __init__(self, problem):
+        self.problem = problem
+        self.has_releases = any(problem.release_times)
+        # Each machine's operations by release date, for the release-aware bounds
+        self.by_release = [[] for _ in range(problem.num_machines)]
+        for op_idx in sorted(range(problem.num_ops), key=lambda o: problem.release_times[o]):
+            if problem.machine_indices[op_idx] >= 0:
+                self.by_release[problem.machine_indices[op_idx]].append(op_idx)
+
+    def machine_load(self, node):
+        """Max over machines of restart time plus remaining work, O(machines) without releases"""
+        if not self.has_releases:
+            return max((t + r for t, r in zip(node.machine_times, node.remaining_by_machine)), default=0)
+        releases = self.problem.release_times
+        mask = node.unscheduled_mask
+        best = 0
+        for machine_idx, (current_time, remaining) in enumerate(zip(node.machine_times, node.remaining_by_machine)):
+            start = current_time
+            if remaining:
+                # The machine idles until the first of its remaining operations is released
+                for op_idx in self.by_release[machine_idx]:
+                    if mask >> op_idx & 1:
+                        start = max(start, releases[op_idx])
+                        break
+            best = max(best, start + remaining)
+        return best
+
+    def release_tail(self, node):
+        """Jackson's preemptive single-machine bound over each machine's remaining operations, O(ops)"""
+        releases = self.problem.release_times
+        times = self.problem.processing_times
+        mask = node.unscheduled_mask
+        best = 0
+        for machine_idx, ops in enumerate(self.by_release):
+            if not node.remaining_by_machine[machine_idx]:
+                continue
+            current_time = node.machine_times[machine_idx]
+            tail = 0
+            for op_idx in reversed(ops):
+                if mask >> op_idx & 1:
+                    tail += times[op_idx]
+                    best = max(best, max(current_time, releases[op_idx]) + tail)
+        return best
+
+    def job_tail(self, node):
+        """Latest finish of any job running its remaining operations back to back, O(jobs)"""
+        return max((tail for _, tail in node.job_tails()), default=0)
+
+    def average_load(self, node):
+        """Remaining work spread over all machines from their current times, O(machines)"""
+        return (sum(node.machine_times) + node.remaining_work) / self.problem.num_machines
+
+    def node_bound(self, node):
+        """Strongest available bound for node; equals the makespan at a goal"""
+        if node.is_goal():
+            return node.makespan
+        bound = max(node.makespan, self.machine_load(node))
+        if self.has_releases:
+            bound = max(bound, self.release_tail(node))
+        if self.problem.has_precedence:
+            bound = max(bound, self.job_tail(node))
+        if self.problem.flexible:
+            bound = max(bound, self.average_load(node))
+        return bound
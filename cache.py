@@ -0,0 +1,168 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+def operation_order(instance, order):
+    """Caller operation indices in canonical order (operations are numbered job by job)"""
+    op_start = instance.op_start.tolist()
+    return [op_idx for i in order for op_idx in range(op_start[i], op_start[i + 1])]
+
+
+class ScheduleCache:
+    """
+    LRU/TTL cache of /schedule responses keyed by a canonical problem fingerprint.
+
+    The fingerprint is the sorted multiset of job signatures plus every request
+    setting (scheduler type, machine count, budgets, ...), so resubmitting the
+    same jobs in any order or under different ids is a hit. Cached entries refer
+    to jobs by their rank in the canonical order and are remapped to the
+    caller's job ids on the way out.
+
+    With path set, entries are also written to a SQLite file so the cache
+    survives worker restarts and is shared between workers on one host.
+    """
+    def __init__(self, max_entries=1024, ttl_seconds=3600, path=None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.path = path
+        self.entries = OrderedDict()  # key -> (expires_at, payload)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        if path:
+            with sqlite3.connect(path) as db:
+                db.execute("CREATE TABLE IF NOT EXISTS schedule_cache "
+                           "(key TEXT PRIMARY KEY, payload TEXT, expires_at REAL, used_at REAL)")
+
+    def fingerprint(self, instance, settings):
+        """
+        Returns (key, order) for an Instance: order lists the caller's job
+        indices in canonical order. key is None when the jobs cannot be
+        remapped (duplicate ids).
+        """
+        signatures = [instance.job_signature(i) for i in range(instance.num_jobs)]
+        order = sorted(range(instance.num_jobs), key=lambda i: signatures[i])
+        if len(set(instance.job_ids.tolist())) != instance.num_jobs:
+            return None, order
+        canonical = {
+            "jobs": [signatures[i] for i in order],
+            "settings": settings,
+        }
+        digest = hashlib.sha256(json.dumps(canonical, sort_keys=True).encode()).hexdigest()
+        return digest, order
+
+    def canonicalize(self, response, instance, order):
+        """Replace the caller's job ids and indices in a response with canonical ranks"""
+        rank = {caller_idx: position for position, caller_idx in enumerate(order)}
+        op_rank = {caller_idx: position for position, caller_idx in enumerate(operation_order(instance, order))}
+        index_of = {job_id: i for i, job_id in enumerate(instance.job_ids.tolist())}
+        payload = dict(response)
+        payload["schedule"] = [(rank[index_of[job_id]], start, end, machine)
+                               for job_id, start, end, machine in response["schedule"]]
+        visualization = dict(response["visualization"])
+        visualization["solution_path"] = [(op_rank[op_idx], start, machine_idx)
+                                          for op_idx, start, machine_idx in visualization["solution_path"]]
+        payload["visualization"] = visualization
+        return json.dumps(payload)
+
+    def restore(self, payload, instance, order):
+        """Inverse of canonicalize() for the caller's jobs"""
+        response = json.loads(payload)
+        op_order = operation_order(instance, order)
+        job_ids = instance.job_ids.tolist()
+        response["schedule"] = [(job_ids[order[position]], start, end, machine)
+                                for position, start, end, machine in response["schedule"]]
+        response["visualization"]["solution_path"] = [
+            (op_order[position], start, machine_idx)
+            for position, start, machine_idx in response["visualization"]["solution_path"]
+        ]
+        return response
+
+    def get(self, key):
+        """Cached payload for key, or None"""
+        now = time.time()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                expires_at, payload = entry
+                if expires_at >= now:
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return payload
+                del self.entries[key]
+                self.expirations += 1
+            payload = self._load(key, now)
+            if payload is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, payload, now + self.ttl_seconds)
+            return payload
+
+    def put(self, key, payload):
+        now = time.time()
+        with self.lock:
+            self._remember(key, payload, now + self.ttl_seconds)
+            self._store(key, payload, now)
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self.entries),
+                "maxEntries": self.max_entries,
+                "ttlSeconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "persistent": bool(self.path),
+            }
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            if self.path:
+                with sqlite3.connect(self.path) as db:
+                    db.execute("DELETE FROM schedule_cache")
+
+    def _remember(self, key, payload, expires_at):
+        self.entries[key] = (expires_at, payload)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def _load(self, key, now):
+        if not self.path:
+            return None
+        with sqlite3.connect(self.path) as db:
+            row = db.execute("SELECT payload, expires_at FROM schedule_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] < now:
+                db.execute("DELETE FROM schedule_cache WHERE key = ?", (key,))
+                self.expirations += 1
+                return None
+            db.execute("UPDATE schedule_cache SET used_at = ? WHERE key = ?", (now, key))
+            return row[0]
+
+    def _store(self, key, payload, now):
+        if not self.path:
+            return
+        with sqlite3.connect(self.path) as db:
+            db.execute("INSERT OR REPLACE INTO schedule_cache VALUES (?, ?, ?, ?)",
+                       (key, payload, now + self.ttl_seconds, now))
+            # Keep the file bounded by evicting the least recently used rows
+            count = db.execute("SELECT COUNT(*) FROM schedule_cache").fetchone()[0]
+            if count > self.max_entries:
+                db.execute("DELETE FROM schedule_cache WHERE key IN (SELECT key FROM schedule_cache "
+                           "ORDER BY used_at LIMIT ?)", (count - self.max_entries,))
+                self.evictions += count - self.max_entries
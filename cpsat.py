@@ -0,0 +1,199 @@
+"""
+Exact scheduling with the OR-Tools CP-SAT solver. Kept apart from scheduler.py
+so that only the processes that run it pay for importing OR-Tools.
+"""
+import os
+import time
+from collections import defaultdict
+
+from ortools.sat.python import cp_model
+
+from scheduler import Scheduler, DispatchScheduler
+
+
+class SolutionReporter(cp_model.CpSolverSolutionCallback):
+    """Counts each improving CP-SAT solution and passes it to the scheduler's progress callback"""
+    def __init__(self, scheduler, start_time):
+        super().__init__()
+        self.scheduler = scheduler
+        self.start_time = start_time
+
+    def on_solution_callback(self):
+        scheduler = self.scheduler
+        scheduler.best_makespan = int(self.ObjectiveValue())
+        scheduler.best_bound = int(self.BestObjectiveBound())
+        scheduler.telemetry.nodes_expanded = self.NumBranches()
+        scheduler.telemetry.count("solutions")
+        scheduler.report_incumbent(self.start_time)
+        if scheduler.cancel_requested:
+            self.StopSearch()
+
+
+class OptimizedScheduler(Scheduler):
+    """
+    Advanced scheduler using Google OR-Tools CP-SAT solver.
+
+    The model is built once per instance (intervals grouped by machine, with
+    optional intervals for operations that may run on several machines) and
+    reused by later solves. Each solve is warm-started with a dispatch-rule
+    schedule as solution hint, runs on num_workers parallel workers and stops at
+    max_seconds or once the relative gap drops to relative_gap.
+    """
+    def __init__(self, jobs, machines, num_workers=None, max_seconds=None, relative_gap=0.0,
+                 hint_rule="lpt", **options):
+        super().__init__(jobs, machines, max_seconds=max_seconds, **options)
+        self.num_workers = num_workers or min(8, os.cpu_count() or 1)
+        self.relative_gap = relative_gap or self.target_gap or 0.0
+        self.hint_rule = hint_rule
+        self.model = None
+        self.algorithm_name = "CP-SAT (OR-Tools)"
+        self.visualization_data["algorithm_name"] = self.algorithm_name
+        self.visualization_data["solver_status"] = None
+
+    def build_model(self):
+        """Create the CP-SAT model; variables are kept for hints and solution readout"""
+        model = cp_model.CpModel()
+        problem = self.problem
+        
+        # Maximum possible horizon (latest release plus all processing times)
+        horizon = max(problem.release_times, default=0)
+        horizon += sum(max(time for _, time in problem.alternatives(o)) for o in range(problem.num_ops))
+        
+        # One interval per operation; an operation with several eligible machines
+        # gets an optional interval on each, exactly one of which is present
+        self.starts = {}
+        self.presences = {}  # op_idx -> [(machine_idx, literal)] for flexible operations
+        ends = {}
+        intervals_by_machine = defaultdict(list)
+        makespan = model.NewIntVar(0, horizon, 'makespan')
+        for o in range(problem.num_ops):
+            start = model.NewIntVar(problem.release_times[o], horizon, f'start_{o}')
+            end = model.NewIntVar(0, horizon, f'end_{o}')
+            alternatives = list(problem.alternatives(o))
+            if len(alternatives) == 1:
+                m, processing_time = alternatives[0]
+                intervals_by_machine[m].append(model.NewIntervalVar(start, processing_time, end, f'interval_{o}_{m}'))
+            else:
+                self.presences[o] = []
+                for m, processing_time in alternatives:
+                    present = model.NewBoolVar(f'present_{o}_{m}')
+                    intervals_by_machine[m].append(
+                        model.NewOptionalFixedSizeIntervalVar(start, processing_time, present, f'interval_{o}_{m}'))
+                    model.Add(end == start + processing_time).OnlyEnforceIf(present)
+                    self.presences[o].append((m, present))
+                model.AddExactlyOne([present for _, present in self.presences[o]])
+            self.starts[o] = start
+            ends[o] = end
+            if problem.op_last[o]:
+                model.Add(end <= makespan)
+        
+        # Operations of a job run in order
+        for o in range(problem.num_ops):
+            if not problem.op_last[o]:
+                model.Add(self.starts[o + 1] >= ends[o])
+        
+        # No-overlap constraint per machine, over only that machine's intervals
+        for machine_intervals in intervals_by_machine.values():
+            model.AddNoOverlap(machine_intervals)
+        
+        # Objective function: Minimize makespan (maximum end time)
+        model.Minimize(makespan)
+        self.model = model
+        self.makespan_var = makespan
+        return model
+
+    def add_hint(self, assignments, makespan):
+        """Warm start the solver from a known schedule"""
+        self.model.ClearHints()
+        for op_idx, start_time, machine_idx in assignments:
+            self.model.AddHint(self.starts[op_idx], start_time)
+            for m, present in self.presences.get(op_idx, ()):
+                self.model.AddHint(present, m == machine_idx)
+        self.model.AddHint(self.makespan_var, makespan)
+        
+    def stop_reason(self, solver, status, gap):
+        """
+        Why a solve ended: None once proven optimal, the limit that stopped it,
+        or else the solver status in lower case (infeasible, model_invalid, ...)
+        """
+        if self.cancel_requested:
+            return "cancelled"
+        if status == cp_model.OPTIMAL and not gap:
+            return None
+        if self.relative_gap and gap is not None and gap <= self.relative_gap:
+            return "relative_gap"
+        if self.max_seconds is not None and status in (cp_model.FEASIBLE, cp_model.UNKNOWN):
+            return "max_seconds"
+        return solver.StatusName(status).lower()
+
+    def schedule_jobs(self):
+        start_time = time.time()
+        self.telemetry.reset()
+        if self.model is None:
+            with self.telemetry.phase("model_build"):
+                self.build_model()
+        
+        # Warm start from a fast dispatch schedule, also used if no solution is found in time
+        hint_assignments = None
+        if self.hint_rule and self.problem.num_ops:
+            with self.telemetry.phase("hint"):
+                hint_assignments, hint_makespan = DispatchScheduler(self.instance, self.machines,
+                                                                    self.hint_rule).dispatch()
+                self.add_hint(hint_assignments, hint_makespan)
+        
+        # Solve
+        solver = cp_model.CpSolver()
+        solver.parameters.num_search_workers = self.num_workers
+        if self.max_seconds is not None:
+            solver.parameters.max_time_in_seconds = self.max_seconds
+        if self.relative_gap:
+            solver.parameters.relative_gap_limit = self.relative_gap
+        reporter = SolutionReporter(self, start_time)
+        if self.progress_callback is not None:
+            # Solutions and bound improvements are reported as they happen; a False reply stops the solver
+            def report_bound(bound):
+                self.best_bound = int(bound)
+                if self.progress_callback(self.progress(start_time)) is False:
+                    self.cancel_requested = True
+                    solver.StopSearch()
+            solver.best_bound_callback = report_bound
+        with self.telemetry.phase("solve"):
+            status = solver.Solve(self.model, reporter)
+        readout_started = time.perf_counter()
+        
+        assignments = []
+        if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
+            for o in range(self.problem.num_ops):
+                machine_idx = self.problem.machine_indices[o]
+                if o in self.presences:
+                    machine_idx = next(m for m, present in self.presences[o] if solver.BooleanValue(present))
+                assignments.append((o, solver.Value(self.starts[o]), machine_idx))
+            upper_bound = int(solver.ObjectiveValue())
+            lower_bound = int(solver.BestObjectiveBound())
+        elif hint_assignments is not None:
+            assignments = hint_assignments
+            upper_bound = hint_makespan
+            lower_bound = None
+        else:
+            upper_bound = lower_bound = None
+        
+        if lower_bound is None:
+            gap = None
+        else:
+            gap = (upper_bound - lower_bound) / upper_bound if upper_bound else 0.0
+        
+        stop_reason = self.stop_reason(solver, status, gap)
+        
+        self.telemetry.add_time("readout", time.perf_counter() - readout_started)
+        self.telemetry.nodes_expanded = solver.NumBranches()
+        self.telemetry.count("conflicts", solver.NumConflicts())
+        self.telemetry.export(self.visualization_data)
+        self.visualization_data["solver_status"] = solver.StatusName(status)
+        self.visualization_data["stop_reason"] = stop_reason
+        self.visualization_data["search_iterations"] = solver.NumConflicts()
+        self.visualization_data["lower_bound"] = lower_bound
+        self.visualization_data["gap"] = gap
+        self.visualization_data["solution_path"] = assignments
+        self.visualization_data["solver_wall_time"] = solver.WallTime()
+        self.visualization_data["execution_time"] = time.time() - start_time
+        return self.format_assignments(assignments)
@@ -0,0 +1,201 @@
+"""
+Decomposed solving: the jobs of an instance often fall into groups that share
+no machine (every job pinned to one machine is the extreme case). Each group
+is solved as an instance of its own, one after another or in parallel
+processes, and the schedules are merged.
+"""
+import multiprocessing
+import os
+import time
+
+from scheduler import Scheduler
+from instance import Instance
+
+STOP = None  # Shared stop flag of a worker process, set by init_worker()
+
+
+def init_worker(stop):
+    global STOP
+    STOP = stop
+
+
+def component_key(instance):
+    """Components with equal keys have the same schedules, up to job ids"""
+    return (instance.num_machines,) + tuple(getattr(instance, name).tobytes() for name in Instance.COLUMNS[1:])
+
+
+def solve_component(factory, instance, job_indices, options, handle=None):
+    """
+    Solve the jobs job_indices of instance (or of the Instance.attach()ed
+    handle, in a worker process) with the scheduler factory builds; returns a
+    summary with the schedule in the component's own operation and machine indices
+    """
+    started = time.time()
+    if handle is not None:
+        instance = Instance.attach(handle)
+        options = dict(options, progress_callback=lambda progress: not STOP.value)
+    sub_instance = instance.subset(job_indices)[0]
+    scheduler = factory(sub_instance, sub_instance.machines, **options)
+    scheduler.schedule_jobs()
+    data = scheduler.visualization_data
+    return {
+        "algorithm_name": scheduler.algorithm_name,
+        "makespan": scheduler.result.makespan,
+        "lower_bound": data.get("lower_bound"),
+        "stop_reason": data.get("stop_reason"),
+        "nodes_expanded": data.get("nodes_expanded", 0),
+        "seconds": time.time() - started,
+        "solution_path": data["solution_path"],
+        "visualization": {key: data.get(key) for key in (
+            "search_iterations", "duplicates_pruned", "dominated_pruned", "heuristic_values",
+            "exploration_by_level", "ordered_jobs", "phases")},
+    }
+
+
+class DecomposedScheduler(Scheduler):
+    """
+    Solves each independent component of the instance (Instance.components())
+    with its own scheduler and merges their schedules; the makespan is the
+    largest of the components'.
+
+    factory(instance, machines, **options) builds the scheduler of one
+    component; it gets max_seconds and max_nodes shares of the budget along
+    with the telemetry settings. Components that are the same up to job ids
+    are solved once. With workers > 1 the components are solved in that many
+    processes (at most one per CPU), which attach to the instance in shared
+    memory; factory then has to be picklable (a module-level function or a
+    functools.partial of one).
+    """
+    def __init__(self, jobs, machines, factory, workers=1, telemetry="sampled", telemetry_samples=500, **options):
+        super().__init__(jobs, machines, telemetry=telemetry, telemetry_samples=telemetry_samples, **options)
+        self.factory = factory
+        self.workers = max(1, min(workers, os.cpu_count() or 1))
+        self.component_options = {"telemetry": telemetry, "telemetry_samples": telemetry_samples,
+                                  "progress_interval": self.progress_interval}
+        self.components = self.instance.components()
+        self.algorithm_name = f"Decomposed search ({len(self.components)} components)"
+        self.visualization_data["algorithm_name"] = self.algorithm_name
+
+    def budget(self, left, seconds_used=0, nodes_used=0, parallel=1):
+        """max_seconds and max_nodes of the next component when left components still need theirs"""
+        share = {"max_seconds": None, "max_nodes": None}
+        if self.max_seconds is not None:
+            share["max_seconds"] = max(self.max_seconds - seconds_used, 0) * min(parallel, left) / left
+        if self.max_nodes is not None:
+            share["max_nodes"] = max((self.max_nodes - nodes_used) // left, 1)
+        return share
+
+    def solve_in_turn(self, unique, start_time):
+        """Solve the components one after another, passing progress reports on"""
+        results = {}
+        nodes_used = 0
+
+        def report(progress):
+            progress = dict(progress, nodes_expanded=nodes_used + progress["nodes_expanded"],
+                            elapsed=time.time() - start_time, best_makespan=None, lower_bound=None, gap=None)
+            progress.pop("incumbent", None)  # A component's schedule is not one of the whole instance
+            if self.progress_callback(progress) is False:
+                self.cancel_requested = True
+            return not self.cancel_requested
+
+        for left, (key, job_indices) in zip(range(len(unique), 0, -1), unique.items()):
+            options = dict(self.component_options, **self.budget(left, time.time() - start_time, nodes_used))
+            if self.progress_callback is not None:
+                options["progress_callback"] = report
+            results[key] = solve_component(self.factory, self.instance, job_indices, options)
+            nodes_used += results[key]["nodes_expanded"]
+        return results
+
+    def solve_in_parallel(self, unique, start_time):
+        """Solve the components in worker processes; a cancelled progress report stops them all"""
+        context = multiprocessing.get_context()
+        stop = context.Value("b", False)
+        block, handle = self.instance.share()
+        options = dict(self.component_options, **self.budget(len(unique), parallel=self.workers))
+        try:
+            with context.Pool(min(self.workers, len(unique)), initializer=init_worker, initargs=(stop,)) as pool:
+                pending = {key: pool.apply_async(solve_component, (self.factory, None, job_indices, options, handle))
+                           for key, job_indices in unique.items()}
+                results = {}
+                next_report = start_time
+                while pending:
+                    for key in [key for key, task in pending.items() if task.ready()]:
+                        results[key] = pending.pop(key).get()
+                    now = time.time()
+                    if self.progress_callback is not None and now >= next_report:
+                        next_report = now + 0.5
+                        progress = dict(self.progress(start_time), nodes_expanded=sum(
+                            result["nodes_expanded"] for result in results.values()))
+                        if self.progress_callback(progress) is False:
+                            self.cancel_requested = stop.value = True
+                    if pending:
+                        next(iter(pending.values())).wait(0.05)
+        finally:
+            block.close()
+            block.unlink()
+        return results
+
+    def schedule_jobs(self):
+        start_time = time.time()
+        self.visualization_data["stop_reason"] = None
+
+        # Solve one of each group of components that are the same up to job ids
+        parts = [self.instance.subset(job_indices) for job_indices in self.components]
+        keys = [component_key(sub_instance) for sub_instance, _, _ in parts]
+        unique = {}
+        for key, job_indices in zip(keys, self.components):
+            unique.setdefault(key, job_indices)
+        if self.workers > 1 and len(unique) > 1:
+            solved = self.solve_in_parallel(unique, start_time)
+        else:
+            solved = self.solve_in_turn(unique, start_time)
+
+        # Map each component's schedule back; a repeated one reuses its twin's
+        assignments = []
+        components = []
+        for job_indices, key, (_, op_indices, machine_indices) in zip(self.components, keys, parts):
+            result = solved[key]
+            op_indices, machine_indices = op_indices.tolist(), machine_indices.tolist()
+            assignments.extend((op_indices[op_idx], start, machine_indices[machine_idx])
+                               for op_idx, start, machine_idx in result["solution_path"])
+            components.append({
+                "jobs": len(job_indices),
+                "machines": [machine_idx + 1 for machine_idx in machine_indices],
+                "reused": unique[key] is not job_indices,
+                **{name: result[name] for name in ("makespan", "lower_bound", "stop_reason", "nodes_expanded",
+                                                   "seconds")},
+            })
+        schedule = self.format_assignments(sorted(assignments, key=lambda assignment: assignment[1]))
+        makespan = self.result.makespan
+
+        results = list(solved.values())
+        data = self.visualization_data
+        if results:
+            self.algorithm_name = f"{results[0]['algorithm_name']}, decomposed ({len(self.components)} components)"
+        data["algorithm_name"] = self.algorithm_name
+        data["components"] = components
+        data["stop_reason"] = next((result["stop_reason"] for result in results if result["stop_reason"]), None)
+        if self.cancel_requested:
+            data["stop_reason"] = "cancelled"
+        bounds = [result["lower_bound"] for result in results]
+        if results and None not in bounds:
+            # Every component's schedule is at least as long as its bound
+            data["lower_bound"] = min(max(bounds), makespan)
+            data["gap"] = (makespan - data["lower_bound"]) / makespan if makespan else 0.0
+        data["nodes_expanded"] = sum(result["nodes_expanded"] for result in results)
+        for name in ("search_iterations", "duplicates_pruned", "dominated_pruned", "ordered_jobs"):
+            data[name] = sum(result["visualization"][name] or 0 for result in results)
+        data["heuristic_values"] = [value for result in results for value in result["visualization"]["heuristic_values"] or ()]
+        levels = {}
+        for result in results:
+            for level, count in (result["visualization"]["exploration_by_level"] or {}).items():
+                levels[level] = levels.get(level, 0) + count
+        data["exploration_by_level"] = levels
+        phases = {"setup": self.telemetry.setup_time}
+        for result in results:
+            for name, seconds in (result["visualization"]["phases"] or {}).items():
+                phases[name] = phases.get(name, 0.0) + seconds
+        data["phases"] = phases
+        data["solution_path"] = self.result.assignments
+        data["execution_time"] = time.time() - start_time
+        return schedule
@@ -0,0 +1,106 @@
+"""
+Encoding of /schedule responses for large instances, where building and
+sending the JSON can take as long as the solve.
+
+Clients pick the response fields ("fields"), the schedule layout ("layout":
+rows of [jobId, start, end, machine] or columnar parallel arrays) and, through
+Accept-Encoding, gzip or zstd compression. Bodies are serialized with orjson
+when it is installed and compressed with zstd when zstandard is.
+"""
+import gzip
+import json
+
+try:
+    import orjson
+except ImportError:  # Optional: the standard library encoder is used instead
+    orjson = None
+try:
+    import zstandard
+except ImportError:  # Optional: only gzip is offered
+    zstandard = None
+
+RESPONSE_FIELDS = ("schedule", "makespan", "lowerBound", "gap", "totalProcessingTime", "numOperations", "numJobs",
+                   "numMachines", "visualization", "profile")
+LAYOUTS = ("rows", "columnar")
+SCHEDULE_COLUMNS = ("jobId", "start", "end", "machine")
+
+# Bodies smaller than this are sent uncompressed; compressing them saves less than it costs
+COMPRESS_MIN_BYTES = 1024
+# Fast levels: on a 12 MB response gzip level 1 takes a third of the time of level 5 for 15% more bytes
+GZIP_LEVEL = 1
+ZSTD_LEVEL = 3
+
+
+def response_options(data):
+    """(fields, layout) requested by a /schedule body; fields None means all. Raises ValueError."""
+    fields = data.get("fields")
+    if isinstance(fields, str):
+        fields = [field.strip() for field in fields.split(",") if field.strip()]
+    if fields is not None:
+        unknown = [field for field in fields if field not in RESPONSE_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown response fields {unknown}, expected some of {list(RESPONSE_FIELDS)}")
+    layout = data.get("layout", "rows")
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout '{layout}', expected one of {list(LAYOUTS)}")
+    return fields, layout
+
+
+def shape(response, fields=None, layout="rows"):
+    """A /schedule response with only fields (all if None), its schedule in the given layout"""
+    if fields is not None:
+        response = {key: value for key, value in response.items() if key in fields}
+    if layout == "columnar" and "schedule" in response:
+        rows = response["schedule"]
+        response = dict(response, schedule={name: [row[i] for row in rows] for i, name in enumerate(SCHEDULE_COLUMNS)})
+    return response
+
+
+def dumps(value):
+    """JSON bytes of value; integer dict keys (as in exploration_by_level) become strings"""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(value, separators=(",", ":")).encode()
+
+
+def encoding_qualities(header):
+    """Content coding -> quality (q value, 1 by default) from an Accept-Encoding header"""
+    qualities = {}
+    for part in header.split(","):
+        coding, _, params = part.partition(";")
+        params = params.strip()
+        try:
+            quality = float(params[2:]) if params.startswith("q=") else 1.0
+        except ValueError:
+            continue
+        if coding.strip():
+            qualities[coding.strip().lower()] = quality
+    return qualities
+
+
+def choose_encoding(header):
+    """zstd or gzip, whichever an Accept-Encoding header prefers (zstd on a tie); None for neither"""
+    qualities = encoding_qualities(header or "")
+    available = ("zstd", "gzip") if zstandard is not None else ("gzip",)
+    best = max(available, key=lambda coding: qualities.get(coding, qualities.get("*", 0)))
+    return best if qualities.get(best, qualities.get("*", 0)) > 0 else None
+
+
+def compress(body, encoding):
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(body)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=GZIP_LEVEL)
+    raise ValueError(f"Unknown content encoding '{encoding}'")
+
+
+def encode(response, accept_encoding=None, fields=None, layout="rows"):
+    """
+    Body and Content-Encoding (None when sent as is) of a shaped /schedule
+    response for a client sending accept_encoding
+    """
+    body = dumps(shape(response, fields, layout))
+    encoding = choose_encoding(accept_encoding) if len(body) >= COMPRESS_MIN_BYTES else None
+    if encoding is not None:
+        body = compress(body, encoding)
+    return body, encoding
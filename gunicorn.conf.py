@@ -0,0 +1,45 @@
+"""
+Gunicorn settings:
+
+    gunicorn -c gunicorn.conf.py app:app
+
+The app and the engines named in WARM_ENGINES (comma-separated schedulerTypes,
+every engine by default, empty for none) are loaded in the master process
+before it forks, so workers start warm and share those modules copy-on-write.
+PRELOAD_APP=0 loads them in each worker instead. PROFILE_STARTUP=1 logs how
+long each import took.
+"""
+import os
+
+import startup
+
+bind = os.environ.get("BIND", f"0.0.0.0:{os.environ.get('PORT', 5000)}")
+workers = int(os.environ.get("WEB_CONCURRENCY", 2))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 120))
+preload_app = os.environ.get("PRELOAD_APP", "1") != "0"
+profile_startup = os.environ.get("PROFILE_STARTUP", "0") != "0"
+
+
+def warm_engines():
+    """schedulerTypes listed in WARM_ENGINES; None means all of them"""
+    names = os.environ.get("WARM_ENGINES")
+    if names is None:
+        return None
+    return [name.strip() for name in names.split(",") if name.strip()]
+
+
+def load(log):
+    timings = startup.import_times(startup.APP_MODULES) + startup.warm_up(warm_engines())
+    if profile_startup:
+        startup.report(timings, log)
+
+
+def on_starting(server):
+    # Runs in the master before the app is preloaded and the workers are forked
+    if preload_app:
+        load(server.log.info)
+
+
+def post_worker_init(worker):
+    if not preload_app:
+        load(worker.log.info)
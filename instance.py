@@ -0,0 +1,325 @@
+"""
+Immutable, array-backed job shop instances and the schedules solved for them.
+
+An Instance is built once (from a request body, a file or Job objects) and is
+only read afterwards, so any number of solves, threads or worker processes can
+share it; Instance.share() places its columns in shared memory so that other
+processes attach to them without copying. Solves write their results into a
+separate ScheduleResult.
+"""
+import json
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from job import Job, Operation
+from machine import Machine
+
+
+def read_only(values, dtype=None):
+    """NumPy column that cannot be written to; arrays are taken over without copying"""
+    column = np.asarray(values, dtype=dtype)
+    column.flags.writeable = False
+    return column
+
+
+def id_column(job_ids):
+    """Job ids as an int64 column when they are all integers, as an object column otherwise"""
+    if all(isinstance(job_id, (int, np.integer)) and not isinstance(job_id, bool) for job_id in job_ids):
+        return read_only(job_ids, np.int64)
+    column = np.empty(len(job_ids), dtype=object)
+    column[:] = job_ids
+    return read_only(column)
+
+
+def operation_times(op_data):
+    """
+    Eligible machine id -> processing time of one operation of a request:
+    {"machine": 1, "processingTime": 3}, {"machines": [1, 2], "processingTime": 3}
+    (any of several machines) or {"alternatives": [{"machine": 1, "processingTime": 3}, ...]}
+    when the time depends on the machine
+    """
+    if op_data.get("alternatives"):
+        return {int(alt["machine"]): int(alt.get("processingTime", alt.get("processing_time")))
+                for alt in op_data["alternatives"]}
+    processing_time = int(op_data.get("processingTime", op_data.get("processing_time")))
+    machines = op_data.get("machines") or [op_data.get("machine")]
+    return {int(machine_id): processing_time for machine_id in machines}
+
+
+def index_ranges(starts, ends):
+    """Concatenation of the index ranges starts[i]:ends[i]"""
+    counts = ends - starts
+    offsets = np.cumsum(counts) - counts
+    return np.repeat(starts - offsets, counts) + np.arange(counts.sum(), dtype=np.int64)
+
+
+def request_row(job_data):
+    """(job_id, priority, release_time, operation times) of one job of a request; see Instance.from_rows"""
+    return (job_data.get("jobId"), int(job_data.get("priority", 1)), int(job_data.get("releaseTime", 0)),
+            [operation_times(op_data) for op_data in job_data.get("operations") or [job_data]])
+
+
+class Instance:
+    """
+    A job shop instance as read-only NumPy columns.
+
+    Jobs are the rows of job_ids, priorities and release_times. Operations are
+    numbered job by job: job j owns operations op_start[j]:op_start[j + 1], and
+    the eligible machines (0-based) and processing times of operation o are
+    alt_machines/alt_times[alt_start[o]:alt_start[o + 1]], sorted by machine.
+    """
+    COLUMNS = ("job_ids", "priorities", "release_times", "op_start", "alt_start", "alt_machines", "alt_times")
+
+    def __init__(self, num_machines, job_ids, priorities, release_times, op_start, alt_start, alt_machines,
+                 alt_times, block=None):
+        self.num_machines = int(num_machines)
+        self.job_ids = job_ids if isinstance(job_ids, np.ndarray) else id_column(job_ids)
+        self.job_ids.flags.writeable = False
+        self.priorities = read_only(priorities)
+        self.release_times = read_only(release_times)
+        self.op_start = read_only(op_start, np.int64)
+        self.alt_start = read_only(alt_start, np.int64)
+        self.alt_machines = read_only(alt_machines, np.int64)
+        self.alt_times = read_only(alt_times)
+        self.block = block  # Shared memory the columns live in, kept open while the instance is
+        if np.any(np.diff(self.op_start) < 1) or np.any(np.diff(self.alt_start) < 1):
+            raise ValueError("Every job needs an operation and every operation an eligible machine")
+        self.op_jobs = read_only(np.repeat(np.arange(self.num_jobs), np.diff(self.op_start)))
+        invalid = np.flatnonzero((self.alt_machines < 0) | (self.alt_machines >= self.num_machines))
+        if len(invalid):
+            alt = int(invalid[0])
+            job_idx = self.op_jobs[np.searchsorted(self.alt_start, alt, side="right") - 1]
+            raise ValueError(f"Job {self.job_ids[job_idx]} uses machine {self.alt_machines[alt] + 1}, "
+                             f"expected 1 to {self.num_machines}")
+
+    @classmethod
+    def from_rows(cls, num_machines, rows):
+        """
+        Build from (job_id, priority, release_time, [{machine_id: processing_time}, ...])
+        rows; num_machines None means the highest machine id used
+        """
+        job_ids, priorities, release_times = [], [], []
+        op_start, alt_start, alt_machines, alt_times = [0], [0], [], []
+        for job_id, priority, release_time, operations in rows:
+            job_ids.append(job_id)
+            priorities.append(priority)
+            release_times.append(release_time)
+            for times in operations:
+                for machine_id, processing_time in sorted(times.items()):
+                    alt_machines.append(machine_id - 1)  # Convert 1-based to 0-based
+                    alt_times.append(processing_time)
+                alt_start.append(len(alt_machines))
+            op_start.append(len(alt_start) - 1)
+        if num_machines is None:
+            num_machines = max(alt_machines, default=-1) + 1
+        return cls(num_machines, job_ids, priorities, release_times, op_start, alt_start, alt_machines, alt_times)
+
+    @classmethod
+    def from_jobs(cls, jobs, num_machines):
+        """Build from Job objects; plain single-machine jobs may not carry an operations list"""
+        return cls.from_rows(num_machines, (
+            (job.job_id, getattr(job, "priority", 1), getattr(job, "release_time", 0),
+             [operation.processing_times for operation in getattr(job, "operations", None) or ()]
+             or [{job.machine_id: job.processing_time}])
+            for job in jobs))
+
+    @classmethod
+    def from_request(cls, data):
+        """Build from a /schedule request body; a job is one operation or an ordered "operations" list"""
+        return cls.from_rows(int(data.get("numMachines", 2)), map(request_row, data.get("jobs", [])))
+
+    @classmethod
+    def from_file(cls, path):
+        """Build from a JSON file holding a request body"""
+        with open(path) as handle:
+            return cls.from_request(json.load(handle))
+
+    def __len__(self):
+        return self.num_jobs
+
+    @property
+    def num_jobs(self):
+        return len(self.job_ids)
+
+    @property
+    def num_ops(self):
+        return len(self.alt_start) - 1
+
+    @property
+    def machines(self):
+        return [Machine(i + 1) for i in range(self.num_machines)]
+
+    def operation_times(self, op_idx):
+        """Eligible machine id (1-based) -> processing time of an operation"""
+        start, end = self.alt_start[op_idx], self.alt_start[op_idx + 1]
+        return dict(zip((self.alt_machines[start:end] + 1).tolist(), self.alt_times[start:end].tolist()))
+
+    def job_signature(self, job_idx):
+        """The fields of a job that determine the schedule; ids are irrelevant"""
+        operations = range(self.op_start[job_idx], self.op_start[job_idx + 1])
+        return (self.priorities[job_idx].item(), self.release_times[job_idx].item(),
+                [sorted(self.operation_times(op_idx).items()) for op_idx in operations])
+
+    def interchangeable_jobs(self):
+        """
+        Groups (ascending job indices, two or more each) of jobs with the same
+        release time and the same operations, machines and times; swapping two
+        of them never changes a makespan. Priorities are ignored.
+        """
+        op_start, alt_start = self.op_start.tolist(), self.alt_start.tolist()
+        alt_machines, alt_times = self.alt_machines.tolist(), self.alt_times.tolist()
+        groups = {}
+        for job_idx, release_time in enumerate(self.release_times.tolist()):
+            key = (release_time,) + tuple(
+                (tuple(alt_machines[alt_start[op_idx]:alt_start[op_idx + 1]]),
+                 tuple(alt_times[alt_start[op_idx]:alt_start[op_idx + 1]]))
+                for op_idx in range(op_start[job_idx], op_start[job_idx + 1]))
+            groups.setdefault(key, []).append(job_idx)
+        return [group for group in groups.values() if len(group) > 1]
+
+    def components(self):
+        """
+        Job indices of each independent part of the instance, in order of their
+        first job: jobs that share no eligible machine, not even through other
+        jobs, never wait for each other and can be scheduled separately.
+        """
+        # Union-find over machines, linking each job's first machine to all others it may use
+        parent = list(range(self.num_machines))
+
+        def find(machine_idx):
+            while parent[machine_idx] != machine_idx:
+                parent[machine_idx] = parent[parent[machine_idx]]
+                machine_idx = parent[machine_idx]
+            return machine_idx
+
+        alt_jobs = self.op_jobs[np.repeat(np.arange(self.num_ops), np.diff(self.alt_start))].tolist()
+        first_machines = self.alt_machines[self.alt_start[self.op_start[:-1]]].tolist()
+        for job_idx, machine_idx in zip(alt_jobs, self.alt_machines.tolist()):
+            parent[find(machine_idx)] = find(first_machines[job_idx])
+        components = {}
+        for job_idx, machine_idx in enumerate(first_machines):
+            components.setdefault(find(machine_idx), []).append(job_idx)
+        return [np.array(jobs, dtype=np.int64) for jobs in components.values()]
+
+    def subset(self, job_indices):
+        """
+        The jobs job_indices as an instance of their own, on only the machines
+        they use. Returns (instance, op_indices, machine_indices): the operation
+        and machine index here of each operation and machine of the new instance.
+        """
+        jobs = np.asarray(job_indices, dtype=np.int64)
+        op_indices = index_ranges(self.op_start[jobs], self.op_start[jobs + 1])
+        alts = index_ranges(self.alt_start[op_indices], self.alt_start[op_indices + 1])
+        # Renumbering keeps the machine order, so alternatives stay sorted by machine
+        machine_indices, alt_machines = np.unique(self.alt_machines[alts], return_inverse=True)
+        op_start = np.append(0, np.cumsum(np.diff(self.op_start)[jobs]))
+        alt_start = np.append(0, np.cumsum(np.diff(self.alt_start)[op_indices]))
+        instance = Instance(len(machine_indices), self.job_ids[jobs], self.priorities[jobs], self.release_times[jobs],
+                            op_start, alt_start, alt_machines, self.alt_times[alts])
+        return instance, op_indices, machine_indices
+
+    def to_jobs(self):
+        """Job objects for code that still works on them"""
+        return [Job(job_id, priority=self.priorities[job_idx].item(),
+                    release_time=self.release_times[job_idx].item(),
+                    operations=[Operation(self.operation_times(op_idx))
+                                for op_idx in range(self.op_start[job_idx], self.op_start[job_idx + 1])])
+                for job_idx, job_id in enumerate(self.job_ids.tolist())]
+
+    def share(self):
+        """
+        Copy the columns into a new shared memory block. Returns (block, handle):
+        Instance.attach(handle) maps the columns in any process without copying,
+        and the caller closes and unlinks the block once those are done.
+        """
+        layout = []
+        size = 0
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            if column.dtype != object:
+                layout.append((name, column.dtype.str, size, len(column)))
+                size += -(-column.nbytes // 8) * 8  # Keep every column 8-byte aligned
+        block = shared_memory.SharedMemory(create=True, size=max(size, 8))
+        for name, dtype, offset, length in layout:
+            np.ndarray(length, dtype, block.buf, offset)[:] = getattr(self, name)
+        # Columns of Python objects (non-integer job ids) travel with the handle
+        objects = {name: getattr(self, name).tolist() for name in self.COLUMNS if getattr(self, name).dtype == object}
+        return block, {"name": block.name, "num_machines": self.num_machines, "layout": layout, "objects": objects}
+
+    @classmethod
+    def attach(cls, handle):
+        """Instance whose columns are views of the shared memory block behind a share() handle"""
+        block = shared_memory.SharedMemory(name=handle["name"])
+        columns = {name: id_column(values) for name, values in handle["objects"].items()}
+        for name, dtype, offset, length in handle["layout"]:
+            columns[name] = np.ndarray(length, dtype, block.buf, offset)
+        return cls(handle["num_machines"], block=block, **columns)
+
+
+def as_instance(jobs, num_machines):
+    """jobs as an Instance, converting a list of Job objects"""
+    if isinstance(jobs, Instance):
+        if jobs.num_machines != num_machines:
+            raise ValueError(f"Instance has {jobs.num_machines} machines, got {num_machines}")
+        return jobs
+    return Instance.from_jobs(jobs, num_machines)
+
+
+class ScheduleResult:
+    """
+    The schedule of one solve, kept apart from its (shared, read-only)
+    Instance: start, end and machine (0-based) per operation, in op order.
+    """
+    def __init__(self, instance, assignments):
+        self.instance = instance
+        self.assignments = list(assignments)  # (op_idx, start_time, machine_idx) in scheduling order
+        dtype = np.result_type(instance.alt_times, instance.release_times)
+        self.starts = np.zeros(instance.num_ops, dtype=dtype)
+        self.ends = np.zeros(instance.num_ops, dtype=dtype)
+        self.machine_indices = np.full(instance.num_ops, -1, dtype=np.int64)
+        if self.assignments:
+            columns = np.array(self.assignments)
+            ops, starts, machine_indices = columns[:, 0].astype(np.int64), columns[:, 1], columns[:, 2].astype(np.int64)
+            # Alternatives are sorted by (operation, machine), so one search finds each assigned one
+            alt_ops = np.repeat(np.arange(instance.num_ops), np.diff(instance.alt_start))
+            alt_keys = alt_ops * instance.num_machines + instance.alt_machines
+            keys = ops * instance.num_machines + machine_indices
+            alts = np.minimum(np.searchsorted(alt_keys, keys), len(alt_keys) - 1)
+            invalid = np.flatnonzero(alt_keys[alts] != keys)
+            if len(invalid):
+                raise ValueError(f"Machine {machine_indices[invalid[0]] + 1} is not eligible for "
+                                 f"operation {ops[invalid[0]]}")
+            self.starts[ops] = starts
+            self.ends[ops] = starts + instance.alt_times[alts]
+            self.machine_indices[ops] = machine_indices
+
+    @property
+    def makespan(self):
+        return self.ends.max().item() if self.instance.num_ops else 0
+
+    def job_end_times(self):
+        """End of each job's last operation"""
+        return self.ends[self.instance.op_start[1:] - 1]
+
+    def entries(self):
+        """(job_id, start_time, end_time, machine_id) per operation, sorted by start time"""
+        job_ids = self.instance.job_ids.tolist()
+        op_jobs = self.instance.op_jobs.tolist()
+        starts, ends, machine_indices = self.starts.tolist(), self.ends.tolist(), self.machine_indices.tolist()
+        schedule = [(job_ids[op_jobs[op_idx]], starts[op_idx], ends[op_idx], machine_indices[op_idx] + 1)
+                    for op_idx, _, _ in self.assignments]
+        return sorted(schedule, key=lambda x: x[1])  # Sort by start time
+
+    def write_back(self, jobs):
+        """Copy the times onto Job and Operation objects of the same instance"""
+        op_start = self.instance.op_start.tolist()
+        starts, ends, machine_indices = self.starts.tolist(), self.ends.tolist(), self.machine_indices.tolist()
+        for job_idx, job in enumerate(jobs):
+            first_op, last_op = op_start[job_idx], op_start[job_idx + 1]
+            for operation, op_idx in zip(getattr(job, "operations", None) or (), range(first_op, last_op)):
+                operation.machine_id = machine_indices[op_idx] + 1
+                operation.start_time = starts[op_idx]
+                operation.end_time = ends[op_idx]
+            job.start_time = starts[first_op]
+            job.end_time = ends[last_op - 1]
@@ -0,0 +1,187 @@
+"""
+File import and export of instances and schedules: CSV, Parquet and NDJSON.
+
+Tabular files (CSV, Parquet) hold one row per eligible machine of an
+operation, with columns jobId, operation (position in the job's route,
+default 0), machine and processingTime, and optionally priority and
+releaseTime. They are read column by column with pandas straight into the
+arrays of an Instance. NDJSON files hold one /schedule job object per line and
+are parsed a line at a time. Parquet needs pyarrow (or fastparquet).
+"""
+import json
+
+import numpy as np
+import pandas as pd
+
+from instance import Instance, id_column, request_row
+
+FORMATS = {".csv": "csv", ".parquet": "parquet", ".pq": "parquet", ".ndjson": "ndjson", ".jsonl": "ndjson",
+           ".json": "json"}
+
+INSTANCE_COLUMNS = ["jobId", "operation", "machine", "processingTime", "priority", "releaseTime"]
+SCHEDULE_COLUMNS = ["jobId", "operation", "machine", "start", "end"]
+
+
+def file_format(path, fmt=None):
+    """Format named by fmt or by the file extension"""
+    if fmt is None:
+        suffix = "." + str(path).rsplit(".", 1)[-1].lower() if "." in str(path) else ""
+        fmt = FORMATS.get(suffix)
+    if fmt not in FORMATS.values():
+        raise ValueError(f"Unknown file format for {path}, expected one of {sorted(set(FORMATS.values()))}")
+    return fmt
+
+
+def integer_column(frame, name, rows=None):
+    """
+    frame[name] (at the positions rows, all by default) as int64; raises
+    ValueError naming the first row that is empty or not a whole number
+    """
+    values = frame[name].to_numpy()
+    positions = np.arange(len(frame)) if rows is None else rows
+    values = values[positions]
+    if values.dtype.kind in "iu":
+        return values.astype(np.int64)
+    numbers = pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(np.float64)
+    bad = np.flatnonzero(~np.isfinite(numbers) | (numbers != np.floor(numbers)))
+    if len(bad):
+        value = values[bad[0]]
+        raise ValueError(f"{name} in row {positions[bad[0]]} must be a whole number, got "
+                         f"{'nothing' if pd.isna(value) else repr(value)}")
+    return numbers.astype(np.int64)
+
+
+def instance_from_frame(frame, num_machines=None):
+    """
+    Build an Instance from a table with one row per eligible machine. Rows may
+    come in any order; jobs keep the order of their first row. A job's priority
+    and release time come from its first operation's row on the lowest machine.
+    """
+    for column in ("jobId", "machine", "processingTime"):
+        if column not in frame:
+            raise ValueError(f"Instance table has no {column} column")
+    job_codes, job_ids = pd.factorize(frame["jobId"], sort=False)
+    operations = integer_column(frame, "operation") if "operation" in frame else np.zeros(len(frame), np.int64)
+    machines = integer_column(frame, "machine")
+    times = integer_column(frame, "processingTime")
+    order = np.lexsort((machines, operations, job_codes))
+    job_codes, operations, machines, times = job_codes[order], operations[order], machines[order], times[order]
+
+    # A new operation starts where (job, operation) changes, a new job where the job does
+    new_op = np.ones(len(order), dtype=bool)
+    new_op[1:] = (job_codes[1:] != job_codes[:-1]) | (operations[1:] != operations[:-1])
+    repeated = np.flatnonzero(~new_op[1:] & (machines[1:] == machines[:-1]))
+    if len(repeated):
+        row = order[repeated[0] + 1]
+        raise ValueError(f"Job {job_ids[job_codes[repeated[0] + 1]]} lists machine {machines[repeated[0] + 1]} "
+                         f"twice for one operation (row {row})")
+    alt_start = np.append(np.flatnonzero(new_op), len(order))
+    op_jobs = job_codes[new_op]
+    new_job = np.ones(len(op_jobs), dtype=bool)
+    new_job[1:] = op_jobs[1:] != op_jobs[:-1]
+    op_start = np.append(np.flatnonzero(new_job), len(op_jobs))
+    first_rows = order[alt_start[op_start[:-1]]]
+
+    def job_column(name, default):
+        if name not in frame:
+            return np.full(len(job_ids), default, dtype=np.int64)
+        return integer_column(frame, name, first_rows)
+
+    ids = np.asarray(job_ids)
+    ids = ids.astype(np.int64) if ids.dtype.kind in "iu" else id_column(ids.tolist())
+    if num_machines is None:
+        num_machines = int(machines.max()) if len(machines) else 0
+    return Instance(num_machines, ids, job_column("priority", 1), job_column("releaseTime", 0), op_start,
+                    alt_start, machines - 1, times)
+
+
+def read_ndjson_jobs(handle):
+    """Instance rows from a file of /schedule job objects, one per line"""
+    for line in handle:
+        if line.strip():
+            yield request_row(json.loads(line))
+
+
+def read_instance(path, num_machines=None, fmt=None):
+    """Read an instance file; num_machines None means the highest machine id in the file"""
+    fmt = file_format(path, fmt)
+    if fmt == "csv":
+        return instance_from_frame(pd.read_csv(path), num_machines)
+    if fmt == "parquet":
+        return instance_from_frame(pd.read_parquet(path), num_machines)
+    if fmt == "ndjson":
+        with open(path) as handle:
+            return Instance.from_rows(num_machines, read_ndjson_jobs(handle))
+    with open(path) as handle:  # A /schedule request body
+        data = json.load(handle)
+    if num_machines is not None:
+        data["numMachines"] = num_machines
+    return Instance.from_request(data)
+
+
+def instance_frame(instance):
+    """One row per eligible machine of each operation, as read by instance_from_frame()"""
+    alt_ops = np.repeat(np.arange(instance.num_ops), np.diff(instance.alt_start))
+    alt_jobs = instance.op_jobs[alt_ops]
+    return pd.DataFrame({
+        "jobId": instance.job_ids[alt_jobs],
+        "operation": alt_ops - instance.op_start[alt_jobs],
+        "machine": instance.alt_machines + 1,
+        "processingTime": instance.alt_times,
+        "priority": instance.priorities[alt_jobs],
+        "releaseTime": instance.release_times[alt_jobs],
+    }, columns=INSTANCE_COLUMNS)
+
+
+def schedule_frame(result):
+    """One row per operation of a ScheduleResult, in operation order"""
+    instance = result.instance
+    return pd.DataFrame({
+        "jobId": instance.job_ids[instance.op_jobs],
+        "operation": np.arange(instance.num_ops) - instance.op_start[instance.op_jobs],
+        "machine": result.machine_indices + 1,
+        "start": result.starts,
+        "end": result.ends,
+    }, columns=SCHEDULE_COLUMNS)
+
+
+def write_frame(frame, path, fmt):
+    if fmt == "csv":
+        frame.to_csv(path, index=False)
+    elif fmt == "parquet":
+        frame.to_parquet(path, index=False)
+    else:
+        raise ValueError(f"Cannot write {fmt} tables")
+
+
+def write_instance(instance, path, fmt=None):
+    """Write an instance as a table (CSV, Parquet) or as one job object per line (NDJSON)"""
+    fmt = file_format(path, fmt)
+    if fmt not in ("ndjson", "json"):
+        return write_frame(instance_frame(instance), path, fmt)
+    op_start, alt_start = instance.op_start.tolist(), instance.alt_start.tolist()
+    machines, times = (instance.alt_machines + 1).tolist(), instance.alt_times.tolist()
+    priorities, release_times = instance.priorities.tolist(), instance.release_times.tolist()
+    jobs = ({"jobId": job_id, "priority": priorities[job_idx], "releaseTime": release_times[job_idx],
+             "operations": [{"alternatives": [{"machine": machines[alt], "processingTime": times[alt]}
+                                              for alt in range(alt_start[op_idx], alt_start[op_idx + 1])]}
+                            for op_idx in range(op_start[job_idx], op_start[job_idx + 1])]}
+            for job_idx, job_id in enumerate(instance.job_ids.tolist()))
+    with open(path, "w") as handle:
+        if fmt == "json":
+            json.dump({"jobs": list(jobs), "numMachines": instance.num_machines}, handle)
+        else:
+            for job in jobs:
+                handle.write(json.dumps(job) + "\n")
+
+
+def write_schedule(result, path, fmt=None):
+    """Write a ScheduleResult with one row (or NDJSON line) per operation"""
+    fmt = file_format(path, fmt)
+    frame = schedule_frame(result)
+    if fmt == "ndjson":
+        frame.to_json(path, orient="records", lines=True)
+    elif fmt == "json":
+        frame.to_json(path, orient="records")
+    else:
+        write_frame(frame, path, fmt)
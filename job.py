@@ -1,8 +1,35 @@
+class Operation:
+    """One step of a job; it runs once, on any one of its eligible machines"""
+    def __init__(self, processing_times):
+        self.processing_times = dict(processing_times)  # Eligible machine id -> processing time there
+        if not self.processing_times:
+            raise ValueError("An operation needs at least one eligible machine")
+        self.machine_id = None  # Set once the operation is scheduled
+        self.start_time = None
+        self.end_time = None
+
+    @property
+    def min_time(self):
+        return min(self.processing_times.values())
+
+
 class Job:
-    def __init__(self, job_id, processing_time, priority, machine_id):
+    """
+    A job is an ordered list of operations, each of which must finish before the
+    next one starts. A plain Job(job_id, processing_time, priority, machine_id)
+    has a single operation on a single machine.
+    """
+    def __init__(self, job_id, processing_time=None, priority=1, machine_id=None, release_time=0,
+                 operations=None):
+        if operations is None:
+            operations = [Operation({machine_id: processing_time})]
+        self.operations = list(operations)
         self.job_id = job_id
-        self.processing_time = processing_time
+        # For multi-operation jobs: the total minimum work and the first operation's machine
+        self.processing_time = (processing_time if processing_time is not None
+                                else sum(op.min_time for op in self.operations))
         self.priority = priority
-        self.machine_id = machine_id
+        self.machine_id = machine_id if machine_id is not None else min(self.operations[0].processing_times)
+        self.release_time = release_time  # Earliest time the job may start
         self.start_time = None
-        self.end_time = None
\ No newline at end of file
+        self.end_time = None
@@ -0,0 +1,697 @@
+"""
+Local search and large neighbourhood search (LNS) that improve a complete
+schedule, for instances too large for the tree searches to finish.
+"""
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from scheduler import Scheduler, ScheduleNode, DispatchScheduler
+from bounds import LowerBounds
+
+
+class MachineState:
+    """
+    Schedule of single-operation jobs as one operation list per machine.
+
+    Without precedence, each machine runs its operations in release order (which
+    minimises its completion time for a fixed assignment), so a schedule is
+    determined by the machine chosen for every flexible operation. Moves only
+    touch two machines and are evaluated from their completion times.
+    """
+    def __init__(self, problem, assignments):
+        self.problem = problem
+        self.op_times = [dict(problem.alternatives(o)) for o in range(problem.num_ops)]
+        self.has_releases = any(problem.release_times)
+        self.machine_of = [0] * problem.num_ops
+        self.sequences = [[] for _ in range(problem.num_machines)]
+        for op_idx, _, machine_idx in assignments:
+            self.machine_of[op_idx] = machine_idx
+            self.sequences[machine_idx].append(op_idx)
+        release = problem.release_times
+        for sequence in self.sequences:
+            sequence.sort(key=lambda o: (release[o], o))
+        self.completion = [self.finish(m, sequence) for m, sequence in enumerate(self.sequences)]
+        self.flexible_count = [sum(1 for o in sequence if problem.machine_indices[o] < 0)
+                               for sequence in self.sequences]
+        self.makespan = max(self.completion, default=0)
+
+    def finish(self, machine_idx, sequence):
+        """Completion time of a machine running sequence in order"""
+        release = self.problem.release_times
+        current_time = 0
+        for op_idx in sequence:
+            if release[op_idx] > current_time:
+                current_time = release[op_idx]
+            current_time += self.op_times[op_idx][machine_idx]
+        return current_time
+
+    def objective(self, completion):
+        """Makespan, then the spread of the machine completions to break ties"""
+        return (max(completion, default=0), sum(c * c for c in completion))
+
+    def exchange(self, moves):
+        """
+        Completions after moving each (op_idx, machine_idx) of moves; returns
+        {machine_idx: (new sequence or None, completion)}. Without release
+        times a machine's completion is its load, so this is O(1) per move.
+        """
+        if not self.has_releases:
+            changed = {}
+            for op_idx, target in moves:
+                source = self.machine_of[op_idx]
+                for machine_idx, delta in ((source, -self.op_times[op_idx][source]),
+                                           (target, self.op_times[op_idx][target])):
+                    completion = changed[machine_idx][1] if machine_idx in changed else self.completion[machine_idx]
+                    changed[machine_idx] = (None, completion + delta)
+            return changed
+
+        sequences = {}
+        for op_idx, target in moves:
+            source = self.machine_of[op_idx]
+            for machine_idx in (source, target):
+                if machine_idx not in sequences:
+                    sequences[machine_idx] = list(self.sequences[machine_idx])
+            sequences[source].remove(op_idx)
+        for op_idx, target in moves:
+            sequences[target].append(op_idx)
+        release = self.problem.release_times
+        changed = {}
+        for machine_idx, sequence in sequences.items():
+            sequence.sort(key=lambda o: (release[o], o))
+            changed[machine_idx] = (sequence, self.finish(machine_idx, sequence))
+        return changed
+
+    def apply(self, moves, changed):
+        """Commit moves evaluated by exchange()"""
+        for op_idx, target in moves:
+            source = self.machine_of[op_idx]
+            if changed[target][0] is None:
+                self.sequences[source].remove(op_idx)
+                self.sequences[target].append(op_idx)
+            if self.problem.machine_indices[op_idx] < 0:
+                self.flexible_count[source] -= 1
+                self.flexible_count[target] += 1
+            self.machine_of[op_idx] = target
+        for machine_idx, (sequence, completion) in changed.items():
+            if sequence is not None:
+                self.sequences[machine_idx] = sequence
+            self.completion[machine_idx] = completion
+        self.makespan = max(self.completion, default=0)
+
+    def critical_ops(self):
+        """Operations of the machines that finish last"""
+        return [op_idx for machine_idx, sequence in enumerate(self.sequences)
+                if self.completion[machine_idx] == self.makespan for op_idx in sequence]
+
+    def score(self):
+        return self.objective(self.completion)
+
+    def snapshot(self):
+        """Cheap copy of the schedule; new_state(snapshot) rebuilds it"""
+        return [(op_idx, 0, machine_idx) for op_idx, machine_idx in enumerate(self.machine_of)]
+
+    def assignments(self):
+        """(op_idx, start_time, machine_idx) tuples of the schedule"""
+        release = self.problem.release_times
+        result = []
+        for machine_idx, sequence in enumerate(self.sequences):
+            current_time = 0
+            for op_idx in sequence:
+                current_time = max(current_time, release[op_idx])
+                result.append((op_idx, current_time, machine_idx))
+                current_time += self.op_times[op_idx][machine_idx]
+        return result
+
+
+class ShopState:
+    """
+    Schedule of multi-operation jobs as one operation order per machine.
+
+    Start times are semi-active: evaluate() starts every operation as soon as
+    its job and machine predecessors are done, in O(operations), and also
+    computes tails (the longest path from an operation's end to the makespan)
+    for estimating moves on the critical path.
+    """
+    def __init__(self, problem, assignments):
+        self.problem = problem
+        num_ops = problem.num_ops
+        self.op_times = [dict(problem.alternatives(o)) for o in range(num_ops)]
+        self.machine_of = [0] * num_ops
+        self.duration = [0] * num_ops
+        by_machine = [[] for _ in range(problem.num_machines)]
+        for op_idx, start_time, machine_idx in assignments:
+            self.machine_of[op_idx] = machine_idx
+            self.duration[op_idx] = self.op_times[op_idx][machine_idx]
+            by_machine[machine_idx].append((start_time, op_idx))
+        self.sequences = [[op_idx for _, op_idx in sorted(entries)] for entries in by_machine]
+        self.job_pred = [-1 if o == problem.job_first_op[problem.op_job[o]] else o - 1 for o in range(num_ops)]
+        self.job_succ = [-1 if problem.op_last[o] else o + 1 for o in range(num_ops)]
+        self.starts = [0] * num_ops
+        self.tails = [0] * num_ops
+        self.machine_pred = [-1] * num_ops
+        self.machine_succ = [-1] * num_ops
+        self.makespan = self.evaluate()
+        if self.makespan is None:
+            raise ValueError("The schedule's machine orders contradict the job routes")
+
+    def evaluate(self):
+        """Recompute start times and tails; returns the makespan, or None if the orders contain a cycle"""
+        num_ops = self.problem.num_ops
+        release = self.problem.release_times
+        machine_pred, machine_succ = self.machine_pred, self.machine_succ
+        for sequence in self.sequences:
+            previous = -1
+            for op_idx in sequence:
+                machine_pred[op_idx] = previous
+                if previous >= 0:
+                    machine_succ[previous] = op_idx
+                previous = op_idx
+            if previous >= 0:
+                machine_succ[previous] = -1
+
+        job_pred, job_succ, duration, starts = self.job_pred, self.job_succ, self.duration, self.starts
+        pending = [(job_pred[o] >= 0) + (machine_pred[o] >= 0) for o in range(num_ops)]
+        stack = [o for o in range(num_ops) if not pending[o]]
+        order = []
+        while stack:
+            op_idx = stack.pop()
+            start_time = release[op_idx]
+            for pred in (job_pred[op_idx], machine_pred[op_idx]):
+                if pred >= 0 and starts[pred] + duration[pred] > start_time:
+                    start_time = starts[pred] + duration[pred]
+            starts[op_idx] = start_time
+            order.append(op_idx)
+            for succ in (job_succ[op_idx], machine_succ[op_idx]):
+                if succ >= 0:
+                    pending[succ] -= 1
+                    if not pending[succ]:
+                        stack.append(succ)
+        if len(order) < num_ops:
+            return None
+
+        tails = self.tails
+        for op_idx in reversed(order):
+            tail = 0
+            for succ in (job_succ[op_idx], machine_succ[op_idx]):
+                if succ >= 0 and duration[succ] + tails[succ] > tail:
+                    tail = duration[succ] + tails[succ]
+            tails[op_idx] = tail
+        return max((starts[o] + duration[o] for o in range(num_ops)), default=0)
+
+    def critical_path(self):
+        """Operations of one longest path, in order"""
+        starts, duration = self.starts, self.duration
+        current = next((o for o in range(self.problem.num_ops)
+                        if starts[o] + duration[o] == self.makespan), None)
+        path = []
+        while current is not None and current >= 0:
+            path.append(current)
+            previous = -1
+            for pred in (self.job_pred[current], self.machine_pred[current]):
+                if pred >= 0 and starts[pred] + duration[pred] == starts[current]:
+                    previous = pred
+                    break
+            current = previous
+        path.reverse()
+        return path
+
+    def critical_ops(self):
+        return self.critical_path()
+
+    def score(self):
+        return (self.makespan,)
+
+    def swap_moves(self, path):
+        """
+        Adjacent swaps at the ends of the critical blocks (the N5 neighbourhood),
+        as (u, v) pairs with u currently right before v on their machine
+        """
+        blocks = []
+        for op_idx in path:
+            if blocks and self.machine_of[blocks[-1][-1]] == self.machine_of[op_idx] \
+                    and self.machine_pred[op_idx] == blocks[-1][-1]:
+                blocks[-1].append(op_idx)
+            else:
+                blocks.append([op_idx])
+        moves = set()
+        for i, block in enumerate(blocks):
+            if len(block) < 2:
+                continue
+            if i > 0:
+                moves.add((block[0], block[1]))
+            if i < len(blocks) - 1:
+                moves.add((block[-2], block[-1]))
+        return sorted(moves)
+
+    def estimate_swap(self, u, v):
+        """Taillard's O(1) estimate of the makespan after swapping u and v (u right before v)"""
+        starts, duration, tails = self.starts, self.duration, self.tails
+        release = self.problem.release_times
+
+        def end(o):
+            return starts[o] + duration[o] if o >= 0 else 0
+
+        def after(o):
+            return duration[o] + tails[o] if o >= 0 else 0
+
+        head_v = max(end(self.job_pred[v]), end(self.machine_pred[u]), release[v])
+        head_u = max(end(self.job_pred[u]), head_v + duration[v], release[u])
+        tail_u = max(after(self.job_succ[u]), after(self.machine_succ[v]))
+        tail_v = max(after(self.job_succ[v]), tail_u + duration[u])
+        return max(head_v + duration[v] + tail_v, head_u + duration[u] + tail_u)
+
+    def swap(self, u, v):
+        sequence = self.sequences[self.machine_of[u]]
+        i, j = sequence.index(u), sequence.index(v)
+        sequence[i], sequence[j] = v, u
+
+    def move(self, op_idx, machine_idx):
+        """
+        Move an operation to another machine, keeping that machine's order by
+        start time; returns what undo() needs to put it back
+        """
+        source = self.machine_of[op_idx]
+        source_position = self.sequences[source].index(op_idx)
+        del self.sequences[source][source_position]
+        sequence = self.sequences[machine_idx]
+        position = 0
+        while position < len(sequence) and self.starts[sequence[position]] <= self.starts[op_idx]:
+            position += 1
+        sequence.insert(position, op_idx)
+        self.machine_of[op_idx] = machine_idx
+        self.duration[op_idx] = self.op_times[op_idx][machine_idx]
+        return op_idx, source, source_position, machine_idx, position
+
+    def undo(self, undo):
+        op_idx, source, source_position, machine_idx, position = undo
+        del self.sequences[machine_idx][position]
+        self.sequences[source].insert(source_position, op_idx)
+        self.machine_of[op_idx] = source
+        self.duration[op_idx] = self.op_times[op_idx][source]
+
+    def assignments(self):
+        return [(o, self.starts[o], self.machine_of[o]) for o in range(self.problem.num_ops)]
+
+    def snapshot(self):
+        """Cheap copy of the schedule; positions stand in for start times"""
+        return [(op_idx, position, machine_idx) for machine_idx, sequence in enumerate(self.sequences)
+                for position, op_idx in enumerate(sequence)]
+
+
+def improve_worker(jobs, machines, assignments, seed, options):
+    """Run one local search in a worker process; returns its best schedule and trace"""
+    scheduler = LocalSearchScheduler(jobs, machines, workers=1, seed=seed, **options)
+    return scheduler.improve(assignments, time.time())
+
+
+class LocalSearchScheduler(Scheduler):
+    """
+    Metaheuristic improvement of a complete schedule.
+
+    Starts from initial_schedule, a list of (job_id, start_time, end_time,
+    machine_id) tuples as returned by any scheduler's schedule_jobs(), or from a
+    dispatch-rule schedule. Single-operation instances are improved by moving
+    and swapping flexible operations off the most loaded machine. Job shops run
+    a tabu search over swaps on the critical path, estimated in O(1) each, and
+    machine reassignments of critical operations. When the search stalls for
+    stall_iterations moves, CP-SAT re-optimises a window of lns_size operations
+    around the critical path (large neighbourhood search), and failing that the
+    search restarts from its best schedule with a random perturbation.
+
+    With workers > 1 (at most one per CPU), independent searches with different
+    seeds run in separate processes until max_seconds and the best schedule
+    wins. The improvement trace is reported in visualization_data["convergence"]
+    as [seconds, makespan] pairs.
+    """
+    def __init__(self, jobs, machines, initial_schedule=None, initial_rule="lpt", max_seconds=10.0, workers=1,
+                 seed=0, lns=True, lns_size=30, lns_seconds=1.0, stall_iterations=500, tabu_tenure=8,
+                 **options):
+        super().__init__(jobs, machines, max_seconds=max_seconds, **options)
+        self.initial_schedule = initial_schedule
+        self.initial_rule = initial_rule
+        self.workers = max(1, min(workers, os.cpu_count() or 1))  # A request must not fork without limit
+        self.seed = seed
+        self.lns = lns
+        self.lns_size = lns_size
+        self.lns_seconds = lns_seconds
+        self.stall_iterations = stall_iterations
+        self.tabu_tenure = tabu_tenure
+        self.algorithm_name = "Local Search (LNS)"
+        self.visualization_data["algorithm_name"] = self.algorithm_name
+
+    def initial_assignments(self):
+        """(op_idx, start_time, machine_idx) tuples of the starting schedule"""
+        if self.initial_schedule is None:
+            return DispatchScheduler(self.instance, self.machines, self.initial_rule).dispatch()[0]
+        problem = self.problem
+        job_ids = self.instance.job_ids.tolist()
+        index_of = {job_id: i for i, job_id in enumerate(job_ids)}
+        entries = {}
+        for job_id, start_time, _, machine_id in self.initial_schedule:
+            if job_id not in index_of:
+                raise ValueError(f"Initial schedule refers to unknown job {job_id}")
+            entries.setdefault(index_of[job_id], []).append((start_time, int(machine_id) - 1))
+        assignments = []
+        for job_idx, first_op in enumerate(problem.job_first_op):
+            last_op = problem.job_first_op[job_idx + 1] if job_idx + 1 < problem.num_jobs else problem.num_ops
+            job_entries = sorted(entries.get(job_idx, []))
+            if len(job_entries) != last_op - first_op:
+                raise ValueError(f"Initial schedule has {len(job_entries)} entries for job "
+                                 f"{job_ids[job_idx]}, expected {last_op - first_op}")
+            for op_idx, (start_time, machine_idx) in zip(range(first_op, last_op), job_entries):
+                problem.op_time(op_idx, machine_idx)  # Raises ValueError on an ineligible machine
+                assignments.append((op_idx, start_time, machine_idx))
+        return assignments
+
+    def options(self):
+        """Constructor settings passed to worker processes"""
+        return {
+            "max_seconds": self.max_seconds, "max_nodes": self.max_nodes, "target_gap": self.target_gap,
+            "lns": self.lns, "lns_size": self.lns_size, "lns_seconds": self.lns_seconds,
+            "stall_iterations": self.stall_iterations, "tabu_tenure": self.tabu_tenure, "telemetry": "off",
+        }
+
+    def instance_bound(self):
+        root = ScheduleNode(self.instance, self.machines, problem=self.problem)
+        return LowerBounds(self.problem).node_bound(root)
+
+    def new_state(self, assignments):
+        if self.problem.has_precedence:
+            return ShopState(self.problem, assignments)
+        return MachineState(self.problem, assignments)
+
+    def improve(self, assignments, start_time):
+        """Improve one schedule until a budget runs out; returns (makespan, assignments, trace, stats)"""
+        rng = random.Random(self.seed)
+        telemetry = self.telemetry
+        telemetry.reset()
+        self.best_bound = self.instance_bound()
+
+        state = self.new_state(assignments)
+        best, self.best_makespan = state.snapshot(), state.makespan
+        trace = [[0.0, state.makespan]]
+        stats = {"moves": 0, "lns_calls": 0, "lns_improvements": 0, "restarts": 0, "stop_reason": None}
+        stall = 0
+        tabu = {}
+        while self.problem.num_ops:
+            if self.best_makespan <= self.best_bound:
+                break  # Proven optimal
+            stop_reason = self.budget_exceeded(start_time, ())
+            if stop_reason:
+                stats["stop_reason"] = stop_reason
+                break
+            telemetry.nodes_expanded += 1
+            if self.problem.has_precedence:
+                improved = self.shop_step(state, rng, tabu, telemetry.nodes_expanded)
+            else:
+                improved = self.machine_step(state, rng)
+                if improved is None:
+                    break  # The critical machine has no flexible operations left to move
+
+            if state.makespan < self.best_makespan:
+                best, self.best_makespan = state.snapshot(), state.makespan
+                trace.append([time.time() - start_time, state.makespan])
+                self.report_incumbent(start_time)
+                stall = 0
+            elif not improved:
+                stall += 1
+
+            if stall >= self.stall_iterations:
+                stall = 0
+                if self.lns:
+                    stats["lns_calls"] += 1
+                    if self.problem.has_precedence:
+                        candidate = self.lns_window(state, rng)
+                    else:
+                        candidate = self.lns_assignment(state, rng)
+                    if candidate is not None and candidate.score() < state.score():
+                        state = candidate
+                        stats["lns_improvements"] += 1
+                        continue
+                # Restart from the best schedule, perturbed
+                stats["restarts"] += 1
+                state = self.perturb(self.new_state(best), rng)
+                tabu.clear()
+        stats["moves"] = telemetry.nodes_expanded
+        return self.best_makespan, self.new_state(best).assignments(), trace, stats
+
+    def machine_step(self, state, rng):
+        """
+        Move or swap a flexible operation off the critical machine; returns
+        whether the schedule improved, or None if nothing can move
+        """
+        critical = max(range(len(state.completion)), key=state.completion.__getitem__)
+        if not state.flexible_count[critical]:
+            return None
+        sequence = state.sequences[critical]
+        machine_indices = self.problem.machine_indices
+        op_idx = sequence[rng.randrange(len(sequence))]
+        while machine_indices[op_idx] >= 0:
+            op_idx = sequence[rng.randrange(len(sequence))]
+        targets = [m for m in state.op_times[op_idx] if m != critical]
+        target = targets[rng.randrange(len(targets))]
+
+        candidates = [[(op_idx, target)]]
+        # Swap with a few operations of the target machine that may run on the critical one
+        target_sequence = state.sequences[target]
+        for _ in range(min(3, len(target_sequence))):
+            other = target_sequence[rng.randrange(len(target_sequence))]
+            if critical in state.op_times[other]:
+                candidates.append([(op_idx, target), (other, critical)])
+
+        current = state.objective(state.completion)
+        best = None
+        for moves in candidates:
+            changed = state.exchange(moves)
+            completion = list(state.completion)
+            for machine_idx, (_, machine_completion) in changed.items():
+                completion[machine_idx] = machine_completion
+            value = state.objective(completion)
+            if value < current and (best is None or value < best[0]):
+                best = (value, moves, changed)
+        if best is None:
+            return False
+        state.apply(best[1], best[2])
+        return True
+
+    def shop_step(self, state, rng, tabu, iteration):
+        """One tabu search move on the critical path; returns whether the makespan improved"""
+        path = state.critical_path()
+        before = state.makespan
+        best = None  # (estimate, kind, move)
+        for u, v in state.swap_moves(path):
+            estimate = state.estimate_swap(u, v)
+            if tabu.get((u, v), 0) > iteration and estimate >= self.best_makespan:
+                continue
+            if best is None or estimate < best[0]:
+                best = (estimate, "swap", (u, v))
+
+        # Reassign a couple of flexible critical operations, evaluated exactly
+        flexible = [o for o in path if len(state.op_times[o]) > 1]
+        for op_idx in rng.sample(flexible, min(2, len(flexible))):
+            source = state.machine_of[op_idx]
+            for machine_idx in state.op_times[op_idx]:
+                if machine_idx == source or tabu.get((op_idx, machine_idx), 0) > iteration:
+                    continue
+                undo = state.move(op_idx, machine_idx)
+                value = state.evaluate()
+                state.undo(undo)
+                state.evaluate()  # Restore the start times the next candidate is placed by
+                if value is not None and (best is None or value < best[0]):
+                    best = (value, "move", (op_idx, machine_idx))
+
+        if best is None:
+            return False
+        _, kind, move = best
+        if kind == "swap":
+            u, v = move
+            state.swap(u, v)
+            tabu[(v, u)] = iteration + self.tabu_tenure + rng.randrange(3)
+        else:
+            op_idx, machine_idx = move
+            tabu[(op_idx, state.machine_of[op_idx])] = iteration + self.tabu_tenure
+            state.move(op_idx, machine_idx)
+        state.makespan = state.evaluate()
+        return state.makespan < before
+
+    def perturb(self, state, rng):
+        """Random moves that keep the schedule feasible, to leave a local optimum"""
+        if self.problem.has_precedence:
+            for _ in range(3):
+                moves = state.swap_moves(state.critical_path())
+                if not moves:
+                    break
+                state.swap(*moves[rng.randrange(len(moves))])
+                state.makespan = state.evaluate()
+            return state
+        flexible = [o for o in range(self.problem.num_ops) if self.problem.machine_indices[o] < 0]
+        for op_idx in rng.sample(flexible, min(len(flexible), max(1, len(flexible) // 50))):
+            targets = [m for m in state.op_times[op_idx] if m != state.machine_of[op_idx]]
+            moves = [(op_idx, targets[rng.randrange(len(targets))])]
+            state.apply(moves, state.exchange(moves))
+        return state
+
+    def lns_assignment(self, state, rng):
+        """
+        Reassign lns_size flexible operations, half of them from the critical
+        machine, with CP-SAT minimising the largest machine load; returns the
+        new state or None
+        """
+        problem = self.problem
+        critical = state.critical_ops()
+        flexible = [o for o in critical if problem.machine_indices[o] < 0]
+        free = set(rng.sample(flexible, min(len(flexible), self.lns_size // 2)))
+        others = [o for o in range(problem.num_ops) if problem.machine_indices[o] < 0 and o not in free]
+        free.update(rng.sample(others, min(len(others), self.lns_size - len(free))))
+        if not free:
+            return None
+
+        from ortools.sat.python import cp_model  # Only the LNS steps need OR-Tools
+        model = cp_model.CpModel()
+        loads = [[] for _ in range(problem.num_machines)]
+        fixed_load = [sum(state.op_times[o][m] for o in sequence) for m, sequence in enumerate(state.sequences)]
+        presences = {}
+        for op_idx in free:
+            fixed_load[state.machine_of[op_idx]] -= state.op_times[op_idx][state.machine_of[op_idx]]
+            presences[op_idx] = []
+            for machine_idx, processing_time in state.op_times[op_idx].items():
+                present = model.NewBoolVar(f"present_{op_idx}_{machine_idx}")
+                model.AddHint(present, machine_idx == state.machine_of[op_idx])
+                loads[machine_idx].append(processing_time * present)
+                presences[op_idx].append((machine_idx, present))
+            model.AddExactlyOne([present for _, present in presences[op_idx]])
+        largest = model.NewIntVar(0, sum(fixed_load) + sum(max(state.op_times[o].values()) for o in free), "largest")
+        for machine_idx, terms in enumerate(loads):
+            if terms:
+                model.Add(largest >= fixed_load[machine_idx] + sum(terms))
+        model.Minimize(largest)
+
+        solver = self.lns_solver(rng)
+        if solver.Solve(model) not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            return None
+        moves = [(op_idx, next(m for m, present in presences[op_idx] if solver.BooleanValue(present)))
+                 for op_idx in free]
+        moves = [(op_idx, target) for op_idx, target in moves if target != state.machine_of[op_idx]]
+        candidate = self.new_state(state.snapshot())
+        if moves:
+            candidate.apply(moves, candidate.exchange(moves))
+        return candidate
+
+    def lns_solver(self, rng):
+        from ortools.sat.python import cp_model  # Only the LNS steps need OR-Tools
+        solver = cp_model.CpSolver()
+        solver.parameters.max_time_in_seconds = self.lns_seconds
+        solver.parameters.num_search_workers = 1
+        solver.parameters.random_seed = rng.randrange(1 << 30)
+        return solver
+
+    def lns_window(self, state, rng):
+        """
+        Re-optimise the operations starting around a random critical operation
+        with CP-SAT, everything else fixed; returns the new state or None
+        """
+        problem = self.problem
+        assignments = state.assignments()
+        start_of = {op_idx: start_time for op_idx, start_time, _ in assignments}
+        machine_of = {op_idx: machine_idx for op_idx, _, machine_idx in assignments}
+        end_of = {o: start_of[o] + state.op_times[o][machine_of[o]] for o in start_of}
+
+        by_start = sorted(start_of, key=start_of.__getitem__)
+        critical = state.critical_ops()
+        center = by_start.index(critical[rng.randrange(len(critical))])
+        low = max(0, min(center - self.lns_size // 2, len(by_start) - self.lns_size))
+        free = set(by_start[low:low + self.lns_size])
+        window_start = min(start_of[o] for o in free)
+        window_end = max(end_of[o] for o in free)
+
+        from ortools.sat.python import cp_model  # Only the LNS steps need OR-Tools
+        model = cp_model.CpModel()
+        intervals = {m: [] for m in range(problem.num_machines)}
+        starts, ends, presences = {}, {}, {}
+        for op_idx in free:
+            start = model.NewIntVar(max(window_start, problem.release_times[op_idx]), window_end, f"start_{op_idx}")
+            end = model.NewIntVar(window_start, window_end, f"end_{op_idx}")
+            literals = []
+            for machine_idx, processing_time in state.op_times[op_idx].items():
+                present = model.NewBoolVar(f"present_{op_idx}_{machine_idx}")
+                intervals[machine_idx].append(
+                    model.NewOptionalFixedSizeIntervalVar(start, processing_time, present, f"interval_{op_idx}_{machine_idx}"))
+                model.Add(end == start + processing_time).OnlyEnforceIf(present)
+                model.AddHint(present, machine_idx == machine_of[op_idx])
+                literals.append((machine_idx, present))
+            model.AddExactlyOne([present for _, present in literals])
+            presences[op_idx] = literals
+            model.AddHint(start, start_of[op_idx])
+            starts[op_idx], ends[op_idx] = start, end
+
+        # Fixed operations that overlap the window block their machines
+        for op_idx in by_start:
+            if op_idx not in free and start_of[op_idx] < window_end and end_of[op_idx] > window_start:
+                intervals[machine_of[op_idx]].append(model.NewFixedSizeIntervalVar(
+                    start_of[op_idx], end_of[op_idx] - start_of[op_idx], f"fixed_{op_idx}"))
+        for machine_intervals in intervals.values():
+            if len(machine_intervals) > 1:
+                model.AddNoOverlap(machine_intervals)
+
+        # Job routes, against free or fixed neighbours
+        for op_idx in free:
+            if problem.has_precedence:
+                pred, succ = state.job_pred[op_idx], state.job_succ[op_idx]
+                if pred >= 0:
+                    model.Add(starts[op_idx] >= (ends[pred] if pred in free else end_of[pred]))
+                if succ >= 0 and succ not in free:
+                    model.Add(ends[op_idx] <= start_of[succ])
+
+        latest = model.NewIntVar(window_start, window_end, "latest")
+        for end in ends.values():
+            model.Add(latest >= end)
+        model.Minimize(len(free) * latest + sum(ends.values()))
+
+        solver = self.lns_solver(rng)
+        status = solver.Solve(model)
+        if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            return None
+
+        new_assignments = []
+        for op_idx, start_time, machine_idx in assignments:
+            if op_idx in free:
+                start_time = solver.Value(starts[op_idx])
+                machine_idx = next(m for m, present in presences[op_idx] if solver.BooleanValue(present))
+            new_assignments.append((op_idx, start_time, machine_idx))
+        try:
+            return self.new_state(new_assignments)
+        except ValueError:
+            return None
+
+    def schedule_jobs(self):
+        start_time = time.time()
+        assignments = self.initial_assignments()
+        initial_makespan = max((start + self.problem.op_time(o, m) for o, start, m in assignments), default=0)
+
+        if self.workers > 1:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                futures = [executor.submit(improve_worker, self.instance, self.machines, assignments,
+                                           self.seed + i, self.options()) for i in range(self.workers)]
+                results = [future.result() for future in futures]
+            self.best_bound = self.instance_bound()
+            makespan, best_assignments, trace, stats = min(results, key=lambda result: result[0])
+            self.telemetry.reset()
+            self.telemetry.nodes_expanded = sum(result[3]["moves"] for result in results)
+            self.visualization_data["worker_makespans"] = [result[0] for result in results]
+        else:
+            makespan, best_assignments, trace, stats = self.improve(assignments, start_time)
+
+        self.telemetry.export(self.visualization_data)
+        self.visualization_data["initial_makespan"] = initial_makespan
+        self.visualization_data["convergence"] = trace
+        self.visualization_data["lns_calls"] = stats["lns_calls"]
+        self.visualization_data["lns_improvements"] = stats["lns_improvements"]
+        self.visualization_data["restarts"] = stats["restarts"]
+        self.visualization_data["stop_reason"] = stats["stop_reason"]
+        self.visualization_data["lower_bound"] = self.best_bound
+        self.visualization_data["gap"] = (makespan - self.best_bound) / makespan if makespan else 0.0
+        self.visualization_data["solution_path"] = best_assignments
+        self.visualization_data["execution_time"] = time.time() - start_time
+        return self.format_assignments(best_assignments)
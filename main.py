@@ -1,21 +1,105 @@
-from job import Job
-from machine import Machine
-from scheduler import Scheduler
-
-# Define jobs and machines
-jobs = [
-    Job(1, 5, 2, 1),
-    Job(2, 3, 1, 2),
-    Job(3, 2, 3, 1),
-    Job(4, 6, 2, 2)
-]
-machines = [Machine(1), Machine(2)]
-
-# Run the scheduler
-scheduler = Scheduler(jobs, machines)
-schedule = scheduler.schedule_jobs()
-
-# Print schedule
-print("Job Schedule:")
-for job_id, start, end, machine in schedule:
-    print(f"Job {job_id}: Start {start}, End {end}, Machine {machine}")
\ No newline at end of file
+"""
+Solve instance files offline.
+
+    python main.py jobs.csv --output schedule.csv
+    python main.py jobs.parquet --scheduler lns --max-seconds 60 --set workers=4 --output schedule.parquet
+    python main.py jobs.ndjson --machines 20 --scheduler cpsat --output schedule.ndjson
+
+Instances are read with instance_io (CSV, Parquet, NDJSON or a /schedule JSON
+body). --scheduler takes the /schedule schedulerType values and defaults to
+dispatch, the only engine meant for instances of 100k jobs; --set passes any
+other request setting. A summary is printed as JSON; --profile-startup also
+reports on stderr how long the imports took.
+"""
+import argparse
+import json
+import sys
+import time
+
+import startup
+
+# Imported once the arguments are known, so --help and usage errors answer at once
+CLI_MODULES = ("numpy", "pandas", "instance", "instance_io", "scheduler", "service")
+
+
+def parse_setting(text):
+    """KEY=VALUE with VALUE read as JSON when it parses (numbers, booleans, lists), else as a string"""
+    key, separator, value = text.partition("=")
+    if not separator:
+        raise argparse.ArgumentTypeError(f"expected KEY=VALUE, got {text!r}")
+    try:
+        return key, json.loads(value)
+    except ValueError:
+        return key, value
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve a job shop instance file")
+    parser.add_argument("instance", help="instance file (.csv, .parquet, .ndjson or .json)")
+    parser.add_argument("--format", help="instance file format when the extension does not say")
+    parser.add_argument("--machines", type=int, help="number of machines (default: highest machine id)")
+    parser.add_argument("--scheduler", default="dispatch", help="schedulerType, e.g. dispatch, lns, cpsat, beam")
+    parser.add_argument("--max-seconds", type=float, help="search time budget")
+    parser.add_argument("--max-nodes", type=int, help="search node budget")
+    parser.add_argument("--set", type=parse_setting, action="append", default=[], metavar="KEY=VALUE",
+                        help="any other /schedule setting, e.g. dispatchRule=lpt (repeatable)")
+    parser.add_argument("--output", help="write the schedule here (.csv, .parquet, .ndjson or .json)")
+    parser.add_argument("--profile-startup", action="store_true", help="report import times on stderr")
+    args = parser.parse_args(argv)
+
+    imports_started = time.perf_counter()
+    try:
+        timings = startup.import_times(CLI_MODULES) + startup.warm_up([args.scheduler])
+    except ValueError as error:
+        parser.error(str(error))
+    if args.profile_startup:
+        startup.report(timings)
+    from instance_io import file_format, read_instance, write_schedule
+    from service import create_scheduler, instance_lower_bound
+
+    started = time.perf_counter()
+    try:
+        if args.output:
+            file_format(args.output)  # Fail on an unknown output format before solving
+        instance = read_instance(args.instance, args.machines, args.format)
+    except ValueError as error:
+        parser.error(str(error))
+    loaded = time.perf_counter()
+    settings = dict(args.set, schedulerType=args.scheduler, telemetry="summary")
+    if args.max_seconds is not None:
+        settings["maxSeconds"] = args.max_seconds
+    if args.max_nodes is not None:
+        settings["maxNodes"] = args.max_nodes
+    try:
+        scheduler = create_scheduler(settings, instance, instance.machines)
+        scheduler.schedule_jobs()
+    except ValueError as error:
+        parser.error(str(error))
+    solved = time.perf_counter()
+    if args.output:
+        write_schedule(scheduler.result, args.output)
+    written = time.perf_counter()
+
+    makespan = scheduler.result.makespan
+    lower_bound = max(instance_lower_bound(instance, instance.machines, scheduler.problem),
+                      scheduler.visualization_data.get("lower_bound") or 0)
+    print(json.dumps({
+        "instance": args.instance,
+        "algorithm": scheduler.algorithm_name,
+        "numJobs": instance.num_jobs,
+        "numOperations": instance.num_ops,
+        "numMachines": instance.num_machines,
+        "makespan": makespan,
+        "lowerBound": lower_bound,
+        "gap": (makespan - lower_bound) / makespan if makespan else 0.0,
+        "stopReason": scheduler.visualization_data.get("stop_reason"),
+        "importSeconds": started - imports_started,
+        "loadSeconds": loaded - started,
+        "solveSeconds": solved - loaded,
+        "writeSeconds": written - solved,
+    }, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
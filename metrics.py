@@ -0,0 +1,104 @@
+"""
+Request metrics in the Prometheus text format, served at /metrics.
+
+/schedule latencies are kept as histograms labelled by schedulerType and by
+instance size (a bucket of the operation count), and the time schedulers
+spend in each phase (see SearchTelemetry) as counters. observe_run(), added to
+SearchTelemetry.observers, totals the search counters of every run in the
+process, including the components of decomposed solves. Like the cache, the
+registry lives in one process's memory: under gunicorn every worker keeps its
+own, so scrape the workers separately or add the series up.
+"""
+import threading
+from bisect import bisect_left
+
+# Request latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+# Instance size labels by operation count
+SIZE_BUCKETS = ((100, "le100"), (1000, "le1k"), (10000, "le10k"), (100000, "le100k"))
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def size_bucket(num_operations):
+    for limit, label in SIZE_BUCKETS:
+        if num_operations <= limit:
+            return label
+    return "gt100k"
+
+
+def format_labels(labels):
+    return ",".join(f'{name}="{value}"' for name, value in labels)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # The last one is +Inf
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def lines(self, name, labels):
+        total = 0
+        for bound, count in zip(self.buckets + ("+Inf",), self.counts):
+            total += count
+            yield f'{name}_bucket{{{format_labels(labels + (("le", bound),))}}} {total}'
+        yield f"{name}_sum{{{format_labels(labels)}}} {self.sum}"
+        yield f"{name}_count{{{format_labels(labels)}}} {total}"
+
+
+class MetricsRegistry:
+    """Thread-safe request latency histograms and phase time counters of one process"""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = {}  # (schedulerType, size, cache) -> Histogram
+        self.phase_seconds = {}  # (schedulerType, phase) -> seconds
+        self.errors = {}  # schedulerType -> count
+        self.search_events = {}  # Search counter name -> total over all runs
+
+    def observe_request(self, scheduler_type, num_operations, seconds, cache="BYPASS", phases=None):
+        """Record one answered /schedule request and the phases of its solve"""
+        key = (scheduler_type, size_bucket(num_operations), cache)
+        with self.lock:
+            if key not in self.latencies:
+                self.latencies[key] = Histogram(LATENCY_BUCKETS)
+            self.latencies[key].observe(seconds)
+            for phase, phase_seconds in (phases or {}).items():
+                self.phase_seconds[scheduler_type, phase] = \
+                    self.phase_seconds.get((scheduler_type, phase), 0.0) + phase_seconds
+
+    def observe_run(self, visualization_data):
+        """SearchTelemetry observer: add up the nodes expanded and the counters of a finished run"""
+        events = dict(visualization_data.get("telemetry", {}).get("counters", {}),
+                      nodes_expanded=visualization_data.get("nodes_expanded", 0))
+        with self.lock:
+            for name, count in events.items():
+                self.search_events[name] = self.search_events.get(name, 0) + count
+
+    def observe_error(self, scheduler_type):
+        with self.lock:
+            self.errors[scheduler_type] = self.errors.get(scheduler_type, 0) + 1
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        lines = ["# HELP schedule_request_seconds Time to answer a /schedule request.",
+                 "# TYPE schedule_request_seconds histogram"]
+        with self.lock:
+            for (scheduler_type, size, cache), histogram in sorted(self.latencies.items()):
+                lines.extend(histogram.lines("schedule_request_seconds", (
+                    ("scheduler", scheduler_type), ("size", size), ("cache", cache))))
+            lines += ["# HELP schedule_phase_seconds_total Solve time spent in each scheduler phase.",
+                      "# TYPE schedule_phase_seconds_total counter"]
+            for (scheduler_type, phase), seconds in sorted(self.phase_seconds.items()):
+                lines.append(f"schedule_phase_seconds_total{{{format_labels((('scheduler', scheduler_type), ('phase', phase)))}}} {seconds}")
+            lines += ["# HELP schedule_request_errors_total Rejected /schedule requests.",
+                      "# TYPE schedule_request_errors_total counter"]
+            for scheduler_type, count in sorted(self.errors.items()):
+                lines.append(f'schedule_request_errors_total{{scheduler="{scheduler_type}"}} {count}')
+            lines += ["# HELP schedule_search_events_total Search events (nodes expanded, pushes, prunes, ...) of all runs.",
+                      "# TYPE schedule_search_events_total counter"]
+            for name, count in sorted(self.search_events.items()):
+                lines.append(f'schedule_search_events_total{{event="{name}"}} {count}')
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,214 @@
+"""
+Portfolio solving: several schedulers race on the same instance, one process
+each, sharing the best makespan found so far.
+"""
+import math
+import multiprocessing
+import os
+import queue
+import time
+
+from scheduler import ScheduleNode, Scheduler, GBFSScheduler, AStarScheduler, DispatchScheduler
+from cpsat import OptimizedScheduler
+from bounded_search import BeamScheduler
+from local_search import LocalSearchScheduler
+from bounds import LowerBounds
+from instance import Instance
+
+# Engines raced by default: a dispatch rule answers at once, CP-SAT proves, A* prunes against both
+ENGINES = ("dispatch", "gbfs", "astar", "cpsat")
+ENGINE_NAMES = ("astar", "beam", "cpsat", "dispatch", "gbfs", "lns")
+
+
+def create_engine(engine, jobs, machines, max_seconds, cpsat_workers, **options):
+    """Build one portfolio member; options are the Scheduler base options"""
+    if engine == "dispatch":
+        return DispatchScheduler(jobs, machines, "lpt", **options)
+    elif engine == "gbfs":
+        return GBFSScheduler(jobs, machines, max_seconds=max_seconds, **options)
+    elif engine == "astar":
+        return AStarScheduler(jobs, machines, max_seconds=max_seconds, **options)
+    elif engine == "beam":
+        return BeamScheduler(jobs, machines, max_seconds=max_seconds, **options)
+    elif engine == "lns":
+        return LocalSearchScheduler(jobs, machines, max_seconds=max_seconds, **options)
+    elif engine == "cpsat":
+        return OptimizedScheduler(jobs, machines, num_workers=cpsat_workers, max_seconds=max_seconds, **options)
+    raise ValueError(f"Unknown portfolio engine '{engine}', expected some of {list(ENGINE_NAMES)}")
+
+
+def run_engine(engine, handle, max_seconds, cpsat_workers, best_makespan, stop, results, options=None):
+    """
+    Run one engine in its own process and put its result on the results queue;
+    handle is the Instance.share() handle of the instance, attached without
+    copying, and options the portfolio's budgets for every engine
+    """
+    def publish(makespan):
+        if makespan is not None:
+            with best_makespan.get_lock():
+                if makespan < best_makespan.value:
+                    best_makespan.value = makespan
+
+    def report(progress):
+        publish(progress.get("best_makespan"))
+        return not stop.value  # False makes the search return its best schedule so far
+
+    def external_bound():
+        value = best_makespan.value
+        if math.isinf(value):
+            return None
+        return int(value) if value.is_integer() else value
+
+    started = time.time()
+    try:
+        instance = Instance.attach(handle)
+        scheduler = create_engine(engine, instance, instance.machines, max_seconds, cpsat_workers, telemetry="off",
+                                  progress_callback=report, external_bound=external_bound, progress_interval=100,
+                                  **(options or {}))
+        scheduler.schedule_jobs()
+        makespan = scheduler.result.makespan
+        publish(makespan)
+        data = scheduler.visualization_data
+        results.put({
+            "engine": engine,
+            "makespan": makespan,
+            "lower_bound": data.get("lower_bound"),
+            "stop_reason": data.get("stop_reason"),
+            "solution_path": data["solution_path"],
+            "seconds": time.time() - started,
+        })
+    except Exception as error:  # Reported so the rest of the portfolio carries on
+        results.put({"engine": engine, "error": f"{type(error).__name__}: {error}",
+                     "seconds": time.time() - started})
+
+
+class PortfolioScheduler(Scheduler):
+    """
+    Races several engines on the instance, each in its own process, and returns
+    the best schedule.
+
+    The engines share the best makespan found so far: every new incumbent is
+    published to a shared value, and A* prunes against it. The race ends when
+    max_seconds passes or as soon as the best schedule is proven optimal (an
+    engine's lower bound, or the instance's, meets the best makespan); the
+    remaining engines are then told to stop and return what they have, as
+    they are once the best schedule is proven within target_gap. max_nodes,
+    max_frontier, target_gap and symmetry_breaking apply to every engine.
+    CP-SAT gets the cores the other engines leave free unless cpsat_workers is set.
+    """
+    # Time allowed beyond max_seconds for engines to start up and hand back their schedules,
+    # and after a proof of optimality for the others to stop
+    grace_seconds = 5.0
+    stop_seconds = 2.0
+
+    def __init__(self, jobs, machines, engines=ENGINES, max_seconds=10.0, cpsat_workers=None, **options):
+        super().__init__(jobs, machines, max_seconds=max_seconds, **options)
+        self.engines = list(dict.fromkeys(engines))
+        if not self.engines:
+            raise ValueError("A portfolio needs at least one engine")
+        for engine in self.engines:
+            if engine not in ENGINE_NAMES:
+                raise ValueError(f"Unknown portfolio engine '{engine}', expected some of {list(ENGINE_NAMES)}")
+        self.cpsat_workers = cpsat_workers or max(1, (os.cpu_count() or 1) - (len(self.engines) - 1))
+        self.algorithm_name = f"Portfolio ({', '.join(self.engines)})"
+        self.visualization_data["algorithm_name"] = self.algorithm_name
+
+    def engine_options(self):
+        """Budgets and search settings every engine gets (max_seconds is passed on its own)"""
+        return {"max_nodes": self.max_nodes, "max_frontier": self.max_frontier, "target_gap": self.target_gap,
+                "symmetry_breaking": self.symmetry_breaking}
+
+    def schedule_jobs(self):
+        start_time = time.time()
+        context = multiprocessing.get_context()
+        best_makespan = context.Value("d", math.inf)
+        stop = context.Value("b", False)
+        results = context.Queue()
+        block, handle = self.instance.share()
+        processes = [
+            context.Process(target=run_engine, daemon=True,
+                            args=(engine, handle, self.max_seconds, self.cpsat_workers, best_makespan, stop, results,
+                                  self.engine_options()))
+            for engine in self.engines
+        ]
+        for process in processes:
+            process.start()
+
+        self.best_bound = LowerBounds(self.problem).node_bound(ScheduleNode(self.instance, self.machines, problem=self.problem))
+        self.best_makespan = None
+        finished = {}
+        stop_reason = "max_seconds"
+        deadline = start_time + self.max_seconds + self.grace_seconds
+        next_report = start_time
+        while len(finished) < len(processes):
+            now = time.time()
+            if now >= deadline:
+                break
+            if self.progress_callback is not None and now >= next_report:
+                next_report = now + 0.5
+                if self.progress_callback(self.progress(start_time)) is False and not stop.value:
+                    stop.value = True
+                    stop_reason = "cancelled"
+                    deadline = min(deadline, now + self.stop_seconds)
+            try:
+                result = results.get(timeout=min(deadline - now, 0.1))
+            except queue.Empty:
+                if not any(process.is_alive() for process in processes) and results.empty():
+                    break  # An engine died without reporting
+                continue
+            finished[result["engine"]] = result
+            if "error" in result:
+                continue
+            if self.best_makespan is None or result["makespan"] < self.best_makespan:
+                self.best_makespan = result["makespan"]
+            if result["lower_bound"] is not None and result["lower_bound"] > self.best_bound:
+                self.best_bound = result["lower_bound"]
+            if self.best_bound >= self.best_makespan and not stop.value:
+                # Proven optimal: let the other engines hand back what they have, briefly
+                stop.value = True
+                stop_reason = "optimal"
+                deadline = min(deadline, time.time() + self.stop_seconds)
+            elif self.target_gap is not None and not stop.value and \
+                    (self.best_makespan - self.best_bound) / self.best_makespan <= self.target_gap:
+                stop.value = True
+                stop_reason = "target_gap"
+                deadline = min(deadline, time.time() + self.stop_seconds)
+        else:
+            if stop_reason == "max_seconds":
+                stop_reason = "completed"
+
+        stop.value = True
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+        block.close()
+        block.unlink()
+
+        # The best schedule wins; ties go to the engine that finished first
+        solved = [result for result in finished.values() if "error" not in result]
+        if solved:
+            winner = min(solved, key=lambda result: result["makespan"])
+            assignments = winner["solution_path"]
+            winner_name = winner["engine"]
+        else:
+            assignments, _ = DispatchScheduler(self.instance, self.machines, "lpt").dispatch()
+            winner_name = None
+        schedule = self.format_assignments(assignments)
+        makespan = self.result.makespan
+        if stop_reason != "optimal" and self.best_bound >= makespan:
+            stop_reason = "optimal"
+
+        self.visualization_data["engines"] = {
+            engine: {key: value for key, value in finished.get(engine, {"error": "stopped before returning a schedule"}).items()
+                     if key not in ("engine", "solution_path")}
+            for engine in self.engines
+        }
+        self.visualization_data["winner"] = winner_name
+        self.visualization_data["cpsat_workers"] = self.cpsat_workers if "cpsat" in self.engines else None
+        self.visualization_data["stop_reason"] = stop_reason
+        self.visualization_data["lower_bound"] = min(self.best_bound, makespan)
+        self.visualization_data["gap"] = (makespan - min(self.best_bound, makespan)) / makespan if makespan else 0.0
+        self.visualization_data["solution_path"] = assignments
+        self.visualization_data["execution_time"] = time.time() - start_time
+        return schedule
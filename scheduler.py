@@ -3,19 +3,198 @@ import numpy as np
 import time
 import math
 from collections import defaultdict, namedtuple
-from ortools.sat.python import cp_model
+from telemetry import SearchTelemetry
+from bounds import LowerBounds
+from instance import ScheduleResult, as_instance
 
-# Node representation for search algorithms
-class ScheduleNode:
-    def __init__(self, jobs, machines, scheduled_jobs=None, unscheduled_jobs=None, parent=None, cost=0, action=None):
+# Shared, read-only view of the problem used by every node of a search
+class SearchProblem:
+    """
+    Array form of a (flexible) job shop instance.
+
+    Operations are numbered job by job, in job order, so the operations of a
+    job are consecutive and an operation can start once its predecessor (the
+    previous index) is done. Eligible machines are stored in CSR form: the
+    alternatives of operation o are alt_machines/alt_times[alt_start[o]:alt_start[o + 1]].
+    Per-operation lists hold the shortest processing time and, for operations
+    with a single eligible machine, that machine (-1 otherwise).
+
+    After break_symmetries(), symmetry_shifts holds (shift, targets) pairs:
+    the first operation of a job in targets waits until the first operation
+    shift places lower, that of the previous job interchangeable with it, is
+    scheduled. Searches then only build the schedules in which interchangeable
+    jobs start in index order, one for every set of swapped ones.
+    """
+    __slots__ = ("jobs", "machines", "instance", "num_jobs", "num_machines", "num_ops", "op_job", "op_last",
+                 "job_first_op", "processing_times", "machine_indices", "release_times", "priorities", "tail_work",
+                 "alt_start", "alt_machines", "alt_times", "not_first_mask", "has_precedence", "flexible",
+                 "total_work", "work_by_machine", "order_by_time", "processing_array", "machine_array",
+                 "release_array", "job_array", "tail_array", "time_matrix", "symmetry_shifts")
+
+    def __init__(self, jobs, machines):
         self.jobs = jobs
         self.machines = machines
-        self.scheduled_jobs = scheduled_jobs or []
-        self.unscheduled_jobs = unscheduled_jobs or list(range(len(jobs)))
+        # Job lists are converted; an Instance is read as is (raises ValueError on unknown machines)
+        instance = self.instance = as_instance(jobs, len(machines))
+        self.num_jobs = instance.num_jobs
+        self.num_machines = instance.num_machines
+        self.alt_start = instance.alt_start.tolist()
+        self.alt_machines = instance.alt_machines.tolist()
+        self.alt_times = instance.alt_times.tolist()
+        self.job_first_op = instance.op_start[:-1].tolist()
+        self.op_job = instance.op_jobs.tolist()
+        op_last = np.zeros(len(self.op_job), dtype=bool)
+        op_last[instance.op_start[1:] - 1] = True
+        self.op_last = op_last.tolist()
+        self.release_times = instance.release_times[instance.op_jobs].tolist()
+        self.priorities = instance.priorities[instance.op_jobs].tolist()
+        # Shortest time of each operation, and its machine when it has only one
+        first_alts = instance.alt_start[:-1]
+        shortest = np.minimum.reduceat(instance.alt_times, first_alts) if len(first_alts) else instance.alt_times
+        single = np.diff(instance.alt_start) == 1
+        self.processing_times = shortest.tolist()
+        self.machine_indices = np.where(single, instance.alt_machines[first_alts], -1).tolist()
+        # Shortest work from each operation to the end of its job: suffix sums restarted at every job
+        suffix = np.cumsum(shortest[::-1])[::-1]
+        job_after = np.append(suffix[instance.op_start[1:-1]], 0)
+        self.tail_work = (suffix - job_after[instance.op_jobs]).tolist()
+        not_first = np.ones(len(self.op_job), dtype=bool)
+        not_first[instance.op_start[:-1]] = False
+        not_first_mask = int.from_bytes(np.packbits(not_first, bitorder="little").tobytes(), "little")
+        self.num_ops = len(self.op_job)
+        self.not_first_mask = not_first_mask
+        self.has_precedence = not_first_mask != 0
+        self.flexible = -1 in self.machine_indices
+        self.total_work = sum(self.processing_times)
+        # Work that is bound to one machine; flexible operations are left out
+        work_by_machine = [0] * self.num_machines
+        for p, m in zip(self.processing_times, self.machine_indices):
+            if m >= 0:
+                work_by_machine[m] += p
+        self.work_by_machine = tuple(work_by_machine)
+        # Operation indices from longest to shortest, used to find the longest remaining one
+        self.order_by_time = np.argsort(-shortest, kind="stable").tolist()
+        # Per-operation arrays for the batched heuristics
+        self.processing_array = np.array(self.processing_times, dtype=np.float64)
+        self.machine_array = np.array(self.machine_indices, dtype=np.intp)
+        self.release_array = np.array(self.release_times, dtype=np.float64)
+        self.job_array = np.array(self.op_job, dtype=np.intp)
+        self.tail_array = np.array(self.tail_work, dtype=np.float64)
+        self.time_matrix = None
+        if self.flexible:
+            # Dense (operation, machine) lookup of processing times for the batched heuristics
+            self.time_matrix = np.zeros((self.num_ops, self.num_machines))
+            for op_idx in range(self.num_ops):
+                for alt in range(self.alt_start[op_idx], self.alt_start[op_idx + 1]):
+                    self.time_matrix[op_idx, self.alt_machines[alt]] = self.alt_times[alt]
+        self.symmetry_shifts = ()
+
+    def break_symmetries(self):
+        """Order the interchangeable jobs (see Instance.interchangeable_jobs); returns how many were ordered"""
+        targets = defaultdict(int)
+        ordered = 0
+        for group in self.instance.interchangeable_jobs():
+            for previous, job_idx in zip(group, group[1:]):
+                first_op = self.job_first_op[job_idx]
+                targets[first_op - self.job_first_op[previous]] |= 1 << first_op
+            ordered += len(group) - 1
+        self.symmetry_shifts = tuple(sorted(targets.items()))
+        return ordered
+
+    def alternatives(self, op_idx):
+        """(machine_idx, processing_time) pairs for the eligible machines of an operation"""
+        start, end = self.alt_start[op_idx], self.alt_start[op_idx + 1]
+        return zip(self.alt_machines[start:end], self.alt_times[start:end])
+
+    def op_time(self, op_idx, machine_idx):
+        """Processing time of an operation on one of its eligible machines"""
+        for machine, processing_time in self.alternatives(op_idx):
+            if machine == machine_idx:
+                return processing_time
+        raise ValueError(f"Machine {machine_idx + 1} is not eligible for operation {op_idx}")
+
+
+def iter_bits(mask):
+    """Yield the indices of the set bits of an integer, lowest first"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def successor_arrays(node, ops, machine_indices=None):
+    """
+    Processing times, machines and start times of the successors of node that
+    schedule operations ops (on machine_indices), as NumPy arrays
+    """
+    problem = node.problem
+    if machine_indices is None:
+        machines = problem.machine_array[ops]
+    else:
+        machines = np.asarray(machine_indices, dtype=np.intp)
+    if problem.flexible:
+        times = problem.time_matrix[ops, machines]
+    else:
+        times = problem.processing_array[ops]
+    ready = problem.release_array[ops]
+    if node.job_times:
+        ready = np.maximum(ready, np.asarray(node.job_times, dtype=np.float64)[problem.job_array[ops]])
+    start_times = np.maximum(np.asarray(node.machine_times, dtype=np.float64)[machines], ready)
+    return times, machines, start_times
+
+
+# Node representation for search algorithms
+class ScheduleNode:
+    """
+    A partial schedule. Nodes share their history through the parent pointer and
+    carry the machine-time vector, makespan and remaining work incrementally, so
+    creating a successor costs O(machines) instead of O(jobs).
+
+    For multi-operation jobs job_times holds when each unfinished job's last
+    scheduled operation ends (0 once the job is done); otherwise it is empty.
+    """
+    __slots__ = ("problem", "parent", "cost", "action", "machine_times", "job_times", "makespan",
+                 "unscheduled_mask", "remaining_work", "remaining_by_machine", "depth")
+
+    def __init__(self, jobs, machines, parent=None, cost=0, action=None, problem=None):
+        self.problem = problem or SearchProblem(jobs, machines)
         self.parent = parent
         self.cost = cost  # g(n) in A*
-        self.action = action  # The job that was scheduled to reach this state
-        
+        self.action = action  # (op_idx, start_time, machine_idx) scheduled to reach this state
+        self.machine_times = (0,) * self.problem.num_machines
+        self.job_times = (0,) * self.problem.num_jobs if self.problem.has_precedence else ()
+        self.makespan = 0
+        self.unscheduled_mask = (1 << self.problem.num_ops) - 1
+        self.remaining_work = self.problem.total_work
+        self.remaining_by_machine = self.problem.work_by_machine
+        self.depth = 0
+
+    @property
+    def jobs(self):
+        return self.problem.jobs
+
+    @property
+    def machines(self):
+        return self.problem.machines
+
+    @property
+    def scheduled_jobs(self):
+        """(op_idx, start_time, machine_idx) tuples in the order they were scheduled"""
+        return self.get_path()
+
+    @property
+    def unscheduled_jobs(self):
+        """Indices of the operations that still have to be scheduled"""
+        return list(iter_bits(self.unscheduled_mask))
+
+    def available_mask(self):
+        """Bitmask of the unscheduled operations whose predecessor is done"""
+        mask = self.unscheduled_mask
+        available = mask & ~((mask << 1) & self.problem.not_first_mask)
+        for shift, targets in self.problem.symmetry_shifts:
+            available &= ~((mask << shift) & targets)
+        return available
+
     def get_path(self):
         """Get the path from the root to this node"""
         path = []
@@ -27,65 +206,220 @@ class ScheduleNode:
     
     def get_machine_times(self):
         """Get the current time for each machine"""
-        machine_times = [0] * len(self.machines)
-        for job_idx, start_time, machine_idx in self.scheduled_jobs:
-            job = self.jobs[job_idx]
-            end_time = start_time + job.processing_time
-            machine_times[machine_idx] = max(machine_times[machine_idx], end_time)
-        return machine_times
+        return list(self.machine_times)
     
     def get_makespan(self):
         """Get the makespan of the current schedule"""
-        if not self.scheduled_jobs:
-            return 0
-        return max(start_time + self.jobs[job_idx].processing_time 
-                   for job_idx, start_time, _ in self.scheduled_jobs)
+        return self.makespan
+
+    def resource_times(self):
+        """Machine times followed by job times; the vector compared for dominance"""
+        return self.machine_times + self.job_times if self.job_times else self.machine_times
+
+    def max_remaining_time(self):
+        """Longest processing time among the unscheduled operations"""
+        return self.top_remaining_times()[1]
+
+    def top_remaining_times(self):
+        """(op_idx, time) of the longest unscheduled operation, and the second-longest time"""
+        mask = self.unscheduled_mask
+        first = None
+        for op_idx in self.problem.order_by_time:
+            if mask >> op_idx & 1:
+                if first is not None:
+                    return first, self.problem.processing_times[first], self.problem.processing_times[op_idx]
+                first = op_idx
+        if first is None:
+            return None, 0, 0
+        return first, self.problem.processing_times[first], 0
+
+    def job_tails(self):
+        """(op_idx, tail) per available operation: earliest start plus the job's remaining work"""
+        problem = self.problem
+        tails = []
+        for op_idx in iter_bits(self.available_mask()):
+            ready = problem.release_times[op_idx]
+            if self.job_times and self.job_times[problem.op_job[op_idx]] > ready:
+                ready = self.job_times[problem.op_job[op_idx]]
+            tails.append((op_idx, ready + problem.tail_work[op_idx]))
+        return tails
     
     def is_goal(self):
-        """Check if all jobs are scheduled"""
-        return len(self.unscheduled_jobs) == 0
+        """Check if all operations are scheduled"""
+        return self.unscheduled_mask == 0
+
+    def state_key(self):
+        """Canonical signature of the state: remaining-operation bitmask and resource times"""
+        return (self.unscheduled_mask, self.resource_times())
+
+    def child(self, op_idx, machine_idx=None, processing_time=None):
+        """
+        Create the successor reached by scheduling op_idx next, on machine_idx
+        (by default the eligible machine where it would finish first)
+        """
+        problem = self.problem
+        job_idx = problem.op_job[op_idx]
+
+        # Earliest start: the job's release and, for multi-operation jobs, its previous operation
+        ready = problem.release_times[op_idx]
+        if self.job_times and self.job_times[job_idx] > ready:
+            ready = self.job_times[job_idx]
+        if machine_idx is None:
+            machine_idx, processing_time = min(
+                problem.alternatives(op_idx),
+                key=lambda alt: max(self.machine_times[alt[0]], ready) + alt[1])
+        elif processing_time is None:
+            processing_time = problem.op_time(op_idx, machine_idx)
+
+        # Start time is the current time of the machine, or when the operation is ready
+        start_time = self.machine_times[machine_idx]
+        if ready > start_time:
+            start_time = ready
+        end_time = start_time + processing_time
+
+        node = ScheduleNode.__new__(ScheduleNode)
+        node.problem = problem
+        node.parent = self
+        node.cost = self.cost + processing_time  # Incremental cost
+        node.action = (op_idx, start_time, machine_idx)
+
+        machine_times = list(self.machine_times)
+        machine_times[machine_idx] = end_time
+        node.machine_times = tuple(machine_times)
+        if self.job_times:
+            job_times = list(self.job_times)
+            job_times[job_idx] = 0 if problem.op_last[op_idx] else end_time
+            node.job_times = tuple(job_times)
+        else:
+            node.job_times = ()
+        node.makespan = end_time if end_time > self.makespan else self.makespan
+
+        node.unscheduled_mask = self.unscheduled_mask & ~(1 << op_idx)
+        node.remaining_work = self.remaining_work - problem.processing_times[op_idx]
+        fixed_machine = problem.machine_indices[op_idx]
+        if fixed_machine >= 0:
+            remaining = list(self.remaining_by_machine)
+            remaining[fixed_machine] -= processing_time
+            node.remaining_by_machine = tuple(remaining)
+        else:
+            node.remaining_by_machine = self.remaining_by_machine
+        node.depth = self.depth + 1
+        return node
     
     def get_successors(self):
-        """Generate all possible next states by scheduling one of the unscheduled jobs"""
-        successors = []
-        machine_times = self.get_machine_times()
-        
-        for job_idx in self.unscheduled_jobs:
-            job = self.jobs[job_idx]
-            machine_idx = job.machine_id - 1  # Convert 1-based to 0-based
-            
-            # Start time is the current time of the machine
-            start_time = machine_times[machine_idx]
-            
-            # Create new lists for the next state
-            new_scheduled = self.scheduled_jobs + [(job_idx, start_time, machine_idx)]
-            new_unscheduled = [j for j in self.unscheduled_jobs if j != job_idx]
-            
-            # Create the successor node
-            successor = ScheduleNode(
-                self.jobs,
-                self.machines,
-                new_scheduled,
-                new_unscheduled,
-                self,
-                self.cost + job.processing_time,  # Incremental cost
-                (job_idx, start_time, machine_idx)
-            )
-            
-            successors.append(successor)
-        
-        return successors
+        """Generate all next states: one available operation on one of its eligible machines"""
+        problem = self.problem
+        if not problem.flexible:
+            return [self.child(op_idx, problem.machine_indices[op_idx], problem.processing_times[op_idx])
+                    for op_idx in iter_bits(self.available_mask())]
+        return [self.child(op_idx, machine_idx, processing_time)
+                for op_idx in iter_bits(self.available_mask())
+                for machine_idx, processing_time in problem.alternatives(op_idx)]
     
     def __lt__(self, other):
         """Comparison for priority queue"""
         return self.cost < other.cost
 
 
+def dominates(times, other_times):
+    """True if every machine (and job) is free no later in times than in other_times"""
+    for t, o in zip(times, other_times):
+        if t > o:
+            return False
+    return True
+
+
+class StateTable:
+    """
+    Closed set and dominance filter shared by the search schedulers.
+
+    States are keyed by node.state_key(). Among states with the same remaining
+    operations, one whose machine and job times are all >= another's can never
+    lead to a better schedule, so it is dropped when generated, and a frontier
+    node that becomes dominated after it was pushed is skipped when popped.
+    """
+    __slots__ = ("vectors", "closed", "duplicates", "dominated")
+
+    def __init__(self):
+        self.vectors = {}  # remaining mask -> non-dominated machine-time vectors seen so far
+        self.closed = set()
+        self.duplicates = 0
+        self.dominated = 0
+
+    def add(self, node):
+        """Register a generated node; returns False if it should not be pushed"""
+        mask, times = node.unscheduled_mask, node.resource_times()
+        seen = self.vectors.get(mask)
+        if seen is None:
+            self.vectors[mask] = [times]
+            return True
+        for other in seen:
+            if other == times:
+                self.duplicates += 1
+                return False
+            if dominates(other, times):
+                self.dominated += 1
+                return False
+        # Keep only the vectors the new one does not dominate
+        seen[:] = [other for other in seen if not dominates(times, other)]
+        seen.append(times)
+        return True
+
+    def close(self, node):
+        """Mark a popped node as expanded; returns False if it is stale or already closed"""
+        key = node.state_key()
+        if key in self.closed:
+            self.duplicates += 1
+            return False
+        if key[1] not in self.vectors.get(node.unscheduled_mask, ()):
+            # A dominating state was generated after this node was pushed
+            self.dominated += 1
+            return False
+        self.closed.add(key)
+        return True
+
+
 class Scheduler:
-    """Base Scheduler class defining common interface"""
-    def __init__(self, jobs, machines):
+    """
+    Base Scheduler class defining common interface.
+
+    max_nodes, max_seconds and max_frontier bound a search run; when one of them
+    runs out the search returns the best schedule it can build so far.
+    telemetry selects how much search detail is recorded (see SearchTelemetry).
+    target_gap stops the search once the incumbent is proven within that
+    relative gap of optimal.
+    progress_callback, if given, is called with a progress dict every
+    progress_interval expanded nodes and whenever the search finds a better
+    schedule (with "incumbent" set); returning False cancels the search.
+    external_bound, if given, returns the best makespan found by another solver
+    (or None); it is polled as often as progress is reported and A* prunes
+    against it.
+    symmetry_breaking lets the tree searches schedule interchangeable jobs in
+    one canonical order (see SearchProblem.break_symmetries).
+    """
+    def __init__(self, jobs, machines, max_nodes=None, max_seconds=None, max_frontier=None,
+                 target_gap=None, telemetry="sampled", telemetry_samples=500, progress_callback=None,
+                 progress_interval=1000, external_bound=None, symmetry_breaking=True):
         self.jobs = jobs
         self.machines = machines
+        started = time.perf_counter()
+        self.problem = SearchProblem(jobs, machines)  # Raises ValueError on unknown machines
+        self.instance = self.problem.instance
+        self.result = None  # ScheduleResult of the last run
+        self.max_nodes = max_nodes
+        self.max_seconds = max_seconds
+        self.max_frontier = max_frontier
+        self.target_gap = target_gap
+        self.telemetry = SearchTelemetry(telemetry, telemetry_samples)
+        self.telemetry.setup_time = time.perf_counter() - started
+        self.progress_callback = progress_callback
+        self.progress_interval = progress_interval
+        self.external_bound = external_bound
+        self.symmetry_breaking = symmetry_breaking
+        self.external_makespan = None  # Best makespan reported through external_bound
+        self.best_makespan = None  # Incumbent and proven bound, when the algorithm tracks them
+        self.best_bound = None
+        self.cancel_requested = False  # Set when progress_callback asks to stop between budget checks
         self.algorithm_name = "Base Scheduler"
         self.visualization_data = {
             "algorithm_name": self.algorithm_name,
@@ -93,31 +427,129 @@ class Scheduler:
             "nodes_expanded": 0,
             "solution_path": [],
             "execution_time": 0,
+            "duplicates_pruned": 0,
+            "dominated_pruned": 0,
+            "stop_reason": None,
+            "lower_bound": None,
+            "gap": None,
             "heuristic_values": []
         }
     
+    # Below this many successors the scalar heuristic is cheaper than a NumPy batch
+    batch_threshold = 8
+
     def schedule_jobs(self):
         # This should be implemented by subclasses
         raise NotImplementedError
+
+    def break_symmetries(self):
+        """Restrict the search to one order of interchangeable jobs, if symmetry_breaking is on"""
+        if self.symmetry_breaking:
+            started = time.perf_counter()
+            self.visualization_data["ordered_jobs"] = self.problem.break_symmetries()
+            self.telemetry.setup_time += time.perf_counter() - started
+
+    def budget_exceeded(self, start_time, frontier):
+        """Name of the first search budget that has run out, or None"""
+        if self.cancel_requested:
+            return "cancelled"
+        if self.max_nodes is not None and self.telemetry.nodes_expanded >= self.max_nodes:
+            return "max_nodes"
+        if self.max_frontier is not None and len(frontier) > self.max_frontier:
+            return "max_frontier"
+        if self.max_seconds is not None and time.time() - start_time >= self.max_seconds:
+            return "max_seconds"
+        if self.target_gap is not None and self.best_makespan and self.best_bound is not None:
+            if (self.best_makespan - self.best_bound) / self.best_makespan <= self.target_gap:
+                return "target_gap"
+        if self.telemetry.nodes_expanded >= self.telemetry.next_report and (
+                self.progress_callback is not None or self.external_bound is not None):
+            self.telemetry.next_report = self.telemetry.nodes_expanded + self.progress_interval
+            if self.external_bound is not None:
+                bound = self.external_bound()
+                if bound is not None and (self.external_makespan is None or bound < self.external_makespan):
+                    self.external_makespan = bound
+            if self.progress_callback is not None and \
+                    self.progress_callback(self.progress(start_time, len(frontier))) is False:
+                return "cancelled"
+        return None
+
+    def cutoff(self, upper_bound):
+        """Makespan a node must beat to be worth expanding: the own or an external incumbent"""
+        if self.external_makespan is not None and (upper_bound is None or self.external_makespan < upper_bound):
+            return self.external_makespan
+        return upper_bound
+
+    def progress(self, start_time, frontier_size=0):
+        """Snapshot of a running search for progress reporting"""
+        gap = None
+        if self.best_makespan is not None and self.best_bound is not None:
+            gap = (self.best_makespan - min(self.best_bound, self.best_makespan)) / self.best_makespan \
+                if self.best_makespan else 0.0
+        return {
+            "nodes_expanded": self.telemetry.nodes_expanded,
+            "frontier_size": frontier_size,
+            "elapsed": time.time() - start_time,
+            "best_makespan": self.best_makespan,
+            "lower_bound": self.best_bound,
+            "gap": gap,
+        }
+
+    def report_incumbent(self, start_time, frontier_size=0):
+        """Report a new best schedule right away; a False reply cancels the search at its next budget check"""
+        if self.progress_callback is not None:
+            if self.progress_callback(dict(self.progress(start_time, frontier_size), incumbent=True)) is False:
+                self.cancel_requested = True
+
+    def complete_greedily(self, node):
+        """Extend a partial schedule to a full one by appending the remaining operations"""
+        while not node.is_goal():
+            node = node.child(next(iter_bits(node.available_mask())))
+        return node
+
+    def record_search_stats(self, states, start_time):
+        """Copy the end-of-search counters into visualization_data"""
+        self.visualization_data["duplicates_pruned"] = states.duplicates
+        self.visualization_data["dominated_pruned"] = states.dominated
+        self.telemetry.export(self.visualization_data, states)
+        self.visualization_data["execution_time"] = time.time() - start_time
+
+    def evaluate_successors(self, node, successors):
+        """Heuristic values of node's successors, batched when the fan-out is large"""
+        started = self.telemetry.heuristic_timer()
+        if len(successors) < self.batch_threshold:
+            h_values = [self.heuristic(successor) for successor in successors]
+        else:
+            h_values = self.heuristic_batch(node, [s.action[0] for s in successors],
+                                            [s.action[2] for s in successors]).tolist()
+        self.telemetry.heuristic_done(started)
+        return h_values
     
     def format_schedule(self, node):
         """Convert the internal schedule to the expected output format"""
-        schedule = []
-        for job_idx, start_time, machine_idx in node.scheduled_jobs:
-            job = self.jobs[job_idx]
-            job.start_time = start_time
-            job.end_time = start_time + job.processing_time
-            # Return format: (job_id, start_time, end_time, machine_id)
-            schedule.append((job.job_id, start_time, job.end_time, machine_idx + 1))
-        return sorted(schedule, key=lambda x: x[1])  # Sort by start time
+        return self.format_assignments(node.scheduled_jobs)
+
+    def format_assignments(self, assignments):
+        """
+        Record (op_idx, start_time, machine_idx) tuples as self.result and
+        convert them to the expected output format, one entry per operation.
+        The instance is left untouched; only a list of Job objects gets the
+        times written back.
+        """
+        self.result = ScheduleResult(self.instance, assignments)
+        if self.jobs is not self.instance:
+            self.result.write_back(self.jobs)
+        # Return format: (job_id, start_time, end_time, machine_id)
+        return self.result.entries()
 
 
 class GBFSScheduler(Scheduler):
     """Greedy Best-First Search Scheduler"""
-    def __init__(self, jobs, machines):
-        super().__init__(jobs, machines)
+    def __init__(self, jobs, machines, **options):
+        super().__init__(jobs, machines, **options)
         self.algorithm_name = "Greedy Best-First Search (GBFS)"
         self.visualization_data["algorithm_name"] = self.algorithm_name
+        self.break_symmetries()
     
     def heuristic(self, node):
         """
@@ -130,19 +562,17 @@ class GBFSScheduler(Scheduler):
         if node.is_goal():
             return 0
         
-        # Calculate basic metrics
-        current_makespan = node.get_makespan()
+        # Calculate basic metrics (carried incrementally by the node)
+        current_makespan = node.makespan
         
         # Sum of unscheduled processing times
-        unscheduled_processing_time = sum(self.jobs[job_idx].processing_time 
-                                        for job_idx in node.unscheduled_jobs)
+        unscheduled_processing_time = node.remaining_work
         
         # Maximum processing time of unscheduled jobs
-        max_unscheduled_time = max(self.jobs[job_idx].processing_time 
-                                  for job_idx in node.unscheduled_jobs) if node.unscheduled_jobs else 0
+        max_unscheduled_time = node.max_remaining_time()
         
         # Machine utilization imbalance (standard deviation of machine times)
-        machine_times = node.get_machine_times()
+        machine_times = node.machine_times
         machine_std = np.std(machine_times) if len(machine_times) > 1 else 0
         
         # Combine factors - weighted sum
@@ -154,76 +584,147 @@ class GBFSScheduler(Scheduler):
         )
         
         return h_value
+
+    def heuristic_batch(self, node, op_indices, machine_indices=None):
+        """
+        Evaluate heuristic() for every successor of node in one NumPy pass.
+        op_indices and machine_indices are the operations scheduled to reach
+        each successor and their machines (required for flexible operations).
+        """
+        problem = node.problem
+        ops = np.asarray(op_indices, dtype=np.intp)
+        times, machines, start_times = successor_arrays(node, ops, machine_indices)
+        machine_times = np.asarray(node.machine_times, dtype=np.float64)
+        num_machines = len(machine_times)
+
+        # Makespan after appending each operation to its machine
+        new_times = start_times + times
+        makespan = np.maximum(node.makespan, new_times)
+
+        # Remaining work and longest remaining operation once each one is removed
+        remaining = node.remaining_work - problem.processing_array[ops]
+        longest_idx, longest, second = node.top_remaining_times()
+        max_unscheduled = np.where(ops == longest_idx, second, longest)
+
+        # Standard deviation of the machine times with one entry updated
+        if num_machines > 1:
+            total = machine_times.sum() - machine_times[machines] + new_times
+            squares = (machine_times ** 2).sum() - machine_times[machines] ** 2 + new_times ** 2
+            mean = total / num_machines
+            machine_std = np.sqrt(np.maximum(squares / num_machines - mean ** 2, 0))
+        else:
+            machine_std = 0
+
+        h_values = (
+            0.5 * makespan +
+            0.3 * (remaining / num_machines) +
+            0.2 * max_unscheduled +
+            0.1 * machine_std
+        )
+        # Successors that schedule the last operation are goals
+        if bin(node.unscheduled_mask).count("1") == 1:
+            h_values = np.zeros(len(ops))
+        return h_values
     
     def schedule_jobs(self):
         """Implement Greedy Best-First Search to find a schedule"""
         start_time = time.time()
-        self.visualization_data["nodes_expanded"] = 0
+        telemetry = self.telemetry
+        telemetry.reset()
         self.visualization_data["search_iterations"] = 0
-        self.visualization_data["heuristic_values"] = []
+        self.visualization_data["stop_reason"] = None
         
         # Initialize the search with the starting node
-        initial_node = ScheduleNode(self.jobs, self.machines)
+        initial_node = ScheduleNode(self.instance, self.machines, problem=self.problem)
         
         # Priority queue for GBFS (using heuristic values)
         frontier = [(self.heuristic(initial_node), 0, initial_node)]  # (heuristic, tiebreaker, node)
-        frontier_set = {tuple(initial_node.unscheduled_jobs)}
+        states = StateTable()
+        states.add(initial_node)
         
         # Counter for tiebreaking nodes with the same heuristic
         counter = 1
         
-        # For visualization: track nodes explored at each level
-        self.visualization_data["exploration_by_level"] = defaultdict(int)
-        
         while frontier:
+            # Stop with a greedy completion of the best open node once a budget runs out
+            stop_reason = self.budget_exceeded(start_time, frontier)
+            if stop_reason:
+                best_node = self.complete_greedily(frontier[0][-1])
+                self.visualization_data["stop_reason"] = stop_reason
+                self.record_search_stats(states, start_time)
+                self.visualization_data["solution_path"] = best_node.get_path()
+                return self.format_schedule(best_node)
+            
             # Get the node with the lowest heuristic value
             h_value, _, current_node = heapq.heappop(frontier)
-            frontier_set.remove(tuple(current_node.unscheduled_jobs))
             
-            # Record the heuristic value for visualization
-            current_level = len(self.jobs) - len(current_node.unscheduled_jobs)
-            self.visualization_data["heuristic_values"].append({
-                "level": current_level,
-                "heuristic": h_value,
-                "makespan": current_node.get_makespan()
-            })
-            self.visualization_data["exploration_by_level"][current_level] += 1
+            # Skip states that were already expanded or have since been dominated
+            if not states.close(current_node):
+                continue
             
-            # Increment nodes expanded counter
-            self.visualization_data["nodes_expanded"] += 1
+            # Record the heuristic value for visualization
+            current_level = current_node.depth
+            telemetry.node_expanded(current_level)
+            if telemetry.sampling:
+                telemetry.sample({
+                    "level": current_level,
+                    "heuristic": h_value,
+                    "makespan": current_node.makespan
+                })
             
             # Check if we've reached the goal
             if current_node.is_goal():
-                self.visualization_data["execution_time"] = time.time() - start_time
+                self.record_search_stats(states, start_time)
                 self.visualization_data["solution_path"] = current_node.get_path()
                 return self.format_schedule(current_node)
             
             # Expand the current node
-            for successor in current_node.get_successors():
-                # Skip if we've seen this state before
-                successor_key = tuple(successor.unscheduled_jobs)
-                if successor_key in frontier_set:
-                    continue
+            # Skip successors whose state (or a dominating one) was seen before
+            expand_started = time.perf_counter()
+            generated = current_node.get_successors()
+            successors = [s for s in generated if states.add(s)]
+            telemetry.add_time("expand", time.perf_counter() - expand_started)
+            telemetry.count("successors_generated", len(generated))
+            if successors:
+                h_values = self.evaluate_successors(current_node, successors)
                 
                 # Add to frontier with heuristic value
-                successor_h = self.heuristic(successor)
-                heapq.heappush(frontier, (successor_h, counter, successor))
-                frontier_set.add(successor_key)
-                counter += 1
+                push_started = time.perf_counter()
+                for successor, successor_h in zip(successors, h_values):
+                    heapq.heappush(frontier, (successor_h, counter, successor))
+                    counter += 1
+                telemetry.add_time("frontier", time.perf_counter() - push_started)
+                telemetry.count("frontier_pushes", len(successors))
+                telemetry.frontier_size(len(frontier))
             
             self.visualization_data["search_iterations"] += 1
         
         # If we exhaust the frontier without finding a solution
-        self.visualization_data["execution_time"] = time.time() - start_time
+        self.record_search_stats(states, start_time)
         return []
 
 
 class AStarScheduler(Scheduler):
-    """A* Search Scheduler"""
-    def __init__(self, jobs, machines):
-        super().__init__(jobs, machines)
-        self.algorithm_name = "A* Search"
+    """
+    A* Search Scheduler.
+
+    Nodes are ordered by f(n) = g(n) + weight * h(n), where g(n) is the makespan
+    of the partial schedule and g(n) + h(n) the admissible makespan bound from
+    heuristic(). With weight > 1 the search is weighted A*: it finds a first
+    schedule faster and then keeps improving it (anytime) until the frontier is
+    exhausted or a budget runs out. The best schedule found is returned together
+    with a proven lower bound and the relative gap between the two.
+
+    A DispatchScheduler run with seed_rule supplies the initial incumbent, so
+    nodes that cannot beat it are pruned from the start.
+    """
+    def __init__(self, jobs, machines, weight=1.0, seed_rule="lpt", **options):
+        super().__init__(jobs, machines, **options)
+        self.weight = weight
+        self.seed_rule = seed_rule
+        self.algorithm_name = "A* Search" if weight == 1 else f"Weighted A* Search (w={weight:g})"
         self.visualization_data["algorithm_name"] = self.algorithm_name
+        self.break_symmetries()
     
     def heuristic(self, node):
         """
@@ -232,181 +733,316 @@ class AStarScheduler(Scheduler):
         if node.is_goal():
             return 0
         
-        # Machine load balancing heuristic
-        machine_times = node.get_machine_times()
-        
-        # Calculate remaining work per machine
-        remaining_work_per_machine = defaultdict(int)
-        for job_idx in node.unscheduled_jobs:
-            job = self.jobs[job_idx]
-            machine_idx = job.machine_id - 1
-            remaining_work_per_machine[machine_idx] += job.processing_time
-        
-        # For each machine, estimate completion time
-        estimated_completion_times = []
-        for machine_idx, current_time in enumerate(machine_times):
-            # Time to complete all remaining jobs on this machine
-            completion_time = current_time + remaining_work_per_machine.get(machine_idx, 0)
-            estimated_completion_times.append(completion_time)
+        # Machine load balancing heuristic: for each machine, the time to
+        # complete all remaining jobs on it (both vectors are kept by the node)
+        estimated_completion_times = [
+            current_time + remaining
+            for current_time, remaining in zip(node.machine_times, node.remaining_by_machine)
+        ]
         
         # A* heuristic: maximum estimated completion time
         h_value = max(estimated_completion_times) if estimated_completion_times else 0
         
+        problem = node.problem
+        if problem.flexible:
+            # Flexible work is not bound to a machine, but must fit on all of them together
+            h_value = max(h_value, (sum(node.machine_times) + node.remaining_work) / problem.num_machines)
+        if problem.has_precedence:
+            # Each job still has to run its remaining operations one after another
+            h_value = max([h_value] + [tail for _, tail in node.job_tails()])
+        
         return h_value
+
+    def heuristic_batch(self, node, op_indices, machine_indices=None):
+        """
+        Evaluate heuristic() for every successor of node in one NumPy pass.
+        op_indices and machine_indices are the operations scheduled to reach
+        each successor and their machines (required for flexible operations).
+        """
+        problem = node.problem
+        ops = np.asarray(op_indices, dtype=np.intp)
+        times, machines, start_times = successor_arrays(node, ops, machine_indices)
+        machine_times = np.asarray(node.machine_times, dtype=np.float64)
+        remaining = np.asarray(node.remaining_by_machine, dtype=np.float64)
+        end_times = start_times + times
+
+        # Scheduling an operation moves its time from the remaining work of its
+        # machine to the machine time, so only that machine's estimate is recomputed
+        estimates = machine_times + remaining
+        others = np.broadcast_to(estimates, (len(ops), len(estimates))).copy()
+        rows = np.arange(len(ops))
+        bound_work = np.where(problem.machine_array[ops] >= 0, times, 0)  # Flexible work is not in remaining
+        others[rows, machines] = end_times + (remaining[machines] - bound_work)
+        h_values = others.max(axis=1)
+
+        if problem.flexible:
+            total = machine_times.sum() + end_times - machine_times[machines]
+            work = node.remaining_work - problem.processing_array[ops]
+            h_values = np.maximum(h_values, (total + work) / problem.num_machines)
+        if problem.has_precedence:
+            # The successor's job continues from the operation's end; other jobs keep their tails
+            tails = sorted(node.job_tails(), key=lambda entry: -entry[1])
+            longest_op, longest = tails[0] if tails else (None, 0)
+            second = tails[1][1] if len(tails) > 1 else 0
+            own = end_times + problem.tail_array[ops] - problem.processing_array[ops]
+            h_values = np.maximum(h_values, np.maximum(own, np.where(ops == longest_op, second, longest)))
+
+        # Successors that schedule the last operation are goals
+        if bin(node.unscheduled_mask).count("1") == 1:
+            h_values = np.zeros(len(ops))
+        return h_values
     
+    def lower_bound(self, node, h_value, parent_bound=0):
+        """
+        Admissible bound on the makespan of any completion of node, from its
+        heuristic value and its parent's bound (a child's completions are a
+        subset of its parent's, so the parent's bound still holds)
+        """
+        return node.makespan if node.is_goal() else max(h_value, node.makespan, parent_bound)
+
+    def f_value(self, node, bound):
+        """f(n) = g(n) + weight * h(n), with g(n) the makespan so far"""
+        return node.makespan + self.weight * (bound - node.makespan)
+
     def schedule_jobs(self):
-        """Implement A* Search to find optimal schedule"""
+        """Implement (anytime, optionally weighted) A* Search to find a schedule"""
         start_time = time.time()
-        self.visualization_data["nodes_expanded"] = 0
+        telemetry = self.telemetry
+        telemetry.reset()
         self.visualization_data["search_iterations"] = 0
-        self.visualization_data["heuristic_values"] = []
+        self.visualization_data["stop_reason"] = None
         
         # Initialize the search with the starting node
-        initial_node = ScheduleNode(self.jobs, self.machines)
+        initial_node = ScheduleNode(self.instance, self.machines, problem=self.problem)
+        bounds = LowerBounds(initial_node.problem)
+        initial_bound = max(self.lower_bound(initial_node, self.heuristic(initial_node)),
+                            bounds.node_bound(initial_node))
         
-        # Priority queue for A* (using f(n) = g(n) + h(n))
-        frontier = [(self.heuristic(initial_node), 0, initial_node)]  # (f_value, tiebreaker, node)
-        frontier_set = {tuple(initial_node.unscheduled_jobs): 0}  # Maps state to g-value
+        # Priority queue for A*: (f_value, -depth, tiebreaker, bound, node).
+        # Deeper nodes win ties so plateaus of equal f are descended rather than widened.
+        frontier = [(self.f_value(initial_node, initial_bound), 0, 0, initial_bound, initial_node)]
+        states = StateTable()
+        states.add(initial_node)
         
         # Counter for tiebreaking nodes with the same f-value
         counter = 1
         
-        # For visualization: track nodes explored at each level
-        self.visualization_data["exploration_by_level"] = defaultdict(int)
+        # Best complete schedule found so far, seeded by a dispatch rule
+        incumbent = None
+        seed_assignments, upper_bound = None, None
+        if self.seed_rule and self.problem.num_ops:
+            with telemetry.phase("seed"):
+                seed_assignments, upper_bound = DispatchScheduler(self.instance, self.machines,
+                                                                  self.seed_rule).dispatch()
+        self.best_makespan = upper_bound
+        self.best_bound = initial_bound
         
         while frontier:
+            stop_reason = self.budget_exceeded(start_time, frontier)
+            if stop_reason:
+                self.visualization_data["stop_reason"] = stop_reason
+                break
+            
             # Get the node with the lowest f value
-            f_value, _, current_node = heapq.heappop(frontier)
-            current_state = tuple(current_node.unscheduled_jobs)
+            f_value, _, _, bound, current_node = heapq.heappop(frontier)
             
-            # Skip if we've found a better path to this state
-            if current_state in frontier_set and frontier_set[current_state] < current_node.cost:
+            # Prune nodes that cannot improve on the incumbent (ours or another solver's)
+            cutoff = self.cutoff(upper_bound)
+            if cutoff is not None and bound >= cutoff:
+                telemetry.count("cutoff_prunes")
                 continue
             
-            # Remove from frontier set
-            if current_state in frontier_set:
-                del frontier_set[current_state]
+            # Skip states that were already expanded or have since been dominated
+            if not states.close(current_node):
+                continue
             
-            # Record the f-value for visualization
-            current_level = len(self.jobs) - len(current_node.unscheduled_jobs)
-            h_value = f_value - current_node.cost  # h(n) = f(n) - g(n)
-            self.visualization_data["heuristic_values"].append({
-                "level": current_level,
-                "f_value": f_value,
-                "g_value": current_node.cost,
-                "h_value": h_value,
-                "makespan": current_node.get_makespan()
-            })
-            self.visualization_data["exploration_by_level"][current_level] += 1
+            # Unweighted A* pops bounds in nondecreasing order, so this one is proven
+            if self.weight <= 1 and bound > self.best_bound:
+                self.best_bound = bound
             
-            # Increment nodes expanded counter
-            self.visualization_data["nodes_expanded"] += 1
+            # Record the f-value for visualization
+            current_level = current_node.depth
+            telemetry.node_expanded(current_level)
+            if telemetry.sampling:
+                telemetry.sample({
+                    "level": current_level,
+                    "f_value": f_value,
+                    "g_value": current_node.makespan,
+                    "h_value": f_value - current_node.makespan,  # h(n) = f(n) - g(n)
+                    "makespan": current_node.makespan
+                })
             
             # Check if we've reached the goal
             if current_node.is_goal():
-                self.visualization_data["execution_time"] = time.time() - start_time
-                self.visualization_data["solution_path"] = current_node.get_path()
-                return self.format_schedule(current_node)
+                incumbent = current_node
+                upper_bound = self.best_makespan = current_node.makespan
+                self.report_incumbent(start_time, len(frontier))
+                # Without inflation the first goal popped is optimal
+                if self.weight <= 1:
+                    break
+                continue
+            
+            # Tighten the node's bound before branching (branch and bound)
+            bound = max(bound, bounds.node_bound(current_node))
+            if cutoff is not None and bound >= cutoff:
+                telemetry.count("cutoff_prunes")
+                continue
             
             # Expand the current node
-            for successor in current_node.get_successors():
-                successor_state = tuple(successor.unscheduled_jobs)
-                
-                # If we've seen this state before with a better g value, skip
-                if successor_state in frontier_set and frontier_set[successor_state] <= successor.cost:
-                    continue
+            # Skip successors whose state (or one with earlier machine times) was seen before
+            expand_started = time.perf_counter()
+            generated = current_node.get_successors()
+            successors = [s for s in generated if states.add(s)]
+            telemetry.add_time("expand", time.perf_counter() - expand_started)
+            telemetry.count("successors_generated", len(generated))
+            if successors:
+                h_values = self.evaluate_successors(current_node, successors)
                 
-                # Add to frontier with f value = g + h
-                successor_h = self.heuristic(successor)
-                successor_f = successor.cost + successor_h
-                heapq.heappush(frontier, (successor_f, counter, successor))
-                frontier_set[successor_state] = successor.cost
-                counter += 1
+                # Add to frontier with f value = g + weight * h
+                push_started = time.perf_counter()
+                for successor, successor_h in zip(successors, h_values):
+                    successor_bound = self.lower_bound(successor, successor_h, bound)
+                    if cutoff is not None and successor_bound >= cutoff:
+                        telemetry.count("cutoff_prunes")
+                        continue
+                    heapq.heappush(frontier, (self.f_value(successor, successor_bound),
+                                              -successor.depth, counter, successor_bound, successor))
+                    counter += 1
+                    telemetry.count("frontier_pushes")
+                telemetry.add_time("frontier", time.perf_counter() - push_started)
+                telemetry.frontier_size(len(frontier))
             
             self.visualization_data["search_iterations"] += 1
         
-        # If we exhaust the frontier without finding a solution
-        self.visualization_data["execution_time"] = time.time() - start_time
-        return []
+        if incumbent is not None:
+            best_assignments = incumbent.get_path()
+        elif seed_assignments is not None:
+            # Nothing beat the dispatch schedule
+            best_assignments = seed_assignments
+        else:
+            # Out of budget before any goal: complete the most promising open node
+            incumbent = self.complete_greedily(frontier[0][-1] if frontier else initial_node)
+            best_assignments = incumbent.get_path()
+            upper_bound = incumbent.makespan
+        
+        # Proven bound: the optimum lies in the incumbent or below some open node
+        open_bounds = [entry[3] for entry in frontier] if self.visualization_data["stop_reason"] else []
+        lower_bound = min([self.cutoff(upper_bound)] + open_bounds)
+        self.visualization_data["lower_bound"] = lower_bound
+        self.visualization_data["gap"] = (upper_bound - lower_bound) / upper_bound if upper_bound else 0.0
+        
+        self.record_search_stats(states, start_time)
+        self.visualization_data["solution_path"] = best_assignments
+        return self.format_assignments(best_assignments)
 
-# Alias for backward compatibility
-OptimizedScheduler = AStarScheduler
+class DispatchScheduler(Scheduler):
+    """
+    List scheduler driven by a dispatch rule, O(n log n) overall.
+
+    Each machine keeps a heap of its released jobs keyed by the rule and always
+    starts the best one as soon as it is free (jumping ahead to the next
+    release when nothing is ready). Used on its own for very large batches and
+    as the initial upper bound / warm start for the exact schedulers.
+    """
+    RULES = {
+        "spt": lambda p, w, r: p,        # Shortest processing time first
+        "lpt": lambda p, w, r: -p,       # Longest processing time first
+        "wspt": lambda p, w, r: p / w,   # Priority-weighted shortest processing time
+        "erd": lambda p, w, r: r,        # Earliest release date first
+    }
+
+    def __init__(self, jobs, machines, rule="wspt", **options):
+        super().__init__(jobs, machines, **options)
+        if rule not in self.RULES:
+            raise ValueError(f"Unknown dispatch rule '{rule}', expected one of {sorted(self.RULES)}")
+        self.rule = rule
+        self.algorithm_name = f"Dispatch Rule ({rule.upper()})"
+        self.visualization_data["algorithm_name"] = self.algorithm_name
+
+    def dispatch(self):
+        """Build the schedule; returns ((op_idx, start_time, machine_idx) list, makespan)"""
+        if self.problem.has_precedence or self.problem.flexible:
+            return self.dispatch_operations()
+        key = self.RULES[self.rule]
+        by_machine = [[] for _ in self.machines]
+        problem = self.problem
+        for op_idx in range(problem.num_ops):  # One operation per job
+            by_machine[problem.machine_indices[op_idx]].append((problem.release_times[op_idx], op_idx,
+                                                                problem.processing_times[op_idx],
+                                                                max(problem.priorities[op_idx], 1)))
+
+        assignments = []
+        makespan = 0
+        for machine_idx, pending in enumerate(by_machine):
+            pending.sort()
+            ready = []
+            current_time = 0
+            i = 0
+            while i < len(pending) or ready:
+                # Move every job released by now into the ready heap
+                while i < len(pending) and pending[i][0] <= current_time:
+                    release_time, job_idx, processing_time, priority = pending[i]
+                    heapq.heappush(ready, (key(processing_time, priority, release_time), job_idx, processing_time))
+                    i += 1
+                if not ready:
+                    current_time = pending[i][0]
+                    continue
+                _, job_idx, processing_time = heapq.heappop(ready)
+                assignments.append((job_idx, current_time, machine_idx))
+                current_time += processing_time
+            makespan = max(makespan, current_time)
+        return assignments, makespan
+
+    def dispatch_operations(self):
+        """
+        Serial list scheduling for multi-operation and flexible jobs, O(n log n).
+
+        Operations are taken in order of the time they become ready (their
+        job's release, or the end of the job's previous operation), ties broken
+        by the rule, and each is appended to the eligible machine where it
+        finishes first. With every job ready at once and flexible machines this
+        is the classic list scheduling for parallel machines (LPT with "lpt").
+        """
+        problem = self.problem
+        key = self.RULES[self.rule]
+        machine_times = [0] * problem.num_machines
+
+        def entry(op_idx, ready_time):
+            priority = max(problem.priorities[op_idx], 1)
+            return (ready_time, key(problem.processing_times[op_idx], priority, problem.release_times[op_idx]), op_idx)
+
+        ready = [entry(op_idx, problem.release_times[op_idx]) for op_idx in problem.job_first_op]
+        heapq.heapify(ready)
+        assignments = []
+        makespan = 0
+        while ready:
+            ready_time, _, op_idx = heapq.heappop(ready)
+            machine_idx, processing_time = min(
+                problem.alternatives(op_idx), key=lambda alt: max(machine_times[alt[0]], ready_time) + alt[1])
+            start_time = max(machine_times[machine_idx], ready_time)
+            end_time = start_time + processing_time
+            assignments.append((op_idx, start_time, machine_idx))
+            machine_times[machine_idx] = end_time
+            makespan = max(makespan, end_time)
+            if not problem.op_last[op_idx]:
+                heapq.heappush(ready, entry(op_idx + 1, end_time))
+        return assignments, makespan
 
-class OptimizedScheduler:
-    """Advanced scheduler using Google OR-Tools CP-SAT solver"""
-    
-    def __init__(self, jobs, machines):
-        self.jobs = jobs
-        self.machines = machines
-        
     def schedule_jobs(self):
-        # Create the model
-        model = cp_model.CpModel()
-        
-        # Define variables
-        all_jobs = range(len(self.jobs))
-        all_machines = range(len(self.machines))
-        
-        # Maximum possible horizon (sum of all processing times)
-        horizon = sum(job.processing_time for job in self.jobs)
-        
-        # Create job start variables for each machine
-        starts = {}
-        ends = {}
-        intervals = {}
-        
-        # Create job intervals and add machine constraints
-        for j in all_jobs:
-            job = self.jobs[j]
-            for m in all_machines:
-                machine = self.machines[m]
-                
-                # If job can be processed on this machine
-                if job.machine_id == machine.machine_id:
-                    suffix = f'_{j}_{m}'
-                    starts[(j, m)] = model.NewIntVar(0, horizon, f'start{suffix}')
-                    ends[(j, m)] = model.NewIntVar(0, horizon, f'end{suffix}')
-                    intervals[(j, m)] = model.NewIntervalVar(
-                        starts[(j, m)], 
-                        job.processing_time, 
-                        ends[(j, m)], 
-                        f'interval{suffix}'
-                    )
-        
-        # Add no-overlap constraints for machines
-        for m in all_machines:
-            machine_intervals = []
-            for j in all_jobs:
-                job = self.jobs[j]
-                if (j, m) in intervals and job.machine_id == self.machines[m].machine_id:
-                    machine_intervals.append(intervals[(j, m)])
-            model.AddNoOverlap(machine_intervals)
-        
-        # Objective function: Minimize makespan (maximum end time)
-        makespan = model.NewIntVar(0, horizon, 'makespan')
-        for j in all_jobs:
-            for m in all_machines:
-                if (j, m) in ends:
-                    model.Add(ends[(j, m)] <= makespan)
-        
-        model.Minimize(makespan)
-        
-        # Solve
-        solver = cp_model.CpSolver()
-        status = solver.Solve(model)
-        
-        schedule = []
-        if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
-            for j in all_jobs:
-                job = self.jobs[j]
-                for m in all_machines:
-                    if (j, m) in starts and job.machine_id == self.machines[m].machine_id:
-                        start_time = solver.Value(starts[(j, m)])
-                        end_time = solver.Value(ends[(j, m)])
-                        job.start_time = start_time
-                        job.end_time = end_time
-                        schedule.append((job.job_id, start_time, end_time, self.machines[m].machine_id))
-        
-        # Sort the schedule by start time for better visualization
-        schedule.sort(key=lambda x: x[1])
-        return schedule
\ No newline at end of file
+        """Schedule all jobs with the dispatch rule"""
+        start_time = time.time()
+        self.telemetry.reset()
+        assignments, makespan = self.dispatch()
+        self.telemetry.nodes_expanded = len(assignments)
+        self.telemetry.export(self.visualization_data)
+        self.visualization_data["solution_path"] = assignments
+        self.visualization_data["execution_time"] = time.time() - start_time
+        return self.format_assignments(assignments)
+
+
+def __getattr__(name):
+    """The CP-SAT scheduler moved to cpsat.py, which imports OR-Tools; load it only when asked for"""
+    if name in ("OptimizedScheduler", "SolutionReporter"):
+        import cpsat
+        return getattr(cpsat, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
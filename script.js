@@ -131,12 +131,12 @@ function handleFormSubmit(event) {
     ganttChart.innerHTML = '<div class="loading">Generating visualization...</div>';
     
     // Display API URL being used (for debugging)
-    console.log(`Connecting to backend at: ${API_BASE_URL}/schedule`);
+    console.log(`Connecting to backend at: ${API_BASE_URL}/schedule/stream`);
     
-    // Send job data to backend
-    fetch(`${API_BASE_URL}/schedule`, {
+    // Send job data to backend; progress events arrive as NDJSON lines while it solves
+    fetch(`${API_BASE_URL}/schedule/stream`, {
         method: "POST",
-        headers: { "Content-Type": "application/json" },
+        headers: { "Content-Type": "application/json", "Accept": "application/x-ndjson" },
         body: JSON.stringify({ 
             jobs,
             numMachines,
@@ -147,7 +147,7 @@ function handleFormSubmit(event) {
         if (!response.ok) {
             throw new Error(`Server responded with status: ${response.status}`);
         }
-        return response.json();
+        return readEvents(response, event => showProgress(schedulerType, event));
     })
     .then(data => {
         lastScheduleData = data;
@@ -181,6 +181,38 @@ function handleFormSubmit(event) {
     });
 }
 
+// Read an NDJSON event stream, passing progress events to onProgress; resolves with the result
+async function readEvents(response, onProgress) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = "";
+    while (true) {
+        const { done, value } = await reader.read();
+        if (done) {
+            throw new Error("The stream ended before the schedule was ready");
+        }
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split("\n");
+        buffer = lines.pop();
+        for (const line of lines) {
+            if (!line) continue;
+            const event = JSON.parse(line);
+            if (event.event === "result") return event.result;
+            if (event.event === "error") throw new Error(event.error);
+            if (event.event !== "heartbeat") onProgress(event);
+        }
+    }
+}
+
+// Show the running search's progress in place of the loading message
+function showProgress(schedulerType, event) {
+    const parts = [`${event.nodesExpanded ?? 0} nodes`];
+    if (event.bestMakespan != null) parts.push(`best makespan ${event.bestMakespan}`);
+    if (event.lowerBound != null) parts.push(`bound ${event.lowerBound}`);
+    if (event.gap != null) parts.push(`gap ${(event.gap * 100).toFixed(1)}%`);
+    scheduleOutput.innerHTML = `<div class="loading">Running ${schedulerType.toUpperCase()} algorithm... ${parts.join(", ")}</div>`;
+}
+
 // Generate input fields for jobs
 function generateJobInputs() {
     const numJobs = parseInt(document.getElementById("num-jobs").value);
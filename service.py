@@ -0,0 +1,172 @@
+"""
+Request handling shared by the Flask routes and the solver worker processes.
+Everything here works on plain request dicts so it can run in any process.
+"""
+import importlib
+import time
+from functools import partial
+
+from job import Job, Operation
+from instance import Instance, operation_times, as_instance
+from scheduler import ScheduleNode
+from bounds import LowerBounds
+from decomposition import DecomposedScheduler
+
+# schedulerType -> (module, class). Engines are imported on first use, so a process
+# only pays for the ones it runs; OR-Tools alone takes about a quarter of a second.
+SCHEDULERS = {
+    "gbfs": ("scheduler", "GBFSScheduler"),
+    "astar": ("scheduler", "AStarScheduler"),
+    "dispatch": ("scheduler", "DispatchScheduler"),
+    "beam": ("bounded_search", "BeamScheduler"),
+    "idastar": ("bounded_search", "IDAStarScheduler"),
+    "smastar": ("bounded_search", "SMAStarScheduler"),
+    "lns": ("local_search", "LocalSearchScheduler"),
+    "portfolio": ("portfolio", "PortfolioScheduler"),
+    "cpsat": ("cpsat", "OptimizedScheduler"),
+}
+
+# SMA* below the memory A* needs can regenerate subtrees for exponentially long; it runs
+# for at most this many seconds unless the request sets maxSeconds
+SMASTAR_MAX_SECONDS = 60.0
+
+# Schedulers that always get the whole instance; the tree searches (GBFS, the default, A*, beam,
+# IDA*, SMA*) solve its independent parts separately unless "decompose" is false
+WHOLE_INSTANCE_TYPES = ("dispatch", "lns", "portfolio", "cpsat")
+
+
+def parse_operation(op_data):
+    """Build an Operation from one operation of a request (see instance.operation_times)"""
+    return Operation(operation_times(op_data))
+
+
+def parse_job(job_data):
+    """
+    Build a Job from one entry of a request's "jobs" list. A job is either a
+    single operation (machine/machines/alternatives and processingTime on the
+    job itself) or an ordered "operations" list.
+    """
+    job_id = job_data.get("jobId")
+    priority = int(job_data.get("priority", 1))  # Default priority to 1 if not provided
+    release_time = int(job_data.get("releaseTime", 0))
+    operations = [parse_operation(op_data) for op_data in job_data.get("operations") or [job_data]]
+    return Job(job_id, priority=priority, release_time=release_time, operations=operations)
+
+
+def parse_instance(data):
+    """Build the read-only Instance of a /schedule request body and its machines"""
+    instance = Instance.from_request(data)
+    return instance, instance.machines
+
+
+def parse_options(data):
+    """Search budgets and telemetry settings from the request body; absent budgets mean unlimited"""
+    options = {}
+    if data.get("maxNodes") is not None:
+        options["max_nodes"] = int(data["maxNodes"])
+    if data.get("maxSeconds") is not None:
+        options["max_seconds"] = float(data["maxSeconds"])
+    if data.get("maxFrontier") is not None:
+        options["max_frontier"] = int(data["maxFrontier"])
+    if data.get("targetGap") is not None:
+        options["target_gap"] = float(data["targetGap"])  # Stop once proven within this relative gap
+    if data.get("telemetry") is not None:
+        options["telemetry"] = data["telemetry"]  # off, summary, sampled or full
+    if data.get("telemetrySamples") is not None:
+        options["telemetry_samples"] = int(data["telemetrySamples"])
+    if data.get("symmetryBreaking") is not None:
+        options["symmetry_breaking"] = bool(data["symmetryBreaking"])  # Search one order of identical jobs
+    return options
+
+
+def scheduler_class(scheduler_type):
+    """Scheduler class of a schedulerType (GBFS for unknown ones), importing its module on first use"""
+    module_name, class_name = SCHEDULERS.get(scheduler_type, SCHEDULERS["gbfs"])
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def create_scheduler(data, jobs, machines, **extra):
+    """Build the scheduler selected by schedulerType; raises ValueError on bad settings"""
+    scheduler_type = data.get("schedulerType", "gbfs")
+    options = parse_options(data)
+    options.update(extra)
+    if scheduler_type == "smastar" and options.get("max_seconds") is None:
+        options["max_seconds"] = SMASTAR_MAX_SECONDS
+
+    if scheduler_type not in WHOLE_INSTANCE_TYPES and data.get("decompose", True) and \
+            len(as_instance(jobs, len(machines)).components()) > 1:
+        # Each component is solved by this same request without decomposition, maybe in worker processes
+        settings = {key: value for key, value in data.items() if key != "jobs"}
+        factory = partial(create_scheduler, dict(settings, decompose=False))
+        return DecomposedScheduler(jobs, machines, factory, workers=int(data.get("decomposeWorkers", 1)), **options)
+
+    engine = scheduler_class(scheduler_type)
+    if scheduler_type == "astar":
+        weight = float(data.get("weight", 1.0))  # > 1 for weighted (bounded-suboptimal) A*
+        return engine(jobs, machines, weight=weight, **options)
+    elif scheduler_type == "beam":
+        return engine(jobs, machines, width=int(data.get("beamWidth", 100)), **options)
+    elif scheduler_type == "idastar":
+        return engine(jobs, machines, table_size=int(data.get("tableSize", 100000)), **options)
+    elif scheduler_type == "smastar":
+        return engine(jobs, machines, memory_limit=int(data.get("memoryLimit", 100000)),
+                      table_size=int(data.get("tableSize", 100000)), **options)
+    elif scheduler_type == "dispatch":
+        return engine(jobs, machines, data.get("dispatchRule", "wspt"), **options)
+    elif scheduler_type == "lns":
+        # Improves initialSchedule (e.g. another run's schedule) or a dispatch-rule schedule
+        return engine(jobs, machines, initial_schedule=data.get("initialSchedule"),
+                      initial_rule=data.get("dispatchRule", "lpt"),
+                      workers=int(data.get("workers", 1)), seed=int(data.get("seed", 0)),
+                      lns=bool(data.get("lns", True)), **options)
+    elif scheduler_type == "portfolio":
+        # Races the engines in separate processes until maxSeconds (default 10) or a proof of optimality
+        num_workers = int(data["numWorkers"]) if data.get("numWorkers") is not None else None
+        if data.get("portfolioEngines"):
+            options["engines"] = data["portfolioEngines"]
+        return engine(jobs, machines, cpsat_workers=num_workers, **options)
+    elif scheduler_type == "cpsat":
+        num_workers = int(data["numWorkers"]) if data.get("numWorkers") is not None else None
+        relative_gap = float(data.get("relativeGap", 0.0))
+        return engine(jobs, machines, num_workers=num_workers, relative_gap=relative_gap, **options)
+    else:  # Default to GBFS
+        return engine(jobs, machines, **options)
+
+
+def instance_lower_bound(jobs, machines, problem=None):
+    """Makespan lower bound that holds for every schedule of the instance"""
+    root = ScheduleNode(jobs, machines, problem=problem)
+    return LowerBounds(root.problem).node_bound(root)
+
+
+def solve(data, jobs=None, machines=None, **extra):
+    """
+    Run the requested scheduler and build the /schedule response body; jobs is
+    an Instance (or a list of Job objects, which get their times written back)
+    """
+    if jobs is None:
+        jobs, machines = parse_instance(data)
+    scheduler = create_scheduler(data, jobs, machines, **extra)
+
+    # Run the scheduler
+    schedule_result = scheduler.schedule_jobs()
+    makespan = scheduler.result.makespan
+
+    # Best proven lower bound: the scheduler's own, or the instance's root bound
+    started = time.perf_counter()
+    lower_bound = max(instance_lower_bound(jobs, machines, scheduler.problem), scheduler.visualization_data.get("lower_bound") or 0)
+    phases = scheduler.visualization_data.setdefault("phases", {})
+    phases["lower_bound"] = phases.get("lower_bound", 0.0) + time.perf_counter() - started
+
+    # Return more comprehensive scheduling information including visualization data
+    return {
+        "schedule": schedule_result,
+        "makespan": makespan,
+        "lowerBound": lower_bound,
+        "gap": (makespan - lower_bound) / makespan if makespan else 0.0,
+        "totalProcessingTime": scheduler.problem.total_work,
+        "numOperations": scheduler.problem.num_ops,
+        "numJobs": len(jobs),
+        "numMachines": len(machines),
+        "visualization": scheduler.visualization_data
+    }
@@ -0,0 +1,398 @@
+"""
+Live schedules for the /sessions endpoints. A session keeps a schedule in memory
+and repairs it in place as jobs arrive or are cancelled, processing times change
+and machines go down, instead of solving the whole instance again.
+"""
+import heapq
+import math
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from service import parse_instance, parse_job, parse_operation, solve
+
+
+class PlannedOperation:
+    """One operation of a session's schedule, linked to its machine and job neighbours"""
+    __slots__ = ("job_id", "index", "release_time", "processing_times", "machine_id", "start", "end",
+                 "prev", "next", "job_prev", "job_next", "placed")
+
+    def __init__(self, job_id, index, release_time, processing_times):
+        self.job_id = job_id
+        self.index = index  # Position within the job
+        self.release_time = release_time
+        self.processing_times = dict(processing_times)  # Eligible machine id -> processing time
+        self.machine_id = None
+        self.start = None
+        self.end = None
+        self.prev = self.next = None  # Neighbours in the machine's sequence
+        self.job_prev = self.job_next = None  # Neighbours in the job's route
+        self.placed = False
+
+    def entry(self):
+        return {"jobId": self.job_id, "operation": self.index, "start": self.start,
+                "end": self.end, "machine": self.machine_id}
+
+
+class ScheduleSession:
+    """
+    A schedule that is repaired incrementally.
+
+    Operations that started before the session time are frozen. Each change
+    removes or re-inserts only the operations it touches, then re-times their
+    machine and job successors until start times stop changing, so the cost of
+    a repair grows with the work it disturbs rather than with the instance.
+    Machine sequences are doubly linked lists so insertion and removal are O(1).
+    """
+    def __init__(self, jobs, num_machines, now=0):
+        self.num_machines = num_machines
+        self.time = now
+        self.version = 0
+        self.jobs = OrderedDict()  # job id -> its PlannedOperations in route order
+        self.num_operations = 0
+        self.heads = {m: None for m in range(1, num_machines + 1)}
+        self.tails = {m: None for m in range(1, num_machines + 1)}
+        self.windows = {m: [] for m in range(1, num_machines + 1)}  # Sorted (start, end) downtimes
+        self.lock = threading.RLock()
+        self.before = {}  # operation -> (start, end, machine) before the current repair
+        self.removed = []
+
+        # Adopt the solved times of each operation, keeping every machine's order
+        by_machine = {m: [] for m in self.heads}
+        for job in jobs:
+            for op, operation in zip(self.add_operations(job), job.operations):
+                op.machine_id, op.start, op.end = operation.machine_id, operation.start_time, operation.end_time
+                by_machine[op.machine_id].append(op)
+        for machine_id, ops in by_machine.items():
+            for op in sorted(ops, key=lambda op: (op.start, op.end)):
+                self.link(op, machine_id, self.tails[machine_id])
+
+    def add_operations(self, job):
+        """Create the unplaced operations of a new job"""
+        if job.job_id in self.jobs:
+            raise ValueError(f"Job {job.job_id} already exists")
+        ops = []
+        for index, operation in enumerate(job.operations):
+            for machine_id in operation.processing_times:
+                if machine_id not in self.heads:
+                    raise ValueError(f"Job {job.job_id} uses machine {machine_id}, "
+                                     f"but there are only {self.num_machines} machines")
+            op = PlannedOperation(job.job_id, index, job.release_time, operation.processing_times)
+            if ops:
+                op.job_prev, ops[-1].job_next = ops[-1], op
+            ops.append(op)
+        self.jobs[job.job_id] = ops
+        self.num_operations += len(ops)
+        return ops
+
+    def operation(self, job_id, index):
+        ops = self.jobs.get(job_id)
+        if ops is None:
+            raise ValueError(f"Unknown job {job_id}")
+        for op in ops:
+            if op.index == index:
+                return op
+        raise ValueError(f"Job {job_id} has no operation {index}")
+
+    def link(self, op, machine_id, prev):
+        """Insert op into machine_id's sequence right after prev (None for the front)"""
+        op.machine_id = machine_id
+        op.prev = prev
+        op.next = prev.next if prev is not None else self.heads[machine_id]
+        if prev is not None:
+            prev.next = op
+        else:
+            self.heads[machine_id] = op
+        if op.next is not None:
+            op.next.prev = op
+        else:
+            self.tails[machine_id] = op
+        op.placed = True
+
+    def unlink(self, op):
+        if op.prev is not None:
+            op.prev.next = op.next
+        else:
+            self.heads[op.machine_id] = op.next
+        if op.next is not None:
+            op.next.prev = op.prev
+        else:
+            self.tails[op.machine_id] = op.prev
+        op.prev = op.next = None
+        op.placed = False
+
+    def touch(self, op):
+        """Remember op's placement before the current repair for the change report"""
+        if op not in self.before:
+            self.before[op] = (op.start, op.end, op.machine_id)
+
+    def ready_time(self, op):
+        """Earliest start allowed by the clock, the release time and the job's previous operation"""
+        if op.job_prev is not None:
+            return max(self.time, op.job_prev.end)
+        return max(self.time, op.release_time)
+
+    def earliest_start(self, machine_id, start, duration):
+        """First start at or after start where the operation avoids the machine's downtime"""
+        for window_start, window_end in self.windows[machine_id]:
+            if start < window_end and start + duration > window_start:
+                start = window_end
+        return start
+
+    def retime(self, seeds):
+        """Shift operations to their earliest start, following successors while times change"""
+        heap = [(op.start, id(op), op) for op in seeds if op is not None and op.placed]
+        heapq.heapify(heap)
+        while heap:
+            _, _, op = heapq.heappop(heap)
+            if not op.placed or op.start < self.time:  # Removed, or already started
+                continue
+            duration = op.end - op.start
+            start = self.ready_time(op)
+            if op.prev is not None:
+                start = max(start, op.prev.end)
+            start = self.earliest_start(op.machine_id, start, duration)
+            if start != op.start:
+                self.touch(op)
+                op.start, op.end = start, start + duration
+                for successor in (op.next, op.job_next):
+                    if successor is not None and successor.placed:
+                        heapq.heappush(heap, (successor.start, id(successor), successor))
+
+    def place(self, op):
+        """
+        Insert an unplaced operation where it finishes earliest. An idle gap that
+        fits it is preferred; otherwise it goes before the first operation that
+        starts after its job's next operation, pushing the operations behind it.
+        """
+        ready = self.ready_time(op)
+        limit = op.job_next.start if op.job_next is not None and op.job_next.placed else math.inf
+        best = None
+        for machine_id, duration in op.processing_times.items():
+            # Gaps that close before ready cannot hold the operation, so start from the back
+            prev = self.tails[machine_id]
+            while prev is not None and (prev.end > ready or prev.start >= limit):
+                prev = prev.prev
+            node = prev.next if prev is not None else self.heads[machine_id]
+            while True:
+                start = self.earliest_start(machine_id, max(ready, prev.end if prev is not None else 0), duration)
+                if node is None or start + duration <= node.start:
+                    candidate = (start + duration, 0, machine_id, start, prev)
+                    break
+                if node.start >= limit:  # Going further would order it after its job's next operation
+                    candidate = (start + duration, 1, machine_id, start, prev)
+                    break
+                prev, node = node, node.next
+            if best is None or candidate[:3] < best[:3]:
+                best = candidate
+        end, _, machine_id, start, prev = best
+        self.touch(op)
+        op.start, op.end = start, end
+        self.link(op, machine_id, prev)
+        self.retime([op.next, op.job_next])
+
+    def reinsert(self, op):
+        """Take an operation out of its machine's sequence and place it again"""
+        old_next = op.next
+        self.touch(op)
+        self.unlink(op)
+        self.place(op)
+        self.retime([old_next])
+
+    def add_job(self, job):
+        for op in self.add_operations(job):
+            self.place(op)
+
+    def remove_job(self, job_id):
+        """Drop a job's operations that have not started; one in progress stops now"""
+        ops = self.jobs.get(job_id)
+        if ops is None:
+            raise ValueError(f"Unknown job {job_id}")
+        kept, seeds = [], []
+        for op in ops:
+            if op.start >= self.time:
+                seeds.append(op.next)
+                self.unlink(op)
+                self.removed.append(op)
+                continue
+            if op.end > self.time:
+                self.touch(op)
+                op.end = self.time
+                seeds.append(op.next)
+            kept.append(op)
+        if kept:
+            kept[-1].job_next = None
+            self.jobs[job_id] = kept
+        else:
+            del self.jobs[job_id]
+        self.num_operations -= len(ops) - len(kept)
+        self.retime(seeds)
+
+    def update_operation(self, job_id, index, processing_times):
+        """Change an operation's processing times; one that has not started is placed again"""
+        op = self.operation(job_id, index)
+        if op.end <= self.time:
+            raise ValueError(f"Operation {index} of job {job_id} has already finished")
+        if op.start < self.time:
+            # In progress: it stays on its machine and only its end moves
+            if op.machine_id not in processing_times:
+                raise ValueError(f"Operation {index} of job {job_id} is already running on machine {op.machine_id}")
+            op.processing_times = dict(processing_times)
+            self.touch(op)
+            op.end = max(self.time, op.start + processing_times[op.machine_id])
+            self.retime([op.next, op.job_next])
+            return
+        for machine_id in processing_times:
+            if machine_id not in self.heads:
+                raise ValueError(f"Machine {machine_id} does not exist")
+        op.processing_times = dict(processing_times)
+        self.reinsert(op)
+
+    def machine_down(self, machine_id, start, end):
+        """Block a machine for [start, end); operations overlapping it that have not started move"""
+        if machine_id not in self.heads:
+            raise ValueError(f"Machine {machine_id} does not exist")
+        if end <= start:
+            raise ValueError("A downtime must end after it starts")
+        windows = self.windows[machine_id]
+        windows.append((start, end))
+        windows.sort()
+
+        displaced = []
+        op = self.tails[machine_id]
+        while op is not None and op.end > start:
+            if op.start >= self.time and op.start < end:
+                displaced.append(op)
+            op = op.prev
+        # One at a time, so the job neighbours of the operation being placed are always placed
+        for op in reversed(displaced):
+            self.reinsert(op)
+
+    def apply(self, changes, now=None):
+        """
+        Advance the clock to now and apply changes in order. Returns the repair
+        report; a change that raises ValueError leaves earlier ones applied.
+        """
+        with self.lock:
+            if now is not None:
+                if now < self.time:
+                    raise ValueError(f"Session time cannot go back from {self.time} to {now}")
+                self.time = now
+            self.before = {}
+            self.removed = []
+            started_at = time.perf_counter()
+            try:
+                for change in changes:
+                    try:
+                        self.apply_change(change)
+                    except KeyError as error:
+                        raise ValueError(f"A {change.get('type')} change needs {error}")
+            finally:
+                self.version += 1
+            return self.report(time.perf_counter() - started_at)
+
+    def apply_change(self, change):
+        change_type = change.get("type")
+        if change_type == "addJob":
+            self.add_job(parse_job(change["job"]))
+        elif change_type == "removeJob":
+            self.remove_job(change["jobId"])
+        elif change_type == "updateOperation":
+            if any(key in change for key in ("machine", "machines", "alternatives")):
+                processing_times = parse_operation(change).processing_times
+            else:  # Same machines, new time
+                op = self.operation(change["jobId"], int(change.get("operation", 0)))
+                processing_time = int(change.get("processingTime", change.get("processing_time")))
+                processing_times = {machine_id: processing_time for machine_id in op.processing_times}
+            self.update_operation(change["jobId"], int(change.get("operation", 0)), processing_times)
+        elif change_type == "machineDown":
+            self.machine_down(int(change["machine"]), int(change.get("start", self.time)), int(change["end"]))
+        else:
+            raise ValueError(f"Unknown change type {change_type!r}")
+
+    def report(self, seconds):
+        changed = [op for op, before in self.before.items()
+                   if op.placed and before != (op.start, op.end, op.machine_id)]
+        machines = {op.machine_id for op in changed}
+        machines.update(self.before[op][2] for op in changed if self.before[op][2] is not None)
+        machines.update(op.machine_id for op in self.removed)
+        return dict(self.summary(), **{
+            "changed": [op.entry() for op in changed],
+            "removed": [{"jobId": op.job_id, "operation": op.index} for op in self.removed],
+            "affectedMachines": sorted(machines),
+            "repairSeconds": seconds,
+        })
+
+    def makespan(self):
+        return max((op.end for op in self.tails.values() if op is not None), default=0)
+
+    def schedule(self):
+        """(job_id, start, end, machine_id) per operation, job by job, as /schedule returns it"""
+        return [(op.job_id, op.start, op.end, op.machine_id) for ops in self.jobs.values() for op in ops]
+
+    def summary(self):
+        return {
+            "time": self.time,
+            "version": self.version,
+            "makespan": self.makespan(),
+            "numJobs": len(self.jobs),
+            "numOperations": self.num_operations,
+        }
+
+
+def create_session(data):
+    """
+    Solve a /schedule request body (with the dispatch scheduler unless another
+    schedulerType is given) and start a session from the result. Returns
+    (session, response body).
+    """
+    data = dict(data)
+    data.setdefault("schedulerType", "dispatch")
+    instance, machines = parse_instance(data)
+    jobs = instance.to_jobs()  # Sessions change their jobs, so they get their own copies
+    result = solve(data, jobs, machines)
+    session = ScheduleSession(jobs, len(machines), now=int(data.get("time", 0)))
+    downtime = [dict(window, type="machineDown") for window in data.get("unavailable", [])]
+    if downtime:
+        session.apply(downtime)
+    response = dict(result, **session.summary(), schedule=session.schedule())
+    response["gap"] = (response["makespan"] - result["lowerBound"]) / response["makespan"] if response["makespan"] else 0.0
+    return session, response
+
+
+class SessionStore:
+    """
+    In-memory sessions of one server process. Beyond max_sessions the least
+    recently used session is dropped, and sessions idle for ttl_seconds expire.
+    """
+    def __init__(self, max_sessions=100, ttl_seconds=3600):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.sessions = OrderedDict()  # id -> (last used, session)
+        self.lock = threading.Lock()
+
+    def add(self, session):
+        with self.lock:
+            session_id = uuid.uuid4().hex
+            self.sessions[session_id] = (time.time(), session)
+            while len(self.sessions) > self.max_sessions:
+                self.sessions.popitem(last=False)
+            return session_id
+
+    def get(self, session_id):
+        with self.lock:
+            entry = self.sessions.get(session_id)
+            if entry is None:
+                return None
+            now = time.time()
+            if now - entry[0] > self.ttl_seconds:
+                del self.sessions[session_id]
+                return None
+            self.sessions[session_id] = (now, entry[1])
+            self.sessions.move_to_end(session_id)
+            return entry[1]
+
+    def delete(self, session_id):
+        with self.lock:
+            return self.sessions.pop(session_id, None) is not None
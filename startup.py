@@ -0,0 +1,49 @@
+"""
+Startup cost: how long the modules of the server take to import, and warming
+up the scheduler engines before a server forks its workers, so that every
+worker starts with them in memory (shared copy-on-write) instead of importing
+them on its first request.
+"""
+import importlib
+import sys
+import time
+
+# The server's import chain in dependency order, heaviest third-party modules first
+APP_MODULES = ("numpy", "flask", "instance", "scheduler", "service", "app")
+
+
+def import_times(modules):
+    """
+    Import modules in turn and return (module, seconds) pairs; each module is
+    charged only for what the ones before it did not already load
+    """
+    timings = []
+    for module in modules:
+        started = time.perf_counter()
+        importlib.import_module(module)
+        timings.append((module, time.perf_counter() - started))
+    return timings
+
+
+def warm_up(scheduler_types=None):
+    """
+    Import the engines of scheduler_types (every schedulerType by default);
+    returns (schedulerType, seconds) pairs like import_times()
+    """
+    import service
+    timings = []
+    for scheduler_type in service.SCHEDULERS if scheduler_types is None else scheduler_types:
+        if scheduler_type not in service.SCHEDULERS:
+            raise ValueError(f"Unknown schedulerType '{scheduler_type}', expected some of {list(service.SCHEDULERS)}")
+        started = time.perf_counter()
+        service.scheduler_class(scheduler_type)
+        timings.append((scheduler_type, time.perf_counter() - started))
+    return timings
+
+
+def report(timings, log=None):
+    """Write timings one per line, slowest first, through log (a print-like function; stderr by default)"""
+    log = log or (lambda line: print(line, file=sys.stderr))
+    for name, seconds in sorted(timings, key=lambda timing: -timing[1]):
+        log(f"startup: {seconds * 1000:8.1f} ms  {name}")
+    log(f"startup: {sum(seconds for _, seconds in timings) * 1000:8.1f} ms  total")
@@ -0,0 +1,80 @@
+"""
+Streaming solves: a /schedule request that reports its progress while it
+runs, as Server-Sent Events or newline-delimited JSON.
+"""
+import json
+import queue
+import threading
+import time
+
+import service
+
+
+def progress_event(progress):
+    """API form of a scheduler progress dict"""
+    return {
+        "event": "incumbent" if progress.get("incumbent") else "progress",
+        "nodesExpanded": progress.get("nodes_expanded"),
+        "frontierSize": progress.get("frontier_size"),
+        "elapsed": progress.get("elapsed"),
+        "bestMakespan": progress.get("best_makespan"),
+        "lowerBound": progress.get("lower_bound"),
+        "gap": progress.get("gap"),
+    }
+
+
+def solve_events(data, instance=None, machines=None, min_interval=0.25, heartbeat=10.0, progress_interval=500):
+    """
+    Solve a /schedule request body in a background thread and yield event dicts:
+    "incumbent" whenever the best makespan improves, "progress" at most every
+    min_interval seconds, "heartbeat" after heartbeat quiet seconds, and finally
+    "result" (the /schedule response) or "error". Closing the generator, as
+    the server does when the client disconnects, cancels the search at its
+    next progress check.
+    """
+    events = queue.Queue()
+    closed = threading.Event()
+
+    def report(progress):
+        events.put(progress_event(progress))
+        return not closed.is_set()
+
+    def run():
+        try:
+            result = service.solve(data, instance, machines, progress_callback=report,
+                                   progress_interval=progress_interval)
+            events.put({"event": "result", "result": result})
+        except Exception as error:  # Reported to the client, whose request it was
+            events.put({"event": "error", "error": f"{type(error).__name__}: {error}"})
+
+    threading.Thread(target=run, daemon=True).start()
+    last_progress = 0.0
+    try:
+        while True:
+            try:
+                event = events.get(timeout=heartbeat)
+            except queue.Empty:
+                yield {"event": "heartbeat"}
+                continue
+            if event["event"] == "progress":
+                now = time.time()
+                if now - last_progress < min_interval:
+                    continue
+                last_progress = now
+            yield event
+            if event["event"] in ("result", "error"):
+                return
+    finally:
+        closed.set()
+
+
+def format_sse(event):
+    """One Server-Sent Events message; heartbeats are comments that keep proxies from timing out"""
+    if event["event"] == "heartbeat":
+        return ": heartbeat\n\n"
+    payload = {key: value for key, value in event.items() if key != "event"}
+    return f"event: {event['event']}\ndata: {json.dumps(payload)}\n\n"
+
+
+def format_ndjson(event):
+    return json.dumps(event) + "\n"
@@ -0,0 +1,110 @@
+import time
+from collections import deque, defaultdict
+from contextlib import contextmanager
+
+
+class SearchTelemetry:
+    """
+    Instrumentation for a scheduler run with a predictable cost.
+
+    Levels:
+    - off: counters only (nodes/sec, frontier peak, duplicate hits, heuristic time share)
+    - summary: counters plus nodes explored per search level
+    - sampled: summary plus the most recent sample_size expanded nodes (ring buffer)
+    - full: summary plus every expanded node (unbounded, for debugging small runs)
+
+    At every level, run time is split into named phases (setup, expand,
+    heuristic, frontier, model_build, solve, ...) measured with the monotonic
+    perf_counter, and schedulers may keep named counters. Both are exported as
+    visualization_data["phases"] and telemetry["counters"]. Each callable in
+    SearchTelemetry.observers is called with the visualization_data of every
+    exported run, e.g. to aggregate metrics.
+    """
+    LEVELS = ("off", "summary", "sampled", "full")
+    observers = []
+
+    def __init__(self, level="sampled", sample_size=500):
+        if level not in self.LEVELS:
+            raise ValueError(f"Unknown telemetry level '{level}', expected one of {list(self.LEVELS)}")
+        self.level = level
+        self.sample_size = sample_size
+        self.by_level = level != "off"
+        self.sampling = level in ("sampled", "full")
+        self.setup_time = 0.0  # Building the search problem, before any run; kept across resets
+        self.reset()
+
+    def reset(self):
+        """Clear all counters before a run"""
+        self.start_time = time.perf_counter()
+        self.nodes_expanded = 0
+        self.frontier_peak = 0
+        self.heuristic_time = 0.0
+        self.samples_seen = 0
+        self.next_report = 0  # Node count at which the next progress report is due
+        self.exploration_by_level = defaultdict(int)
+        self.samples = deque(maxlen=self.sample_size) if self.level == "sampled" else []
+        self.phases = defaultdict(float)  # Phase name -> seconds
+        self.counters = defaultdict(int)
+
+    def node_expanded(self, level):
+        """Count one expanded node at the given search depth"""
+        self.nodes_expanded += 1
+        if self.by_level:
+            self.exploration_by_level[level] += 1
+
+    def sample(self, values):
+        """Keep a sample of an expanded node; callers check self.sampling first"""
+        self.samples_seen += 1
+        self.samples.append(values)
+
+    def frontier_size(self, size):
+        """Track the peak number of open nodes"""
+        if size > self.frontier_peak:
+            self.frontier_peak = size
+
+    def heuristic_timer(self):
+        """Start timing a heuristic evaluation; pass the result to heuristic_done()"""
+        return time.perf_counter()
+
+    def heuristic_done(self, started):
+        self.heuristic_time += time.perf_counter() - started
+
+    @contextmanager
+    def phase(self, name):
+        """Add the time spent in a with block to the named phase"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] += time.perf_counter() - started
+
+    def add_time(self, name, seconds):
+        """Add seconds to the named phase; for hot loops that time themselves with perf_counter()"""
+        self.phases[name] += seconds
+
+    def count(self, name, amount=1):
+        self.counters[name] += amount
+
+    def export(self, visualization_data, states=None):
+        """Write the collected telemetry into a scheduler's visualization_data"""
+        elapsed = time.perf_counter() - self.start_time
+        visualization_data["nodes_expanded"] = self.nodes_expanded
+        visualization_data["heuristic_values"] = list(self.samples)
+        visualization_data["exploration_by_level"] = dict(self.exploration_by_level)
+        visualization_data["telemetry"] = {
+            "level": self.level,
+            "nodes_per_second": self.nodes_expanded / elapsed if elapsed > 0 else 0.0,
+            "frontier_peak": self.frontier_peak,
+            "duplicate_hits": states.duplicates if states is not None else 0,
+            "dominated_hits": states.dominated if states is not None else 0,
+            "heuristic_time_share": self.heuristic_time / elapsed if elapsed > 0 else 0.0,
+            "samples_dropped": self.samples_seen - len(self.samples),
+            "counters": dict(self.counters),
+        }
+        phases = {"setup": self.setup_time}
+        phases.update(self.phases)
+        if self.heuristic_time:
+            phases["heuristic"] = self.heuristic_time
+        visualization_data["phases"] = phases
+        for observer in self.observers:
+            observer(visualization_data)
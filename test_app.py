@@ -4,11 +4,13 @@ This performs a basic integration test by starting the app
 and testing the API endpoints.
 """
 
+import gzip
 import unittest
 import json
+import time
 import os
 import sys
-from app import app
+from app import app, solver_pool
 
 
 class TestJobShopScheduler(unittest.TestCase):
@@ -66,6 +68,302 @@ class TestJobShopScheduler(unittest.TestCase):
         # Validate the number of jobs and machines
         self.assertEqual(data['num_jobs'], len(test_data['jobs']))
 
+    def test_schedule_route_with_budget(self):
+        """Test that search budgets are accepted and reported."""
+        test_data = {
+            "jobs": [
+                {"jobId": 1, "processingTime": 3, "priority": 1, "machine": 1},
+                {"jobId": 2, "processingTime": 2, "priority": 2, "machine": 2},
+                {"jobId": 3, "processingTime": 4, "priority": 1, "machine": 1}
+            ],
+            "numMachines": 2,
+            "schedulerType": "gbfs",
+            "maxNodes": 1
+        }
+
+        response = self.app.post('/schedule',
+                              data=json.dumps(test_data),
+                              content_type='application/json')
+
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertEqual(len(data['schedule']), 3)
+        self.assertEqual(data['visualization']['stop_reason'], 'max_nodes')
+
+        test_data.update({"schedulerType": "astar", "weight": 1.5})
+        response = self.app.post('/schedule',
+                              data=json.dumps(test_data),
+                              content_type='application/json')
+        data = json.loads(response.data)
+        self.assertEqual(data['visualization']['lower_bound'], 7)
+        self.assertEqual(data['visualization']['gap'], 0.0)
+
+    def test_schedule_route_dispatch(self):
+        """Test the dispatch rule scheduler and its rule validation."""
+        test_data = {
+            "jobs": [
+                {"jobId": 1, "processingTime": 3, "priority": 1, "machine": 1},
+                {"jobId": 2, "processingTime": 2, "priority": 2, "machine": 1, "releaseTime": 1}
+            ],
+            "numMachines": 1,
+            "schedulerType": "dispatch",
+            "dispatchRule": "spt"
+        }
+        response = self.app.post('/schedule',
+                              data=json.dumps(test_data),
+                              content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertEqual(data['makespan'], 5)
+        self.assertEqual(data['lowerBound'], 5)
+        self.assertEqual(data['gap'], 0.0)
+
+        test_data["dispatchRule"] = "fifo"
+        response = self.app.post('/schedule',
+                              data=json.dumps(test_data),
+                              content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_schedule_route_response_encoding(self):
+        """Test the fields selector, the columnar layout and gzip compression."""
+        test_data = {
+            "jobs": [{"jobId": i, "processingTime": 1 + i % 4, "machine": 1 + i % 2} for i in range(200)],
+            "numMachines": 2,
+            "schedulerType": "dispatch",
+            "fields": ["schedule", "makespan"],
+            "layout": "columnar",
+            "useCache": False
+        }
+        response = self.app.post('/schedule',
+                              data=json.dumps(test_data),
+                              content_type='application/json',
+                              headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        data = json.loads(gzip.decompress(response.data))
+        self.assertEqual(sorted(data), ['makespan', 'schedule'])
+        self.assertEqual(sorted(data['schedule']['jobId']), list(range(200)))
+        self.assertEqual(max(data['schedule']['end']), data['makespan'])
+
+        test_data["fields"] = ["visualization_data"]
+        response = self.app.post('/schedule',
+                              data=json.dumps(test_data),
+                              content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_schedule_route_profiling_and_metrics(self):
+        """Test X-Profile, Server-Timing and the /metrics counters."""
+        test_data = {
+            "jobs": [{"jobId": i, "operations": [{"machine": 1 + i % 2, "processingTime": 1 + i % 3},
+                                                 {"machine": 2 - i % 2, "processingTime": 1 + i % 4}]}
+                     for i in range(6)],
+            "numMachines": 2,
+            "schedulerType": "gbfs",
+            "useCache": False
+        }
+        app.config['ALLOW_PROFILING'] = False
+        response = self.app.post('/schedule', data=json.dumps(test_data), content_type='application/json',
+                                 headers={'X-Profile': 'sample'})
+        self.assertEqual(response.status_code, 403)
+
+        app.config['ALLOW_PROFILING'] = True
+        try:
+            response = self.app.post('/schedule', data=json.dumps(test_data), content_type='application/json',
+                                     headers={'X-Profile': 'cprofile'})
+        finally:
+            app.config['ALLOW_PROFILING'] = False
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertEqual(data['profile']['mode'], 'cprofile')
+        self.assertTrue(data['profile']['functions'])
+        self.assertIn('expand', data['visualization']['phases'])
+        self.assertIn('solve;dur=', response.headers['Server-Timing'])
+
+        response = self.app.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith('text/plain'))
+        text = response.data.decode()
+        self.assertIn('schedule_request_seconds_count{scheduler="gbfs",size="le100",cache="BYPASS"}', text)
+        self.assertIn('schedule_phase_seconds_total{scheduler="gbfs",phase="expand"}', text)
+        self.assertIn('schedule_search_events_total{event="frontier_pushes"}', text)
+
+    def test_schedule_route_job_shop(self):
+        """Test multi-operation jobs with an operation that may run on either machine."""
+        test_data = {
+            "jobs": [
+                {"jobId": 1, "operations": [{"machine": 1, "processingTime": 3},
+                                            {"machine": 2, "processingTime": 2}]},
+                {"jobId": 2, "operations": [{"machine": 2, "processingTime": 4},
+                                            {"alternatives": [{"machine": 1, "processingTime": 2},
+                                                              {"machine": 2, "processingTime": 1}]}]}
+            ],
+            "numMachines": 2,
+            "schedulerType": "astar",
+            "useCache": False
+        }
+        response = self.app.post('/schedule',
+                              data=json.dumps(test_data),
+                              content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertEqual(data['numOperations'], 4)
+        self.assertEqual(len(data['schedule']), 4)
+        self.assertEqual(data['makespan'], 6)
+        self.assertEqual(data['gap'], 0.0)
+
+        test_data["jobs"][0]["operations"][0]["machine"] = 3
+        response = self.app.post('/schedule',
+                              data=json.dumps(test_data),
+                              content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_schedule_route_local_search(self):
+        """Test improving a previous response's schedule with the local search."""
+        jobs = [{"jobId": i, "processingTime": 3 + i % 4, "machines": [1, 2, 3]} for i in range(1, 13)]
+        test_data = {"jobs": jobs, "numMachines": 3, "schedulerType": "dispatch", "dispatchRule": "spt"}
+        first = json.loads(self.app.post('/schedule', data=json.dumps(test_data),
+                                         content_type='application/json').data)
+        test_data.update(schedulerType="lns", initialSchedule=first["schedule"], maxSeconds=0.5, workers=2)
+        response = self.app.post('/schedule', data=json.dumps(test_data), content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertLessEqual(data['makespan'], first['makespan'])
+        if (os.cpu_count() or 1) > 1:  # Workers are capped at the CPU count
+            self.assertEqual(len(data['visualization']['worker_makespans']), 2)
+        self.assertEqual(data['visualization']['initial_makespan'], first['makespan'])
+
+    def test_session_routes(self):
+        """Test repairing a live schedule through the session endpoints."""
+        test_data = {"jobs": [{"jobId": 1, "processingTime": 4, "machine": 1},
+                              {"jobId": 2, "processingTime": 3, "machines": [1, 2]}], "numMachines": 2}
+        response = self.app.post('/sessions', data=json.dumps(test_data), content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        session_id = json.loads(response.data)['id']
+        changes = {"time": 1, "changes": [{"type": "addJob", "job": {"jobId": 3, "processingTime": 2, "machine": 2}},
+                                          {"type": "machineDown", "machine": 1, "start": 4, "end": 6}]}
+        response = self.app.post(f'/sessions/{session_id}/changes', data=json.dumps(changes),
+                                 content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertEqual(data['time'], 1)
+        self.assertEqual(data['numJobs'], 3)
+        # Job 3 takes the idle machine 2; job 1 waits on machine 1 until the downtime ends
+        self.assertIn({"jobId": 3, "operation": 0, "start": 1, "end": 3, "machine": 2}, data['changed'])
+        self.assertIn({"jobId": 1, "operation": 0, "start": 6, "end": 10, "machine": 1}, data['changed'])
+        self.assertEqual(data['affectedMachines'], [1, 2])
+        schedule = json.loads(self.app.get(f'/sessions/{session_id}').data)['schedule']
+        self.assertEqual(len(schedule), 3)
+        bad = {"changes": [{"type": "removeJob", "jobId": 9}]}
+        response = self.app.post(f'/sessions/{session_id}/changes', data=json.dumps(bad), content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.app.delete(f'/sessions/{session_id}').status_code, 200)
+        self.assertEqual(self.app.get(f'/sessions/{session_id}').status_code, 404)
+
+    def test_schedule_stream_route(self):
+        """Test streaming a solve's progress as Server-Sent Events and NDJSON."""
+        test_data = {"jobs": [{"jobId": i + 1, "processingTime": 2 + i % 4, "machine": 1 + i % 2} for i in range(6)],
+                     "numMachines": 2, "schedulerType": "cpsat"}
+        response = self.app.post('/schedule/stream', data=json.dumps(test_data), content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'text/event-stream')
+        messages = [dict(line.split(': ', 1) for line in block.splitlines())
+                    for block in response.data.decode().strip().split('\n\n')]
+        self.assertIn('incumbent', [message['event'] for message in messages])
+        self.assertEqual(messages[-1]['event'], 'result')
+        self.assertEqual(json.loads(messages[-1]['data'])['result']['makespan'], 11)
+
+        response = self.app.post('/schedule/stream', data=json.dumps(test_data), content_type='application/json',
+                                 headers={'Accept': 'application/x-ndjson'})
+        events = [json.loads(line) for line in response.data.decode().splitlines()]
+        self.assertEqual(events[-1]['result']['makespan'], 11)
+        bad = dict(test_data, numMachines=1)
+        response = self.app.post('/schedule/stream', data=json.dumps(bad), content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_schedule_route_cache(self):
+        """Test that a permuted resubmission is served from the cache."""
+        jobs = [
+            {"jobId": 1, "processingTime": 3, "priority": 1, "machine": 1},
+            {"jobId": 2, "processingTime": 5, "priority": 1, "machine": 2}
+        ]
+        test_data = {"jobs": jobs, "numMachines": 2, "schedulerType": "dispatch", "dispatchRule": "lpt"}
+        first = self.app.post('/schedule', data=json.dumps(test_data), content_type='application/json')
+        test_data["jobs"] = [dict(jobs[1], jobId=7), dict(jobs[0], jobId=8)]
+        second = self.app.post('/schedule', data=json.dumps(test_data), content_type='application/json')
+        self.assertEqual(second.headers['X-Cache'], 'HIT')
+        schedule = {entry[0]: entry for entry in json.loads(second.data)['schedule']}
+        self.assertEqual(schedule[7], [7, 0, 5, 2])
+        self.assertEqual(schedule[8], [8, 0, 3, 1])
+
+        stats = json.loads(self.app.get('/cache/stats').data)
+        self.assertGreaterEqual(stats['hits'], 1)
+
+    def test_async_job_submission(self):
+        """Test submitting a job, polling it and the synchronous fast path."""
+        test_data = {
+            "jobs": [
+                {"jobId": 1, "processingTime": 3, "priority": 1, "machine": 1},
+                {"jobId": 2, "processingTime": 2, "priority": 2, "machine": 2}
+            ],
+            "numMachines": 2,
+            "schedulerType": "astar"
+        }
+        response = self.app.post('/jobs', data=json.dumps(test_data), content_type='application/json')
+        self.assertEqual(response.status_code, 202)
+        task_id = json.loads(response.data)['id']
+        try:
+            for _ in range(100):
+                status = json.loads(self.app.get(f'/jobs/{task_id}').data)
+                if status['status'] not in ('queued', 'running'):
+                    break
+                time.sleep(0.1)
+            self.assertEqual(status['status'], 'done')
+            self.assertEqual(status['result']['makespan'], 3)
+        finally:
+            solver_pool.shutdown()
+
+        test_data["schedulerType"] = "dispatch"
+        response = self.app.post('/jobs', data=json.dumps(test_data), content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data)['status'], 'done')
+
+        self.assertEqual(self.app.get('/jobs/unknown').status_code, 404)
+
+    def test_schedule_batch_route(self):
+        """Test that a batch streams one NDJSON line per instance, failures included."""
+        instance = {
+            "jobs": [
+                {"jobId": 1, "processingTime": 3, "priority": 1, "machine": 1},
+                {"jobId": 2, "processingTime": 2, "priority": 2, "machine": 2}
+            ],
+            "numMachines": 2
+        }
+        test_data = {
+            "instances": [instance, {"jobs": [{"jobId": 1}]}, dict(instance, numMachines=3)],
+            "defaults": {"schedulerType": "dispatch"}
+        }
+        try:
+            response = self.app.post('/schedule/batch', data=json.dumps(test_data),
+                                     content_type='application/json')
+            self.assertEqual(response.status_code, 200)
+            lines = {line['index']: line for line in map(json.loads, response.data.decode().splitlines())}
+
+            # Batch chunks share the /jobs admission limit
+            max_pending, solver_pool.max_pending = solver_pool.max_pending, 0
+            try:
+                response = self.app.post('/schedule/batch', data=json.dumps(test_data),
+                                         content_type='application/json')
+            finally:
+                solver_pool.max_pending = max_pending
+            self.assertEqual(response.status_code, 503)
+        finally:
+            solver_pool.shutdown()
+
+        self.assertEqual(sorted(lines), [0, 1, 2])
+        self.assertEqual(lines[0]['result']['makespan'], 3)
+        self.assertIn('error', lines[1])
+        self.assertEqual(lines[2]['result']['numMachines'], 3)
+
 
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
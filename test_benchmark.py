@@ -0,0 +1,47 @@
+import os
+import tempfile
+import unittest
+from benchmark import generate_instance, load_instance, run_benchmark, compare
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_generated_instances_are_reproducible(self):
+        first = generate_instance(20, 3, "bimodal", seed=1)
+        self.assertEqual(first, generate_instance(20, 3, "bimodal", seed=1))
+        self.assertNotEqual(first["jobs"], generate_instance(20, 3, "bimodal", seed=2)["jobs"])
+        self.assertTrue(all(1 <= job["machine"] <= 3 for job in first["jobs"]))
+
+    def test_load_orlib_instance(self):
+        path = os.path.join(tempfile.mkdtemp(), "tiny.txt")
+        with open(path, "w") as handle:
+            handle.write("# two jobs\n2 2\n0 5\n1 3\n")
+        data = load_instance(path)
+        self.assertEqual(data["numMachines"], 2)
+        self.assertEqual([(job["machine"], job["processingTime"]) for job in data["jobs"]], [(1, 5), (2, 3)])
+
+        with open(path, "w") as handle:
+            handle.write("2 2\n0 5 1 2\n1 3 0 4\n")
+        data = load_instance(path)
+        self.assertEqual([(op["machine"], op["processingTime"]) for op in data["jobs"][1]["operations"]],
+                         [(2, 3), (1, 4)])
+        record = run_benchmark([data], engines=["astar"], measure_memory=False)[0]
+        self.assertTrue(record["complete"])
+        self.assertEqual(record["numOperations"], 4)
+
+    def test_results_and_regression_check(self):
+        results = run_benchmark([generate_instance(6, 2)], engines=["astar", "dispatch"], measure_memory=True)
+        self.assertEqual(len(results), 2)
+        for record in results:
+            self.assertTrue(record["complete"])
+            self.assertEqual(record["gap"], 0.0)
+            self.assertGreater(record["peakMemory"], 0)
+        self.assertEqual(compare(results, results), [])
+
+        slower = [dict(record, wallTime=record["wallTime"] + 1.0) for record in results]
+        worse = [dict(record, makespan=record["makespan"] + 1) for record in results]
+        self.assertEqual(len(compare(slower, results)), 2)
+        self.assertEqual(len(compare(worse, results)), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import random
+import unittest
+from job import Job, Operation
+from machine import Machine
+from scheduler import AStarScheduler, GBFSScheduler
+from bounded_search import BeamScheduler, IDAStarScheduler, SMAStarScheduler
+import service
+
+
+def job_shop(seed, num_jobs=4, num_machines=3):
+    rng = random.Random(seed)
+    return [Job(i + 1, operations=[Operation({m: rng.randint(1, 9)})
+                                   for m in rng.sample(range(1, num_machines + 1), num_machines)])
+            for i in range(num_jobs)]
+
+
+def flexible_shop(seed, num_jobs=4, num_machines=3):
+    rng = random.Random(seed)
+    return [Job(i + 1, operations=[Operation({m: rng.randint(1, 9)
+                                              for m in rng.sample(range(1, num_machines + 1), rng.randint(1, 2))})
+                                   for _ in range(num_machines)])
+            for i in range(num_jobs)]
+
+
+class TestBoundedSearch(unittest.TestCase):
+    def setUp(self):
+        self.machines = [Machine(i + 1) for i in range(3)]
+
+    def makespan(self, schedule):
+        return max(end for _, _, end, _ in schedule)
+
+    def test_ida_and_sma_find_the_optimum(self):
+        for seed in range(3):
+            jobs = job_shop(seed)
+            optimum = self.makespan(AStarScheduler(jobs, self.machines, seed_rule=None).schedule_jobs())
+            for scheduler in (IDAStarScheduler(jobs, self.machines, seed_rule=None, table_size=50),
+                              SMAStarScheduler(jobs, self.machines, seed_rule=None, memory_limit=60)):
+                schedule = scheduler.schedule_jobs()
+                self.assertEqual(len(schedule), 12)
+                self.assertEqual(self.makespan(schedule), optimum)
+                self.assertEqual(scheduler.visualization_data["lower_bound"], optimum)
+
+    def test_sma_with_little_memory_stays_optimal(self):
+        # 16 open leaves is far below branching (4) times operations (12): subtrees get dropped and regenerated
+        jobs = flexible_shop(2)
+        optimum = self.makespan(AStarScheduler(jobs, self.machines, seed_rule=None).schedule_jobs())
+        sma = SMAStarScheduler(jobs, self.machines, seed_rule=None, memory_limit=16)
+        self.assertEqual(self.makespan(sma.schedule_jobs()), optimum)
+        self.assertGreater(sma.visualization_data["nodes_dropped"], 0)
+        self.assertEqual(sma.visualization_data["lower_bound"], optimum)
+        # Out of budget, the bound still covers the dropped subtrees
+        for seed in range(4):
+            jobs = flexible_shop(seed)
+            optimum = self.makespan(AStarScheduler(jobs, self.machines, seed_rule=None).schedule_jobs())
+            sma = SMAStarScheduler(jobs, self.machines, seed_rule=None, memory_limit=13, max_nodes=500)
+            makespan = self.makespan(sma.schedule_jobs())
+            self.assertLessEqual(sma.visualization_data["lower_bound"], optimum)
+            if sma.visualization_data["gap"] == 0:
+                self.assertEqual(makespan, optimum)
+
+    def test_memory_stays_within_the_limits(self):
+        jobs = job_shop(1, num_jobs=5)
+        branching = 5  # One available operation per job
+        sma = SMAStarScheduler(jobs, self.machines, memory_limit=40, seed_rule=None, max_nodes=2000)
+        sma.schedule_jobs()
+        self.assertLessEqual(sma.visualization_data["telemetry"]["frontier_peak"], 40 + branching)
+        beam = BeamScheduler(jobs, self.machines, width=4)
+        self.assertEqual(len(beam.schedule_jobs()), 15)
+        self.assertLessEqual(beam.visualization_data["telemetry"]["frontier_peak"], 4 * branching)
+        ida = IDAStarScheduler(jobs, self.machines, table_size=100, max_nodes=2000)
+        ida.schedule_jobs()
+        self.assertLessEqual(ida.visualization_data["table_size"], 100)
+        self.assertLessEqual(ida.visualization_data["telemetry"]["frontier_peak"], 15 * branching)
+
+    def test_beam_is_as_good_as_gbfs_with_less_memory(self):
+        rng = random.Random(2)
+        jobs = [Job(i + 1, rng.randint(1, 20), 1, rng.randint(1, 3)) for i in range(12)]
+        gbfs = GBFSScheduler(jobs, self.machines)
+        gbfs_makespan = self.makespan(gbfs.schedule_jobs())
+        beam = BeamScheduler(jobs, self.machines, width=10)
+        self.assertLessEqual(self.makespan(beam.schedule_jobs()), gbfs_makespan)
+        self.assertLess(beam.visualization_data["telemetry"]["frontier_peak"],
+                        gbfs.visualization_data["telemetry"]["frontier_peak"])
+
+    def test_budget_returns_incumbent_with_bound(self):
+        jobs = job_shop(4, num_jobs=6)
+        scheduler = IDAStarScheduler(jobs, self.machines, max_nodes=50)
+        makespan = self.makespan(scheduler.schedule_jobs())
+        data = scheduler.visualization_data
+        self.assertEqual(data["stop_reason"], "max_nodes")
+        self.assertLessEqual(data["lower_bound"], makespan)
+
+    def test_invalid_limits(self):
+        with self.assertRaises(ValueError):
+            BeamScheduler(job_shop(0), self.machines, width=0)
+        with self.assertRaises(ValueError):
+            SMAStarScheduler(job_shop(0), self.machines, memory_limit=12)  # Twelve operations deep
+        data = {"jobs": [{"jobId": i, "processingTime": 2, "machines": [1, 2]} for i in range(3)],
+                "numMachines": 2, "schedulerType": "smastar", "memoryLimit": 2}
+        instance, machines = service.parse_instance(data)
+        with self.assertRaises(ValueError):
+            service.create_scheduler(data, instance, machines)
+        scheduler = service.create_scheduler(dict(data, memoryLimit=4), instance, machines)
+        self.assertEqual(scheduler.max_seconds, service.SMASTAR_MAX_SECONDS)
+
+
+if __name__ == '__main__':
+    unittest.main()
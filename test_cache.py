@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+from job import Job, Operation
+from cache import ScheduleCache
+from instance import Instance
+
+
+def instance(*jobs):
+    return Instance.from_jobs(jobs, 2)
+
+
+def sample_response(jobs):
+    job_ids = jobs.job_ids.tolist()
+    return {
+        "schedule": [(job_ids[0], 0, 3, 1), (job_ids[1], 0, 2, 2)],
+        "makespan": 3,
+        "visualization": {"solution_path": [(0, 0, 0), (1, 0, 1)]}
+    }
+
+
+class TestScheduleCache(unittest.TestCase):
+    def test_permuted_jobs_share_a_fingerprint(self):
+        cache = ScheduleCache()
+        jobs = instance(Job(1, 3, 1, 1), Job(2, 2, 1, 2))
+        permuted = instance(Job("b", 2, 1, 2), Job("a", 3, 1, 1))
+        key, order = cache.fingerprint(jobs, {"schedulerType": "gbfs"})
+        permuted_key, permuted_order = cache.fingerprint(permuted, {"schedulerType": "gbfs"})
+        self.assertEqual(key, permuted_key)
+        self.assertNotEqual(key, cache.fingerprint(jobs, {"schedulerType": "astar"})[0])
+
+        cache.put(key, cache.canonicalize(sample_response(jobs), jobs, order))
+        restored = cache.restore(cache.get(permuted_key), permuted, permuted_order)
+        self.assertEqual([tuple(entry) for entry in restored["schedule"]], [("a", 0, 3, 1), ("b", 0, 2, 2)])
+        self.assertEqual([tuple(step) for step in restored["visualization"]["solution_path"]],
+                         [(1, 0, 0), (0, 0, 1)])
+
+    def test_operation_routes_are_part_of_the_fingerprint(self):
+        cache = ScheduleCache()
+        forward = instance(Job(1, operations=[Operation({1: 3}), Operation({2: 2})]))
+        backward = instance(Job(1, operations=[Operation({2: 2}), Operation({1: 3})]))
+        self.assertNotEqual(cache.fingerprint(forward, {})[0], cache.fingerprint(backward, {})[0])
+
+    def test_duplicate_ids_are_not_cached(self):
+        cache = ScheduleCache()
+        key, _ = cache.fingerprint(instance(Job(1, 3, 1, 1), Job(1, 2, 1, 2)), {})
+        self.assertIsNone(key)
+
+    def test_lru_eviction_and_ttl(self):
+        cache = ScheduleCache(max_entries=2)
+        for key in ("a", "b", "c"):
+            cache.put(key, key)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("c"), "c")
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["evictions"]), (1, 1, 1))
+
+        expired = ScheduleCache(ttl_seconds=-1)
+        expired.put("a", "a")
+        self.assertIsNone(expired.get("a"))
+        self.assertEqual(expired.stats()["expirations"], 1)
+
+    def test_sqlite_backend_survives_restart(self):
+        path = os.path.join(tempfile.mkdtemp(), "cache.db")
+        ScheduleCache(path=path).put("key", "payload")
+        self.assertEqual(ScheduleCache(path=path).get("key"), "payload")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import os
+import unittest
+from instance import Instance
+from scheduler import AStarScheduler, GBFSScheduler
+import service
+
+
+class TestDecomposition(unittest.TestCase):
+    def setUp(self):
+        # Machines 1 and 2 share the two-operation jobs; machine 3 is on its own
+        self.data = {"jobs": [{"jobId": i, "machine": 1 + i % 3, "processingTime": 2 + i % 2} for i in range(9)] + [
+            {"jobId": 100 + i, "operations": [{"machine": 1, "processingTime": 2}, {"machine": 2, "processingTime": 3}]}
+            for i in range(2)], "numMachines": 3}
+        self.instance = Instance.from_request(self.data)
+
+    def test_symmetry_breaking_keeps_the_optimum(self):
+        plain = AStarScheduler(self.instance, self.instance.machines, seed_rule=None, symmetry_breaking=False)
+        ordered = AStarScheduler(self.instance, self.instance.machines, seed_rule=None)
+        plain.schedule_jobs()
+        ordered.schedule_jobs()
+        self.assertEqual(ordered.result.makespan, plain.result.makespan)
+        self.assertEqual(ordered.visualization_data["ordered_jobs"], 4)
+        self.assertLess(ordered.visualization_data["nodes_expanded"], plain.visualization_data["nodes_expanded"])
+
+        plain = GBFSScheduler(self.instance, self.instance.machines, symmetry_breaking=False)
+        ordered = GBFSScheduler(self.instance, self.instance.machines)
+        plain.schedule_jobs()
+        ordered.schedule_jobs()
+        self.assertLess(ordered.visualization_data["nodes_expanded"], plain.visualization_data["nodes_expanded"] / 3)
+
+    def test_components_are_solved_separately(self):
+        whole = service.solve(dict(self.data, schedulerType="astar", decompose=False))
+        split = service.solve(dict(self.data, schedulerType="astar"))
+        self.assertEqual(split["makespan"], whole["makespan"])
+        self.assertEqual(len(split["schedule"]), 13)
+        components = split["visualization"]["components"]
+        self.assertEqual([component["machines"] for component in components], [[1, 2], [3]])
+        parallel = service.solve(dict(self.data, schedulerType="astar", decomposeWorkers=2))
+        self.assertEqual(sorted(parallel["schedule"]), sorted(split["schedule"]))
+
+    def test_identical_components_are_solved_once(self):
+        data = {"jobs": [{"jobId": i, "machine": 1 + i % 4, "processingTime": 2 + i // 4} for i in range(12)],
+                "numMachines": 4, "schedulerType": "gbfs", "maxNodes": 100}
+        result = service.solve(data)
+        components = result["visualization"]["components"]
+        self.assertEqual([component["reused"] for component in components], [False, True, True, True])
+        self.assertEqual(result["makespan"], 2 + 3 + 4)
+        self.assertEqual(sorted(start for job_id, start, _, _ in result["schedule"] if job_id % 4 == 3),
+                         sorted(start for job_id, start, _, _ in result["schedule"] if job_id % 4 == 0))
+
+    def test_workers_are_capped_at_the_cpu_count(self):
+        scheduler = service.create_scheduler(dict(self.data, decomposeWorkers=1000), self.instance, self.instance.machines)
+        self.assertEqual(scheduler.workers, os.cpu_count() or 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import gzip
+import json
+import unittest
+import encoding
+from encoding import response_options, shape, choose_encoding, encode
+
+
+class TestEncoding(unittest.TestCase):
+    def setUp(self):
+        self.response = {"schedule": [(1, 0, 3, 1), ("b", 3, 5, 2)], "makespan": 5, "lowerBound": 5,
+                         "visualization": {"exploration_by_level": {0: 1, 1: 2}, "solution_path": [(0, 0, 0)]}}
+
+    def test_fields_and_layout(self):
+        self.assertEqual(response_options({}), (None, "rows"))
+        fields, layout = response_options({"fields": "schedule, makespan", "layout": "columnar"})
+        self.assertEqual(shape(self.response, fields, layout), {
+            "schedule": {"jobId": [1, "b"], "start": [0, 3], "end": [3, 5], "machine": [1, 2]}, "makespan": 5})
+        self.assertEqual(shape({"schedule": []}, None, "columnar")["schedule"]["jobId"], [])
+        with self.assertRaises(ValueError):
+            response_options({"fields": ["schedule", "visualisation"]})
+        with self.assertRaises(ValueError):
+            response_options({"layout": "csv"})
+
+    def test_json_and_compression(self):
+        expected = json.loads(json.dumps(self.response))  # Tuples become lists, integer keys strings
+        self.assertEqual(json.loads(encoding.dumps(self.response)), expected)
+        self.assertEqual(choose_encoding("gzip, deflate"), "gzip")
+        self.assertIsNone(choose_encoding("gzip;q=0, identity"))
+        self.assertIsNone(choose_encoding(None))
+        self.assertEqual(choose_encoding("*"), "zstd" if encoding.zstandard is not None else "gzip")
+        body, content_encoding = encode(self.response, "gzip")
+        self.assertIsNone(content_encoding)  # Too small to be worth compressing
+        large = dict(self.response, schedule=[(i, i, i + 1, 1) for i in range(1000)])
+        body, content_encoding = encode(large, "gzip", layout="columnar")
+        self.assertEqual(content_encoding, "gzip")
+        self.assertEqual(json.loads(gzip.decompress(body))["schedule"]["end"][-1], 1000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import multiprocessing
+import unittest
+from job import Job, Operation
+from instance import Instance, ScheduleResult
+from scheduler import AStarScheduler, DispatchScheduler
+
+
+def solve_shared(handle, results):
+    instance = Instance.attach(handle)
+    scheduler = DispatchScheduler(instance, instance.machines, "lpt")
+    results.put((scheduler.schedule_jobs(), instance.alt_times.base is not None))
+
+
+class TestInstance(unittest.TestCase):
+    def setUp(self):
+        self.data = {"jobs": [
+            {"jobId": 1, "operations": [{"machine": 1, "processingTime": 4}, {"machine": 2, "processingTime": 3}]},
+            {"jobId": 2, "priority": 3, "releaseTime": 1,
+             "operations": [{"machine": 2, "processingTime": 2}, {"machine": 1, "processingTime": 5}]},
+            {"jobId": 3, "alternatives": [{"machine": 1, "processingTime": 6}, {"machine": 2, "processingTime": 4}]},
+        ], "numMachines": 2}
+        self.jobs = [
+            Job(1, operations=[Operation({1: 4}), Operation({2: 3})]),
+            Job(2, priority=3, release_time=1, operations=[Operation({2: 2}), Operation({1: 5})]),
+            Job(3, operations=[Operation({1: 6, 2: 4})]),
+        ]
+
+    def test_request_and_jobs_give_the_same_columns(self):
+        instance = Instance.from_request(self.data)
+        self.assertEqual((instance.num_jobs, instance.num_ops, instance.num_machines), (3, 5, 2))
+        self.assertEqual(instance.op_start.tolist(), [0, 2, 4, 5])
+        self.assertEqual(instance.operation_times(4), {1: 6, 2: 4})
+        from_jobs = Instance.from_jobs(self.jobs, 2)
+        for name in Instance.COLUMNS:
+            self.assertEqual(getattr(instance, name).tolist(), getattr(from_jobs, name).tolist())
+        with self.assertRaises(ValueError):
+            instance.alt_times[0] = 1  # Read-only
+        with self.assertRaises(ValueError):
+            Instance.from_request(dict(self.data, numMachines=1))
+
+    def test_solves_share_the_instance_and_return_separate_results(self):
+        instance = Instance.from_request(self.data)
+        expected = AStarScheduler(self.jobs, instance.machines).schedule_jobs()
+        first = AStarScheduler(instance, instance.machines)
+        second = DispatchScheduler(instance, instance.machines, "spt")
+        self.assertEqual(first.schedule_jobs(), expected)
+        second.schedule_jobs()
+        self.assertIsNot(first.result, second.result)
+        self.assertEqual(first.result.makespan, max(end for _, _, end, _ in expected))
+        self.assertEqual(first.result.job_end_times().max(), first.result.makespan)
+        # Job objects still get their times written back
+        self.assertEqual(max(job.end_time for job in self.jobs), first.result.makespan)
+        with self.assertRaises(ValueError):
+            ScheduleResult(instance, [(0, 0, 1)])  # Operation 0 only runs on machine 1
+
+    def test_worker_attaches_to_shared_memory(self):
+        instance = Instance.from_request(dict(self.data, jobs=[dict(job, jobId=f"j{i}")
+                                                               for i, job in enumerate(self.data["jobs"])]))
+        expected = DispatchScheduler(instance, instance.machines, "lpt").schedule_jobs()
+        block, handle = instance.share()
+        try:
+            context = multiprocessing.get_context()
+            results = context.Queue()
+            process = context.Process(target=solve_shared, args=(handle, results))
+            process.start()
+            schedule, is_view = results.get(timeout=30)
+            process.join()
+        finally:
+            block.close()
+            block.unlink()
+        self.assertEqual(schedule, expected)
+        self.assertTrue(is_view)
+
+    def test_components_and_interchangeable_jobs(self):
+        instance = Instance.from_request({"jobs": [
+            {"jobId": "a", "machine": 1, "processingTime": 2},
+            {"jobId": "b", "operations": [{"machine": 3, "processingTime": 1}, {"machine": 4, "processingTime": 2}]},
+            {"jobId": "c", "machine": 1, "processingTime": 2, "priority": 5},
+            {"jobId": "d", "machines": [2, 4], "processingTime": 3},
+            {"jobId": "e", "machine": 1, "processingTime": 2, "releaseTime": 1},
+        ], "numMachines": 4})
+        self.assertEqual([jobs.tolist() for jobs in instance.components()], [[0, 2, 4], [1, 3]])
+        self.assertEqual(instance.interchangeable_jobs(), [[0, 2]])  # Priorities do not matter, releases do
+        sub_instance, op_indices, machine_indices = instance.subset([1, 3])
+        self.assertEqual(sub_instance.job_ids.tolist(), ["b", "d"])
+        self.assertEqual(op_indices.tolist(), [1, 2, 4])
+        self.assertEqual(machine_indices.tolist(), [1, 2, 3])
+        self.assertEqual(sub_instance.operation_times(2), {1: 3, 3: 3})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import importlib.util
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+import pandas as pd
+from instance import Instance
+from instance_io import read_instance, write_instance, write_schedule
+from scheduler import DispatchScheduler
+import main
+
+HAS_PARQUET = importlib.util.find_spec("pyarrow") is not None or importlib.util.find_spec("fastparquet") is not None
+
+
+class TestInstanceIO(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.instance = Instance.from_request({"jobs": [
+            {"jobId": 7, "priority": 2, "operations": [{"machine": 2, "processingTime": 4},
+                                                       {"machines": [1, 3], "processingTime": 3}]},
+            {"jobId": 3, "releaseTime": 5, "alternatives": [{"machine": 1, "processingTime": 6},
+                                                             {"machine": 3, "processingTime": 2}]},
+        ], "numMachines": 3})
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def assertSameInstance(self, instance):
+        self.assertEqual(instance.num_machines, self.instance.num_machines)
+        for name in Instance.COLUMNS:
+            self.assertEqual(getattr(instance, name).tolist(), getattr(self.instance, name).tolist(), name)
+
+    def test_round_trips(self):
+        formats = ["instance.csv", "instance.ndjson", "instance.json"] + (["instance.parquet"] if HAS_PARQUET else [])
+        for name in formats:
+            write_instance(self.instance, self.path(name))
+            self.assertSameInstance(read_instance(self.path(name)))
+
+    def test_tables_may_list_rows_in_any_order(self):
+        rows = pd.DataFrame({"jobId": [3, 7, 3, 7, 7], "operation": [0, 1, 0, 0, 1], "machine": [3, 3, 1, 2, 1],
+                             "processingTime": [2, 3, 6, 4, 3], "priority": [1, 2, 1, 2, 2],
+                             "releaseTime": [5, 0, 5, 0, 0]})
+        rows.to_csv(self.path("shuffled.csv"), index=False)
+        instance = read_instance(self.path("shuffled.csv"))
+        self.assertEqual(instance.job_ids.tolist(), [3, 7])  # Jobs keep the order of their first row
+        self.assertEqual(instance.operation_times(0), {1: 6, 3: 2})
+        self.assertEqual(instance.op_start.tolist(), [0, 1, 3])
+        self.assertEqual(instance.release_times.tolist(), [5, 0])
+        rows.iloc[[0, 0]].to_csv(self.path("repeated.csv"), index=False)
+        with self.assertRaises(ValueError):
+            read_instance(self.path("repeated.csv"))
+        with self.assertRaises(ValueError):
+            read_instance(self.path("instance.xlsx"))
+        for column, value in (("processingTime", None), ("processingTime", 3.5), ("machine", None),
+                              ("operation", 0.5)):
+            broken = rows.astype(object)
+            broken.loc[2, column] = value
+            broken.to_csv(self.path("broken.csv"), index=False)
+            with self.assertRaisesRegex(ValueError, f"{column} in row 2"):
+                read_instance(self.path("broken.csv"))
+
+    def test_schedule_export(self):
+        scheduler = DispatchScheduler(self.instance, self.instance.machines, "lpt")
+        schedule = scheduler.schedule_jobs()
+        write_schedule(scheduler.result, self.path("schedule.csv"))
+        rows = pd.read_csv(self.path("schedule.csv"))
+        self.assertEqual(list(rows.columns), ["jobId", "operation", "machine", "start", "end"])
+        self.assertEqual(sorted(rows[["jobId", "start", "end", "machine"]].itertuples(index=False, name=None)),
+                         sorted(schedule))
+        write_schedule(scheduler.result, self.path("schedule.ndjson"))
+        with open(self.path("schedule.ndjson")) as handle:
+            self.assertEqual(json.loads(handle.readline()), rows.iloc[0].to_dict())
+
+    def test_command_line(self):
+        write_instance(self.instance, self.path("instance.csv"))
+        output = io.StringIO()
+        with redirect_stdout(output):
+            main.main([self.path("instance.csv"), "--set", "dispatchRule=lpt", "--output", self.path("out.ndjson")])
+        summary = json.loads(output.getvalue())
+        self.assertEqual((summary["numJobs"], summary["numOperations"]), (2, 3))
+        with open(self.path("out.ndjson")) as handle:
+            self.assertEqual(max(json.loads(line)["end"] for line in handle), summary["makespan"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import os
+import random
+import unittest
+from job import Job, Operation
+from machine import Machine
+from scheduler import DispatchScheduler, OptimizedScheduler
+from local_search import LocalSearchScheduler, ShopState
+
+
+def flexible_jobs(count, seed=1):
+    rng = random.Random(seed)
+    return [Job(i + 1, operations=[Operation({m: rng.randint(5, 50) for m in rng.sample(range(1, 5), rng.randint(1, 3))})])
+            for i in range(count)]
+
+
+def job_shop(seed=2):
+    rng = random.Random(seed)
+    jobs = []
+    for i in range(8):
+        route = rng.sample(range(1, 5), 4)
+        jobs.append(Job(i + 1, operations=[Operation({m: rng.randint(1, 9)}) for m in route]))
+    return jobs
+
+
+class TestLocalSearch(unittest.TestCase):
+    def setUp(self):
+        self.machines = [Machine(i + 1) for i in range(4)]
+
+    def assertValid(self, jobs, schedule):
+        self.assertEqual(len(schedule), sum(len(job.operations) for job in jobs))
+        for machine_id in range(1, 5):
+            entries = sorted(entry[1:3] for entry in schedule if entry[3] == machine_id)
+            for (_, end), (start, _) in zip(entries, entries[1:]):
+                self.assertLessEqual(end, start)
+        for job in jobs:
+            for before, after in zip(job.operations, job.operations[1:]):
+                self.assertGreaterEqual(after.start_time, before.end_time)
+
+    def test_improves_dispatch_schedule_on_flexible_machines(self):
+        jobs = flexible_jobs(200)
+        _, dispatch_makespan = DispatchScheduler(jobs, self.machines, "spt").dispatch()
+        scheduler = LocalSearchScheduler(jobs, self.machines, initial_rule="spt", max_seconds=1, stall_iterations=200)
+        schedule = scheduler.schedule_jobs()
+        self.assertValid(jobs, schedule)
+        data = scheduler.visualization_data
+        makespan = max(end for _, _, end, _ in schedule)
+        self.assertEqual(data["initial_makespan"], dispatch_makespan)
+        self.assertLess(makespan, dispatch_makespan)
+        self.assertEqual(data["convergence"][0], [0.0, dispatch_makespan])
+        self.assertEqual(data["convergence"][-1][1], makespan)
+        self.assertLessEqual(data["lower_bound"], makespan)
+
+    def test_job_shop_starts_from_another_schedulers_output(self):
+        jobs = job_shop()
+        initial = DispatchScheduler(jobs, self.machines, "lpt").schedule_jobs()
+        optimum = OptimizedScheduler(jobs, self.machines, num_workers=2).schedule_jobs()
+        scheduler = LocalSearchScheduler(jobs, self.machines, initial_schedule=initial, max_seconds=2)
+        schedule = scheduler.schedule_jobs()
+        self.assertValid(jobs, schedule)
+        makespan = max(end for _, _, end, _ in schedule)
+        self.assertLessEqual(makespan, max(end for _, _, end, _ in initial))
+        self.assertGreaterEqual(makespan, max(end for _, _, end, _ in optimum))
+
+    def test_swap_estimate_matches_exact_evaluation_on_critical_blocks(self):
+        jobs = job_shop()
+        scheduler = LocalSearchScheduler(jobs, self.machines)
+        state = ShopState(scheduler.problem, scheduler.initial_assignments())
+        for u, v in state.swap_moves(state.critical_path()):
+            estimate = state.estimate_swap(u, v)
+            state.swap(u, v)
+            exact = state.evaluate()
+            state.swap(v, u)
+            state.evaluate()
+            # The estimate is the longest path through u and v, so it never exceeds the new makespan
+            self.assertIsNotNone(exact)
+            self.assertLessEqual(estimate, exact)
+
+    def test_invalid_initial_schedule(self):
+        jobs = flexible_jobs(3)
+        with self.assertRaises(ValueError):
+            LocalSearchScheduler(jobs, self.machines, initial_schedule=[(1, 0, 5, 1)]).schedule_jobs()
+
+    def test_workers_are_capped_at_the_cpu_count(self):
+        scheduler = LocalSearchScheduler(flexible_jobs(3), self.machines, workers=500)
+        self.assertEqual(scheduler.workers, os.cpu_count() or 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
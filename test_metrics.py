@@ -0,0 +1,58 @@
+import unittest
+
+from metrics import MetricsRegistry, size_bucket
+from profiling import profile_mode, profiled
+from scheduler import GBFSScheduler
+from job import Job
+from machine import Machine
+from telemetry import SearchTelemetry
+
+
+class TestMetrics(unittest.TestCase):
+    def test_histograms(self):
+        self.assertEqual([size_bucket(n) for n in (1, 100, 101, 5000, 10 ** 6)],
+                         ["le100", "le100", "le1k", "le10k", "gt100k"])
+        registry = MetricsRegistry()
+        registry.observe_request("gbfs", 10, 0.02, phases={"expand": 0.01})
+        registry.observe_request("gbfs", 10, 3.0, phases={"expand": 0.5})
+        registry.observe_error("cpsat")
+        text = registry.render()
+        labels = 'scheduler="gbfs",size="le100",cache="BYPASS"'
+        self.assertIn(f'schedule_request_seconds_bucket{{{labels},le="0.025"}} 1', text)
+        self.assertIn(f'schedule_request_seconds_bucket{{{labels},le="+Inf"}} 2', text)
+        self.assertIn(f'schedule_request_seconds_count{{{labels}}} 2', text)
+        self.assertIn('schedule_phase_seconds_total{scheduler="gbfs",phase="expand"} 0.51', text)
+        self.assertIn('schedule_request_errors_total{scheduler="cpsat"} 1', text)
+        registry.observe_run({"nodes_expanded": 5, "telemetry": {"counters": {"frontier_pushes": 9}}})
+        registry.observe_run({"nodes_expanded": 2, "telemetry": {"counters": {}}})
+        text = registry.render()
+        self.assertIn('schedule_search_events_total{event="frontier_pushes"} 9', text)
+        self.assertIn('schedule_search_events_total{event="nodes_expanded"} 7', text)
+
+    def test_phases_and_profiling(self):
+        jobs = [Job(i, processing_time=1 + i % 3, machine_id=1 + i % 2) for i in range(6)]
+        machines = [Machine(1), Machine(2)]
+        seen = []
+        SearchTelemetry.observers.append(seen.append)
+        try:
+            scheduler = GBFSScheduler(jobs, machines)
+            schedule, report = profiled("sample", scheduler.schedule_jobs)
+        finally:
+            SearchTelemetry.observers.remove(seen.append)
+        self.assertEqual(len(schedule), 6)
+        self.assertEqual(report["mode"], "sample")
+        phases = scheduler.visualization_data["phases"]
+        self.assertGreater(phases["setup"], 0)
+        self.assertGreater(phases["expand"], 0)
+        self.assertEqual(seen, [scheduler.visualization_data])
+        counters = scheduler.visualization_data["telemetry"]["counters"]
+        self.assertGreaterEqual(counters["successors_generated"], counters["frontier_pushes"])
+        self.assertGreater(counters["frontier_pushes"], 0)
+        self.assertEqual([profile_mode(value) for value in (None, "0", True, "sample")],
+                         [None, None, "cprofile", "sample"])
+        with self.assertRaises(ValueError):
+            profile_mode("perf")
+
+
+if __name__ == "__main__":
+    unittest.main()
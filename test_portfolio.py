@@ -0,0 +1,52 @@
+import random
+import time
+import unittest
+from job import Job, Operation
+from machine import Machine
+from scheduler import OptimizedScheduler
+from portfolio import PortfolioScheduler
+
+
+class TestPortfolioScheduler(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(3)
+        self.machines = [Machine(i + 1) for i in range(4)]
+        self.jobs = [Job(i + 1, operations=[Operation({m: rng.randint(1, 20)}) for m in rng.sample(range(1, 5), 4)])
+                     for i in range(6)]
+
+    def test_stops_once_a_schedule_is_proven_optimal(self):
+        optimum = max(end for _, _, end, _ in OptimizedScheduler(self.jobs, self.machines).schedule_jobs())
+        started = time.time()
+        scheduler = PortfolioScheduler(self.jobs, self.machines, max_seconds=30)
+        schedule = scheduler.schedule_jobs()
+        data = scheduler.visualization_data
+        self.assertLess(time.time() - started, 30)
+        self.assertEqual(len(schedule), 24)
+        self.assertEqual(max(end for _, _, end, _ in schedule), optimum)
+        self.assertEqual(max(job.end_time for job in self.jobs), optimum)
+        self.assertEqual(data["stop_reason"], "optimal")
+        self.assertEqual(data["lower_bound"], optimum)
+        self.assertIn(data["winner"], ("dispatch", "gbfs", "astar", "cpsat"))
+        self.assertEqual(set(data["engines"]), {"dispatch", "gbfs", "astar", "cpsat"})
+
+    def test_budgets_reach_the_engines(self):
+        rng = random.Random(5)
+        jobs = [Job(i + 1, operations=[Operation({m: rng.randint(1, 20)}) for m in rng.sample(range(1, 5), 4)])
+                for i in range(10)]
+        started = time.time()
+        scheduler = PortfolioScheduler(jobs, self.machines, engines=["gbfs", "astar"], max_seconds=20, max_nodes=50)
+        self.assertEqual(len(scheduler.schedule_jobs()), 40)
+        self.assertLess(time.time() - started, 20)
+        for engine in ("gbfs", "astar"):
+            self.assertIn(scheduler.visualization_data["engines"][engine]["stop_reason"], ("max_nodes", None))
+
+    def test_single_engine_and_unknown_engines(self):
+        with self.assertRaises(ValueError):
+            PortfolioScheduler(self.jobs, self.machines, engines=["dispatch", "simplex"])
+        scheduler = PortfolioScheduler(self.jobs, self.machines, engines=["dispatch"], max_seconds=1)
+        self.assertEqual(len(scheduler.schedule_jobs()), 24)
+        self.assertEqual(scheduler.visualization_data["winner"], "dispatch")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,10 @@
 import unittest
-from job import Job
+from ortools.sat.python import cp_model
+from job import Job, Operation
 from machine import Machine
-from scheduler import Scheduler
+from scheduler import (Scheduler, ScheduleNode, StateTable, GBFSScheduler, AStarScheduler,
+                       DispatchScheduler, OptimizedScheduler)
+from bounds import LowerBounds
 
 class TestScheduler(unittest.TestCase):
     def test_scheduler(self):
@@ -11,5 +14,264 @@ class TestScheduler(unittest.TestCase):
         schedule = scheduler.schedule_jobs()
         self.assertEqual(len(schedule), 2)  # Ensure all jobs are scheduled
 
+class TestScheduleNode(unittest.TestCase):
+    def setUp(self):
+        self.jobs = [Job(1, 3, 1, 1), Job(2, 2, 2, 2), Job(3, 4, 1, 1)]
+        self.machines = [Machine(1), Machine(2)]
+
+    def test_incremental_state(self):
+        root = ScheduleNode(self.jobs, self.machines)
+        self.assertEqual(root.unscheduled_jobs, [0, 1, 2])
+        self.assertEqual(root.remaining_by_machine, (7, 2))
+        node = root.child(0).child(2)
+        self.assertEqual(node.machine_times, (7, 0))
+        self.assertEqual(node.makespan, 7)
+        self.assertEqual(node.remaining_work, 2)
+        self.assertEqual(node.unscheduled_jobs, [1])
+        self.assertEqual(node.scheduled_jobs, [(0, 0, 0), (2, 3, 0)])
+        self.assertEqual(node.max_remaining_time(), 2)
+        self.assertTrue(node.child(1).is_goal())
+
+    def test_state_table_prunes_duplicates_and_dominated_states(self):
+        root = ScheduleNode(self.jobs, self.machines)
+        states = StateTable()
+        self.assertTrue(states.add(root.child(0).child(2)))
+        # Same remaining jobs and machine times, reached in a different order
+        self.assertFalse(states.add(root.child(2).child(0)))
+        self.assertEqual(states.duplicates, 1)
+
+        # A state with the same remaining jobs and later machine times is dominated
+        late = root.child(0).child(2)
+        late.machine_times = (9, 0)
+        self.assertFalse(states.add(late))
+        self.assertEqual(states.dominated, 1)
+
+        # An earlier one replaces the stored vector, so the old node goes stale
+        stale = root.child(0).child(2)
+        early = root.child(0).child(2)
+        early.machine_times = (5, 0)
+        self.assertTrue(states.add(early))
+        self.assertFalse(states.close(stale))
+        self.assertTrue(states.close(early))
+        self.assertFalse(states.close(early))
+
+    def test_batch_heuristics_match_scalar(self):
+        jobs = [Job(i + 1, (i * 7) % 11 + 1, 1, i % 3 + 1) for i in range(10)]
+        machines = [Machine(1), Machine(2), Machine(3)]
+        node = ScheduleNode(jobs, machines).child(4).child(0).child(7)
+        successors = node.get_successors()
+        for scheduler_class in (GBFSScheduler, AStarScheduler):
+            scheduler = scheduler_class(jobs, machines)
+            batch = scheduler.heuristic_batch(node, [s.action[0] for s in successors])
+            for successor, h_value in zip(successors, batch):
+                self.assertAlmostEqual(h_value, scheduler.heuristic(successor))
+
+    def test_astar_budgets_return_incumbent_with_bound(self):
+        jobs = [Job(i + 1, (i * 5) % 9 + 1, 1, i % 3 + 1) for i in range(12)]
+        machines = [Machine(1), Machine(2), Machine(3)]
+        optimal = AStarScheduler(jobs, machines)
+        schedule = optimal.schedule_jobs()
+        makespan = max(end for _, _, end, _ in schedule)
+        self.assertEqual(optimal.visualization_data["lower_bound"], makespan)
+        self.assertEqual(optimal.visualization_data["gap"], 0.0)
+
+        for budget in ({"max_nodes": 2}, {"max_seconds": 0}, {"max_frontier": 1}):
+            scheduler = AStarScheduler(jobs, machines, weight=2.0, seed_rule=None, **budget)
+            schedule = scheduler.schedule_jobs()
+            self.assertEqual(len(schedule), 12)
+            self.assertEqual(scheduler.visualization_data["stop_reason"], next(iter(budget)))
+            self.assertLessEqual(scheduler.visualization_data["lower_bound"], makespan)
+
+    def test_astar_prunes_against_external_bound(self):
+        jobs = [Job(i + 1, (i * 5) % 9 + 1, 1, i % 3 + 1) for i in range(12)]
+        machines = [Machine(1), Machine(2), Machine(3)]
+        plain = AStarScheduler(jobs, machines, seed_rule=None)
+        makespan = max(end for _, _, end, _ in plain.schedule_jobs())
+        # Another solver already holds an optimal schedule: A* only has to prove it
+        pruned = AStarScheduler(jobs, machines, seed_rule=None, external_bound=lambda: makespan)
+        pruned.schedule_jobs()
+        self.assertEqual(pruned.visualization_data["lower_bound"], makespan)
+        self.assertLess(pruned.visualization_data["nodes_expanded"], plain.visualization_data["nodes_expanded"])
+
+    def test_telemetry_levels_bound_recorded_samples(self):
+        jobs = [Job(i + 1, (i * 7) % 11 + 1, 1, i % 3 + 1) for i in range(10)]
+        machines = [Machine(1), Machine(2), Machine(3)]
+        full = GBFSScheduler(jobs, machines, telemetry="full")
+        full.schedule_jobs()
+        expanded = full.visualization_data["nodes_expanded"]
+        self.assertEqual(len(full.visualization_data["heuristic_values"]), expanded)
+
+        sampled = GBFSScheduler(jobs, machines, telemetry="sampled", telemetry_samples=5)
+        sampled.schedule_jobs()
+        data = sampled.visualization_data
+        self.assertEqual(data["nodes_expanded"], expanded)
+        self.assertEqual(len(data["heuristic_values"]), 5)
+        self.assertEqual(data["telemetry"]["samples_dropped"], expanded - 5)
+        self.assertGreater(data["telemetry"]["frontier_peak"], 0)
+
+        off = GBFSScheduler(jobs, machines, telemetry="off")
+        off.schedule_jobs()
+        self.assertEqual(off.visualization_data["heuristic_values"], [])
+        self.assertEqual(off.visualization_data["exploration_by_level"], {})
+        self.assertEqual(off.visualization_data["nodes_expanded"], expanded)
+
+        with self.assertRaises(ValueError):
+            GBFSScheduler(jobs, machines, telemetry="verbose")
+
+    def test_search_schedulers_terminate(self):
+        for scheduler_class in (GBFSScheduler, AStarScheduler):
+            schedule = scheduler_class(self.jobs, self.machines).schedule_jobs()
+            self.assertEqual(len(schedule), 3)
+            self.assertEqual(max(end for _, _, end, _ in schedule), 7)
+
+class TestDispatchScheduler(unittest.TestCase):
+    def setUp(self):
+        self.jobs = [Job(1, 3, 1, 1), Job(2, 2, 5, 1), Job(3, 4, 1, 2, release_time=2), Job(4, 1, 1, 2)]
+        self.machines = [Machine(1), Machine(2)]
+
+    def test_rules_order_jobs_per_machine(self):
+        spt = DispatchScheduler(self.jobs, self.machines, "spt").schedule_jobs()
+        self.assertEqual(sorted(spt), [(1, 2, 5, 1), (2, 0, 2, 1), (3, 2, 6, 2), (4, 0, 1, 2)])
+        lpt, makespan = DispatchScheduler(self.jobs, self.machines, "lpt").dispatch()
+        self.assertEqual(lpt[:2], [(0, 0, 0), (1, 3, 0)])
+        self.assertEqual(makespan, 6)
+
+    def test_release_times_are_respected(self):
+        for rule in DispatchScheduler.RULES:
+            schedule = DispatchScheduler(self.jobs, self.machines, rule).schedule_jobs()
+            self.assertEqual(len(schedule), 4)
+            job_3 = next(entry for entry in schedule if entry[0] == 3)
+            self.assertGreaterEqual(job_3[1], 2)
+
+    def test_unknown_rule(self):
+        with self.assertRaises(ValueError):
+            DispatchScheduler(self.jobs, self.machines, "fifo")
+
+    def test_seeds_astar_upper_bound(self):
+        scheduler = AStarScheduler(self.jobs, self.machines)
+        schedule = scheduler.schedule_jobs()
+        self.assertEqual(max(end for _, _, end, _ in schedule), 6)
+        self.assertEqual(scheduler.visualization_data["lower_bound"], 6)
+        self.assertEqual(scheduler.visualization_data["gap"], 0.0)
+
+
+class TestOptimizedScheduler(unittest.TestCase):
+    def test_cpsat_schedule_and_report(self):
+        jobs = [Job(1, 3, 1, 1), Job(2, 2, 5, 1), Job(3, 4, 1, 2, release_time=2), Job(4, 1, 1, 2)]
+        machines = [Machine(1), Machine(2)]
+        scheduler = OptimizedScheduler(jobs, machines, num_workers=2, max_seconds=10)
+        schedule = scheduler.schedule_jobs()
+        self.assertEqual(len(schedule), 4)
+        self.assertEqual(max(end for _, _, end, _ in schedule), 6)
+        self.assertEqual(scheduler.visualization_data["solver_status"], "OPTIMAL")
+        self.assertEqual(scheduler.visualization_data["lower_bound"], 6)
+        self.assertEqual(scheduler.visualization_data["gap"], 0.0)
+
+        # The model is built once and reused
+        model = scheduler.model
+        scheduler.schedule_jobs()
+        self.assertIs(scheduler.model, model)
+
+    def test_stop_reason_follows_solver_status(self):
+        jobs = [Job(1, 3, 1, 1), Job(2, 2, 5, 1)]
+        solver = cp_model.CpSolver()
+        unlimited = OptimizedScheduler(jobs, [Machine(1)])
+        timed = OptimizedScheduler(jobs, [Machine(1)], max_seconds=1)
+        self.assertIsNone(unlimited.stop_reason(solver, cp_model.OPTIMAL, 0.0))
+        self.assertEqual(unlimited.stop_reason(solver, cp_model.UNKNOWN, None), "unknown")
+        self.assertEqual(unlimited.stop_reason(solver, cp_model.INFEASIBLE, None), "infeasible")
+        self.assertEqual(timed.stop_reason(solver, cp_model.MODEL_INVALID, None), "model_invalid")
+        self.assertEqual(timed.stop_reason(solver, cp_model.FEASIBLE, 0.1), "max_seconds")
+        self.assertEqual(timed.stop_reason(solver, cp_model.UNKNOWN, None), "max_seconds")
+
+
+class TestLowerBounds(unittest.TestCase):
+    def setUp(self):
+        # Machine 1 has a job released late enough to leave an idle gap
+        self.jobs = [Job(1, 2, 1, 1), Job(2, 3, 1, 1, release_time=6), Job(3, 4, 1, 2, release_time=1)]
+        self.machines = [Machine(1), Machine(2)]
+
+    def test_root_bounds(self):
+        root = ScheduleNode(self.jobs, self.machines)
+        bounds = LowerBounds(root.problem)
+        self.assertEqual(bounds.machine_load(root), 5)
+        self.assertEqual(bounds.release_tail(root), 9)
+        self.assertEqual(bounds.node_bound(root), 9)
+
+    def test_bound_is_exact_at_goal_and_matches_optimum(self):
+        root = ScheduleNode(self.jobs, self.machines)
+        bounds = LowerBounds(root.problem)
+        goal = root.child(0).child(1).child(2)
+        self.assertEqual(bounds.node_bound(goal), goal.makespan)
+
+        scheduler = AStarScheduler(self.jobs, self.machines, seed_rule=None)
+        schedule = scheduler.schedule_jobs()
+        self.assertEqual(max(end for _, _, end, _ in schedule), 9)
+        self.assertEqual(scheduler.visualization_data["lower_bound"], 9)
+
+    def test_target_gap_stops_search(self):
+        jobs = [Job(i + 1, (i * 5) % 9 + 1, 1, i % 3 + 1) for i in range(12)]
+        machines = [Machine(1), Machine(2), Machine(3)]
+        scheduler = AStarScheduler(jobs, machines, target_gap=1.0)
+        scheduler.schedule_jobs()
+        self.assertEqual(scheduler.visualization_data["stop_reason"], "target_gap")
+
+
+class TestJobShop(unittest.TestCase):
+    def setUp(self):
+        # Two jobs with crossing routes, and a third that may run on either machine
+        self.jobs = [
+            Job(1, operations=[Operation({1: 3}), Operation({2: 2})]),
+            Job(2, operations=[Operation({2: 4}), Operation({1: 2})]),
+            Job(3, operations=[Operation({1: 2, 2: 3})]),
+        ]
+        self.machines = [Machine(1), Machine(2)]
+
+    def assertValidSchedule(self, schedule):
+        self.assertEqual(len(schedule), 5)
+        for job in self.jobs:
+            for before, after in zip(job.operations, job.operations[1:]):
+                self.assertGreaterEqual(after.start_time, before.end_time)
+        for machine_id in (1, 2):
+            entries = sorted(entry[1:3] for entry in schedule if entry[3] == machine_id)
+            for (_, end), (start, _) in zip(entries, entries[1:]):
+                self.assertLessEqual(end, start)
+
+    def test_operations_respect_routes_and_eligible_machines(self):
+        root = ScheduleNode(self.jobs, self.machines)
+        self.assertEqual(root.problem.num_ops, 5)
+        # Only the first operation of each job is available, on every eligible machine
+        self.assertEqual(sorted(s.action[::2] for s in root.get_successors()), [(0, 0), (2, 1), (4, 0), (4, 1)])
+        node = root.child(0)
+        self.assertEqual(node.child(1).action, (1, 3, 1))
+
+    def test_all_engines_schedule_job_shop(self):
+        makespans = {}
+        for name, scheduler in (("astar", AStarScheduler(self.jobs, self.machines)),
+                                ("gbfs", GBFSScheduler(self.jobs, self.machines)),
+                                ("dispatch", DispatchScheduler(self.jobs, self.machines, "lpt")),
+                                ("cpsat", OptimizedScheduler(self.jobs, self.machines, num_workers=2))):
+            schedule = scheduler.schedule_jobs()
+            self.assertValidSchedule(schedule)
+            makespans[name] = max(end for _, _, end, _ in schedule)
+        self.assertEqual(makespans["astar"], makespans["cpsat"])
+        self.assertEqual(makespans["astar"], 7)
+        self.assertTrue(all(makespan >= 7 for makespan in makespans.values()))
+
+    def test_batch_heuristics_match_scalar(self):
+        node = ScheduleNode(self.jobs, self.machines).child(4, 0)
+        successors = node.get_successors()
+        for scheduler_class in (GBFSScheduler, AStarScheduler):
+            scheduler = scheduler_class(self.jobs, self.machines)
+            batch = scheduler.heuristic_batch(node, [s.action[0] for s in successors],
+                                              [s.action[2] for s in successors])
+            for successor, h_value in zip(successors, batch):
+                self.assertAlmostEqual(h_value, scheduler.heuristic(successor))
+
+    def test_unknown_machine(self):
+        with self.assertRaises(ValueError):
+            AStarScheduler([Job(1, operations=[Operation({3: 1})])], self.machines)
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
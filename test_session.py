@@ -0,0 +1,99 @@
+import random
+import unittest
+from session import create_session, SessionStore
+
+
+def random_job(rng, job_id, num_machines=3):
+    operations = [{"alternatives": [{"machine": m, "processingTime": rng.randint(1, 9)}
+                                     for m in rng.sample(range(1, num_machines + 1), rng.randint(1, 2))]}
+                  for _ in range(rng.randint(1, 3))]
+    return {"jobId": job_id, "operations": operations, "releaseTime": rng.randint(0, 5)}
+
+
+class TestScheduleSession(unittest.TestCase):
+    def setUp(self):
+        self.data = {"jobs": [
+            {"jobId": 1, "operations": [{"machine": 1, "processingTime": 4}, {"machine": 2, "processingTime": 3}]},
+            {"jobId": 2, "operations": [{"machine": 2, "processingTime": 2}, {"machine": 1, "processingTime": 5}]},
+            {"jobId": 3, "machines": [1, 2], "processingTime": 6},
+        ], "numMachines": 2}
+
+    def assertFeasible(self, session):
+        for machine_id in session.heads:
+            entries = sorted((start, end) for _, start, end, m in session.schedule() if m == machine_id)
+            for (_, end), (start, _) in zip(entries, entries[1:]):
+                self.assertLessEqual(end, start)
+        for ops in session.jobs.values():
+            self.assertGreaterEqual(ops[0].start, ops[0].release_time)
+            for before, after in zip(ops, ops[1:]):
+                self.assertLessEqual(before.end, after.start)
+            for op in ops:
+                if op.start >= session.time:
+                    self.assertEqual(op.end - op.start, op.processing_times[op.machine_id])
+                    for window_start, window_end in session.windows[op.machine_id]:
+                        self.assertFalse(op.start < window_end and op.end > window_start)
+
+    def test_started_operations_stay_frozen(self):
+        session, response = create_session(self.data)
+        self.assertEqual(response["makespan"], session.makespan())
+        started = {(job_id, start, machine) for job_id, start, _, machine in response["schedule"] if start < 3}
+        report = session.apply([{"type": "machineDown", "machine": 1, "start": 3, "end": 20},
+                                {"type": "updateOperation", "jobId": 1, "operation": 1, "processingTime": 9}], now=3)
+        self.assertFeasible(session)
+        self.assertTrue(started <= {(job_id, start, machine) for job_id, start, _, machine in session.schedule()})
+        self.assertEqual(report["version"], 1)
+        self.assertTrue(report["changed"])
+
+    def test_add_job_only_touches_its_machines(self):
+        session, _ = create_session(dict(self.data, numMachines=4))
+        report = session.apply([{"type": "addJob", "job": {"jobId": 4, "machine": 4, "processingTime": 5}}])
+        self.assertEqual(report["changed"], [{"jobId": 4, "operation": 0, "start": 0, "end": 5, "machine": 4}])
+        self.assertEqual(report["affectedMachines"], [4])
+        with self.assertRaises(ValueError):
+            session.apply([{"type": "addJob", "job": {"jobId": 4, "machine": 1, "processingTime": 1}}])
+
+    def test_remove_job_stops_work_in_progress(self):
+        session, _ = create_session(self.data)
+        job_id, start, end, _ = min(session.schedule(), key=lambda entry: entry[1])
+        report = session.apply([{"type": "removeJob", "jobId": job_id}], now=start + 1)
+        self.assertFeasible(session)
+        kept = [entry for entry in session.schedule() if entry[0] == job_id]
+        self.assertEqual(kept, [(job_id, start, start + 1, kept[0][3])])
+        self.assertTrue(all(entry["jobId"] == job_id for entry in report["removed"]))
+        with self.assertRaises(ValueError):
+            session.apply([], now=0)  # The clock never goes back
+
+    def test_random_changes_keep_the_schedule_feasible(self):
+        rng = random.Random(3)
+        session, _ = create_session({"jobs": [random_job(rng, i) for i in range(10)], "numMachines": 3})
+        next_id = 10
+        for _ in range(40):
+            now = session.time + rng.randint(0, 3)
+            frozen = {entry for entry in session.schedule() if entry[1] < now}
+            change = rng.choice([
+                {"type": "addJob", "job": random_job(rng, next_id)},
+                {"type": "removeJob", "jobId": rng.choice(list(session.jobs))},
+                {"type": "machineDown", "machine": rng.randint(1, 3), "start": now + 2, "end": now + 6},
+            ])
+            next_id += 1
+            session.apply([change], now=now)
+            self.assertFeasible(session)
+            # Started operations keep their start and machine (a cancelled one may end early)
+            current = {(job_id, start, machine) for job_id, start, _, machine in session.schedule()}
+            self.assertTrue({(job_id, start, machine) for job_id, start, _, machine in frozen} <= current)
+
+
+class TestSessionStore(unittest.TestCase):
+    def test_least_recently_used_session_is_dropped(self):
+        store = SessionStore(max_sessions=2)
+        first, second = store.add("a"), store.add("b")
+        store.get(first)
+        store.add("c")
+        self.assertIsNone(store.get(second))
+        self.assertEqual(store.get(first), "a")
+        self.assertTrue(store.delete(first))
+        self.assertFalse(store.delete(first))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,30 @@
+import subprocess
+import sys
+import unittest
+import startup
+import service
+
+
+class TestStartup(unittest.TestCase):
+    def test_engines_are_imported_on_first_use(self):
+        # A fresh interpreter, as this one may have imported OR-Tools already
+        code = ("import sys, app, service; loaded = 'ortools' in sys.modules; "
+                "service.scheduler_class('cpsat'); print(loaded, 'ortools' in sys.modules)")
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.split(), ["False", "True"])
+
+    def test_warm_up_and_report(self):
+        timings = startup.warm_up(["gbfs", "cpsat"])
+        self.assertEqual([name for name, _ in timings], ["gbfs", "cpsat"])
+        self.assertEqual(service.scheduler_class("astar").__name__, "AStarScheduler")
+        self.assertEqual(service.scheduler_class("unknown").__name__, "GBFSScheduler")
+        with self.assertRaises(ValueError):
+            startup.warm_up(["unknown"])
+        lines = []
+        startup.report(timings, lines.append)
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[-1].endswith("total"))
+
+
+if __name__ == '__main__':
+    unittest.main()
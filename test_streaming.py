@@ -0,0 +1,44 @@
+import threading
+import time
+import unittest
+from benchmark import generate_instance
+from instance import Instance
+from scheduler import AStarScheduler, OptimizedScheduler
+from streaming import solve_events, format_sse
+
+
+class TestStreaming(unittest.TestCase):
+    def test_incumbents_improve_until_the_result(self):
+        data = dict(generate_instance(8, 3, num_operations=3), schedulerType="cpsat", maxSeconds=5)
+        events = list(solve_events(data))
+        incumbents = [event["bestMakespan"] for event in events if event["event"] == "incumbent"]
+        self.assertTrue(incumbents)
+        self.assertEqual(incumbents, sorted(incumbents, reverse=True))
+        self.assertEqual(events[-1]["event"], "result")
+        self.assertEqual(events[-1]["result"]["makespan"], incumbents[-1])
+        self.assertTrue(format_sse(events[-1]).startswith("event: result\ndata: {"))
+
+    def test_closing_the_stream_cancels_the_solve(self):
+        # Weighted A* without a budget would keep improving for a long time
+        data = dict(generate_instance(14, 3, num_operations=3), schedulerType="astar", weight=2)
+        before = threading.active_count()
+        events = solve_events(data, progress_interval=50)
+        self.assertIn(next(events)["event"], ("progress", "incumbent"))
+        events.close()
+        deadline = time.time() + 10
+        while threading.active_count() > before and time.time() < deadline:
+            time.sleep(0.05)
+        self.assertEqual(threading.active_count(), before)
+
+    def test_declining_an_incumbent_stops_the_search(self):
+        instance = Instance.from_request(generate_instance(8, 3, num_operations=3))
+        for scheduler in (OptimizedScheduler(instance, instance.machines, progress_callback=lambda progress: False),
+                          AStarScheduler(instance, instance.machines, weight=2, seed_rule=None,
+                                         progress_callback=lambda progress: not progress.get("incumbent"))):
+            schedule = scheduler.schedule_jobs()
+            self.assertEqual(len(schedule), instance.num_ops)
+            self.assertEqual(scheduler.visualization_data["stop_reason"], "cancelled")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import Manager
+
+import service
+
+
+class PoolFull(Exception):
+    """Raised when admission control rejects a submission"""
+
+
+def run_task(task_id, data, shared, progress_interval):
+    """Solve one request in a worker process, publishing progress through shared"""
+    def report(progress):
+        shared[task_id] = progress
+        # Returning False makes the scheduler stop with its best schedule so far
+        return not shared.get(("cancel", task_id), False)
+
+    return service.solve(data, progress_callback=report, progress_interval=progress_interval)
+
+
+class SolverPool:
+    """
+    Bounded process pool for asynchronous /jobs submissions.
+
+    At most max_pending tasks may be queued or running at once; further
+    submissions raise PoolFull. Running searches report progress and check for
+    cancellation through a Manager dict every progress_interval expanded nodes.
+    The executor is started lazily so forking servers create it per worker.
+    """
+    def __init__(self, max_workers=None, max_pending=32, keep_finished=1000, progress_interval=2000):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self.keep_finished = keep_finished
+        self.progress_interval = progress_interval
+        self.executor = None
+        self.manager = None
+        self.shared = None
+        self.tasks = OrderedDict()  # task id -> task record
+        self.batch_futures = set()  # Unfinished /schedule/batch chunks, which count as pending too
+        self.lock = threading.RLock()  # Re-entrant: cancelling runs done callbacks inline
+
+    def start(self):
+        if self.executor is None:
+            self.manager = Manager()
+            self.shared = self.manager.dict()
+            self.executor = ProcessPoolExecutor(max_workers=self.max_workers)
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.manager.shutdown()
+            self.executor = self.manager = self.shared = None
+
+    def pending(self):
+        """Number of tasks and batch chunks queued or running"""
+        with self.lock:
+            return sum(1 for task in self.tasks.values() if not task["future"].done()) + len(self.batch_futures)
+
+    def free_slots(self):
+        return max(0, self.max_pending - self.pending())
+
+    def submit_many(self, fn, args_list):
+        """
+        Queue fn(*args) for every args as one admission (all or none, as
+        batch chunks without task ids); returns their futures
+        """
+        with self.lock:
+            if self.pending() + len(args_list) > self.max_pending:
+                raise PoolFull(f"{len(args_list)} batch chunks do not fit: {self.pending()} of "
+                               f"{self.max_pending} scheduling tasks are already pending")
+            self.start()
+            futures = [self.executor.submit(fn, *args) for args in args_list]
+            self.batch_futures.update(futures)
+        for future in futures:
+            future.add_done_callback(self._batch_finished)
+        return futures
+
+    def submit(self, data):
+        """Queue a request body for solving; returns the task id"""
+        with self.lock:
+            if self.pending() >= self.max_pending:
+                raise PoolFull(f"{self.max_pending} scheduling tasks are already pending")
+            self.start()
+            self._prune_finished()
+            task_id = uuid.uuid4().hex
+            future = self.executor.submit(run_task, task_id, data, self.shared, self.progress_interval)
+            self.tasks[task_id] = {
+                "future": future,
+                "submitted_at": time.time(),
+                "finished_at": None,
+                "cancel_requested": False,
+            }
+            future.add_done_callback(lambda _, task_id=task_id: self._finished(task_id))
+            return task_id
+
+    def status(self, task_id):
+        """Status dict for a task, or None if it is unknown"""
+        with self.lock:
+            task = self.tasks.get(task_id)
+            if task is None:
+                return None
+            future = task["future"]
+            status = {"id": task_id, "submittedAt": task["submitted_at"]}
+            if future.cancelled():
+                status["status"] = "cancelled"
+            elif not future.done():
+                status["status"] = "running" if future.running() else "queued"
+                status["progress"] = self.shared.get(task_id) if self.shared is not None else None
+            elif future.exception() is not None:
+                status["status"] = "failed"
+                status["error"] = str(future.exception())
+            else:
+                # A cancelled search still returns its best schedule so far
+                status["status"] = "cancelled" if task["cancel_requested"] else "done"
+                status["result"] = future.result()
+            if task["finished_at"] is not None:
+                status["elapsed"] = task["finished_at"] - task["submitted_at"]
+            return status
+
+    def cancel(self, task_id):
+        """Cancel a queued task or ask a running one to stop; None if unknown"""
+        with self.lock:
+            task = self.tasks.get(task_id)
+            if task is None:
+                return None
+            if not task["future"].done():
+                task["cancel_requested"] = True
+                if not task["future"].cancel():
+                    self.shared[("cancel", task_id)] = True
+        return self.status(task_id)
+
+    def _finished(self, task_id):
+        with self.lock:
+            task = self.tasks.get(task_id)
+            if task is not None:
+                task["finished_at"] = time.time()
+            if self.shared is not None:
+                self.shared.pop(task_id, None)
+                self.shared.pop(("cancel", task_id), None)
+
+    def _batch_finished(self, future):
+        with self.lock:
+            self.batch_futures.discard(future)
+
+    def _prune_finished(self):
+        finished = [task_id for task_id, task in self.tasks.items() if task["future"].done()]
+        for task_id in finished[:max(0, len(finished) - self.keep_finished)]:
+            del self.tasks[task_id]